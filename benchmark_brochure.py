@@ -0,0 +1,320 @@
+import io, json, os, re, sys, time, argparse, platform, tempfile, tracemalloc, statistics
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import generate_brochure as gb
+
+# Benchmark for generate_brochure.py, runs fully offline on synthetic data.
+#
+#   python benchmark_brochure.py                                  # all scales
+#   python benchmark_brochure.py --scales small,medium --output run.json
+#   python benchmark_brochure.py --baseline baseline.json         # flag regressions
+#   python benchmark_brochure.py --with data_store,precompress    # time a build with these options on
+#   python benchmark_brochure.py --layout-pages layout/           # pages to time tab switching in a browser
+
+# generate_html() renders the current month, so that is the one given the full counts
+BENCH_MONTH = datetime.now().strftime('%B')
+
+# people/announcements = entries in the benchmarked month, sermons = per month,
+# images = files in slideshow_folder
+SCALES = {
+    'small': {'people': 10, 'announcements': 10, 'sermons': 4, 'images': 10},
+    'medium': {'people': 1000, 'announcements': 1000, 'sermons': 24, 'images': 1000},
+    'large': {'people': 100000, 'announcements': 100000, 'sermons': 48, 'images': 5000},
+}
+
+# Build options --with can turn on. The image stages need real photos, the fixture only has empty files.
+BENCH_OPTIONS = [name for name, default in gb.BUILD_OPTION_DEFAULTS.items()
+                 if default is False and name not in ('responsive_images', 'modern_formats')]
+
+# Big enough to make tab switching slow on a kiosk, small enough for a browser to open
+LAYOUT_PAGE_PARAMS = {'people': 5000, 'announcements': 2000, 'sermons': 48, 'images': 0}
+LAYOUT_ROUNDS = 5
+
+# Appended to the layout pages: switches to every tab a few times, forcing style and
+# layout each time, and shows the median time per tab
+LAYOUT_SCRIPT = """
+    <script>
+        window.addEventListener('load', () => setTimeout(() => {
+            const buttons = document.querySelectorAll('.tab-button');
+            const times = Array.from(buttons, () => []);
+            for (let round = 0; round < %(rounds)d; round++) {
+                buttons.forEach((button, i) => {
+                    const started = performance.now();
+                    button.click();
+                    document.body.offsetHeight;
+                    times[i].push(performance.now() - started);
+                });
+            }
+            const median = list => list.slice().sort((a, b) => a - b)[Math.floor(list.length / 2)];
+            const rows = Array.from(buttons, (button, i) => `${button.textContent.replace(/\\s+/g, '')}: ${median(times[i]).toFixed(1)} ms`);
+            const total = times.reduce((sum, list) => sum + median(list), 0);
+            const report = document.createElement('pre');
+            report.style.cssText = 'position:absolute;top:0;right:0;z-index:10;background:#fff;color:#000;padding:10px';
+            report.textContent = `%(label)s\\n${rows.join('\\n')}\\ntotal: ${total.toFixed(1)} ms`;
+            document.body.appendChild(report);
+            console.log(JSON.stringify({page: '%(label)s', total: total}));
+        }, 500));
+    </script>
+</body>"""
+
+# A phase only counts as a regression if it is this much slower AND at least MIN_REGRESSION_SECONDS
+DEFAULT_THRESHOLD = 0.20
+MIN_REGRESSION_SECONDS = 0.002
+
+
+def make_synthetic_data(people, announcements, sermons):
+    # Same shape as events_data.json. The benchmarked month gets the full
+    # count, the other months a twelfth of it (like a real congregation).
+    def month_people(month, key):
+        count = people if month == BENCH_MONTH else max(1, people // 12)
+        if key == 'birthdays':
+            return [{'name': f'Member {i}', 'date': i % 28 + 1} for i in range(count)]
+        return [{'names': f'Member {i} & Member {i + 1}', 'date': i % 28 + 1, 'years': i % 50 + 1} for i in range(count)]
+
+    def month_sermons(month):
+        return [{
+            'title': f'{month} Sermon {i + 1}',
+            'date': i % 28 + 1,
+            'scripture': 'John 3:16',
+            'summary': 'For God so loved the world that he gave his one and only Son. ' * 3,
+            'key_points': [f'Key point {n + 1} of the message' for n in range(5)],
+        } for i in range(sermons)]
+
+    months = gb.MONTHS
+    return {
+        'church_info': {'name': 'Benchmark Bible Church', 'logo_path': 'logo.png', 'tagline': 'Synthetic data'},
+        'rotating_messages': [
+            {'title': f'Message {i}', 'scripture': 'Matthew 28:18-20', 'text': 'Go and make disciples of all nations. ' * 5}
+            for i in range(5)
+        ],
+        'sidebar_tabs': {
+            'home': {'welcome_text': 'Welcome to our benchmark church!'},
+            'sermons': {month: month_sermons(month) for month in months},
+            'events': dict(
+                permanant=[{'title': 'Sunday Worship Service', 'date': 'Every Sunday', 'time': '9:00 AM',
+                            'location': 'Main Hall', 'description': 'Worship, prayer and fellowship'}],
+                **{month: [{'title': f'{month} Event {i}', 'date': f'{month} {i + 1}', 'time': '6:00 PM',
+                            'location': 'Main Hall', 'description': 'Monthly gathering'} for i in range(4)]
+                   for month in months}
+            ),
+            'announcements': [f'Announcement number {i}: see the notice board for details.' for i in range(announcements)],
+            'contact': {'phone': '1-(000)-000-0000', 'mail': 'PO Box 1', 'email': 'bench@example.com', 'address': '1 Main Street'},
+            'about': {'mission': 'To produce disciples', 'leadership': 'The elders'},
+            'birthdays': {month: month_people(month, 'birthdays') for month in months},
+            'anniversaries': {month: month_people(month, 'anniversaries') for month in months},
+            'wisdom_tips': {month: {'title': f'{month} tip', 'tip': 'Read daily', 'steps': ['Open', 'Read', 'Pray'],
+                                    'verse': 'Psalm 119:105', 'verse_text': 'Your word is a lamp', 'theme': 'Reading',
+                                    'author': 'GCBC'} for month in months},
+            'inspire': {month: {'verse_of_the_month': {'verse': 'Ephesians 2:10', 'text': 'For we are his workmanship',
+                                                       'theme': 'Purpose'},
+                                'featured_testimony': {'name': 'A member', 'date': month, 'testimony': 'God is good. ' * 40}}
+                        for month in months},
+            'missions': {month: {'featured': 'Bible translation',
+                                 'update': {'message': 'Progress is being made', 'author': 'Missions team'},
+                                 'prayer_points': ['Safety', 'Open hearts', 'Provision'],
+                                 'progress': {'label': 'Translation', 'percentage': 55},
+                                 'support': {'give_link': 'https://example.com/give', 'email': '', 'drive': ''}}
+                         for month in months},
+        },
+    }
+
+
+def build_fixture(folder, params):
+    data = make_synthetic_data(params['people'], params['announcements'], params['sermons'])
+    with open(os.path.join(folder, gb.DATA_FILE), 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+    # Empty files are enough: discovery only looks at names
+    images = os.path.join(folder, gb.SLIDESHOW_FOLDER)
+    os.makedirs(images)
+    extensions = ['jpg', 'jpeg', 'png', 'gif', 'webp']
+    for i in range(params['images']):
+        open(os.path.join(images, f'photo_{i}.{extensions[i % len(extensions)]}'), 'wb').close()
+
+
+def bench_context():
+    return gb.RenderContext(month=BENCH_MONTH, date=f'05 {BENCH_MONTH}, 2026', asset_url=gb.default_asset_url)
+
+
+def remove_output(options):
+    # So every run writes the page instead of finding it unchanged
+    output_file = os.path.join(gb.DIST_DIR, gb.OUTPUT_FILE) if options.dist else gb.OUTPUT_FILE
+    if os.path.exists(output_file):
+        os.remove(output_file)
+
+
+def run_once(options):
+    # One full build through generate_html(), timed phase by phase by its profiler
+    # (build key, loading, images, render, write, precompress...)
+    remove_output(options)
+    profiler = gb.Profiler()
+    with redirect_stdout(io.StringIO()):
+        output_file = gb.generate_html(force=True, profiler=profiler, options=options)
+    timings = {entry['name']: entry['seconds'] for entry in profiler.report()['phases']}
+
+    # Extra: the same render twice with fragments kept like in --watch, the second one
+    # shows what the fragment cache saves
+    data = gb.load_data()
+    slideshow_images = gb.get_slideshow_images()
+    ctx = bench_context()
+    gb.keep_fragments()
+    gb._fragment_cache.clear()
+    gb.render_page_parts(data, slideshow_images, ctx)
+    started = time.perf_counter()
+    gb.render_page_parts(data, slideshow_images, ctx)
+    timings['render_warm'] = time.perf_counter() - started
+    gb.keep_fragments(False)
+    gb._fragment_cache.clear()
+
+    return timings, os.path.getsize(output_file)
+
+
+def measure_peak_memory(options):
+    # A one-shot build the way the command line runs it
+    remove_output(options)
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        gb.generate_html(force=True, options=options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def write_layout_pages(out_dir):
+    # The same big page twice, with and without the containment rules. Open both
+    # in the kiosk browser and compare the tab switching times they show.
+    original_dir = os.getcwd()
+    out_dir = os.path.abspath(out_dir)
+    with tempfile.TemporaryDirectory(prefix='brochure-layout-') as folder:
+        build_fixture(folder, LAYOUT_PAGE_PARAMS)
+        os.chdir(folder)
+        try:
+            gb._fragment_cache.clear()
+            html = gb.render_page(gb.load_data(), [], bench_context())
+        finally:
+            os.chdir(original_dir)
+
+    plain = re.sub(r'\s*(?<![\w-])(contain|content-visibility|contain-intrinsic-size):[^;}]*;?', '', html)
+    os.makedirs(out_dir, exist_ok=True)
+    for label, page in [('contained', html), ('plain', plain)]:
+        page = page.replace('</body>', LAYOUT_SCRIPT % {'rounds': LAYOUT_ROUNDS, 'label': label}, 1)
+        with open(os.path.join(out_dir, f'{label}.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+    print(f"✓ Layout pages written to {out_dir}/ (contained.html, plain.html)")
+
+
+def bench_scale(name, params, repeat, options):
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f'brochure-bench-{name}-') as folder:
+        build_fixture(folder, params)
+        os.chdir(folder)
+        try:
+            runs = [run_once(options) for _ in range(repeat)]
+            # Separate pass: tracemalloc slows everything down, so it must not affect the timings
+            peak = measure_peak_memory(options)
+            data_bytes = os.path.getsize(gb.DATA_FILE)
+        finally:
+            os.chdir(original_dir)
+
+    # The median is less noisy than the mean on busy kiosks
+    phases = {phase: statistics.median(timings[phase] for timings, _ in runs) for phase in runs[0][0]}
+    return {
+        'params': params,
+        'phases': phases,
+        'total': sum(value for phase, value in phases.items() if phase != 'render_warm'),
+        'peak_memory_bytes': peak,
+        'data_bytes': data_bytes,
+        'output_bytes': runs[0][1],
+        'repeat': repeat,
+    }
+
+
+def compare(results, baseline, threshold):
+    # Returns a list of human readable regressions
+    regressions = []
+    for name, result in results['scales'].items():
+        old = baseline.get('scales', {}).get(name)
+        if not old:
+            continue
+
+        checks = [(f'{phase} time', value, old['phases'].get(phase), True) for phase, value in result['phases'].items()]
+        checks.append(('total time', result['total'], old.get('total'), True))
+        checks.append(('peak memory', result['peak_memory_bytes'], old.get('peak_memory_bytes'), False))
+
+        for label, new_value, old_value, is_time in checks:
+            if not old_value:
+                continue
+            if is_time and new_value - old_value < MIN_REGRESSION_SECONDS:
+                continue
+            if new_value > old_value * (1 + threshold):
+                regressions.append(f'{name}: {label} {old_value:.4g} -> {new_value:.4g} (+{(new_value / old_value - 1) * 100:.0f}%)')
+    return regressions
+
+
+def print_result(name, result):
+    phases = '  '.join(f"{phase}={value * 1000:.1f}ms" for phase, value in result['phases'].items())
+    print(f"{name:>7}: total={result['total'] * 1000:.1f}ms  {phases}")
+    print(f"{'':>7}  peak={result['peak_memory_bytes'] / 1024 / 1024:.1f}MB  "
+          f"page={result['output_bytes'] / 1024:.0f}KB  data={result['data_bytes'] / 1024:.0f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark generate_brochure.py on synthetic data')
+    parser.add_argument('--scales', default=','.join(SCALES), help=f"comma separated, from: {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per scale (median is reported)')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to save the results')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--with', dest='options', default='', help=f"comma separated build options to turn on, from: {', '.join(BENCH_OPTIONS)}")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown before flagging (0.2 = 20%%)')
+    parser.add_argument('--layout-pages', metavar='DIR', help='only write the tab switching pages (with/without containment) to DIR')
+    args = parser.parse_args()
+
+    if args.layout_pages:
+        write_layout_pages(args.layout_pages)
+        return
+
+    enabled = [name for name in args.options.split(',') if name]
+    for name in enabled:
+        if name not in BENCH_OPTIONS:
+            parser.error(f"unknown build option '{name}'")
+    options = gb.BuildOptions(**{name: True for name in enabled})
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'script_version': gb.script_version(),
+            'options': sorted(enabled),
+        },
+        'scales': {},
+    }
+    for name in args.scales.split(','):
+        if name not in SCALES:
+            parser.error(f"unknown scale '{name}'")
+        results['scales'][name] = bench_scale(name, SCALES[name], args.repeat, options)
+        print_result(name, results['scales'][name])
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        # Builds with other options do different work, their times say nothing about a regression
+        if baseline.get('meta', {}).get('options', []) != results['meta']['options']:
+            print(f"✗ {args.baseline} was run with other build options: {', '.join(baseline.get('meta', {}).get('options', [])) or 'none'}")
+            sys.exit(1)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("✗ Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"✓ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2529 +1,4822 @@
-import json, os, glob
-from datetime import datetime
+import json, os, re, glob, shutil, hashlib, argparse, time, select, struct, ctypes, ctypes.util, calendar, tempfile, sqlite3
+import gzip, mimetypes, threading
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Pillow is only needed for --responsive-images and --modern-formats
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+# brotli is optional, --serve and --precompress fall back to gzip only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DATA_FILE = 'events_data.json'
+OUTPUT_FILE = 'index.html'
+SLIDESHOW_FOLDER = 'slideshow_folder'
+VIDEOS_FOLDER = 'missions_videos'
+LOGO_FILE = 'Images/GCBC LOGO Transparent.png'
+DIST_DIR = 'dist'
+DIST_ASSETS_DIR = os.path.join(DIST_DIR, 'assets')
+# --all-months gets its own root: a --dist build prunes dist/assets down to what its manifest lists
+MONTHS_DIR = os.path.join(DIST_DIR, 'months')
+CACHE_FILE = '.brochure_cache.json'
+WRITE_BUFFER_SIZE = 64 * 1024
+PROFILE_FILE = 'index.profile.json'
+DATA_STORE_FILE = '.events_data.sqlite'
+
+DERIVATIVES_FOLDER = 'image_derivatives'
+DERIVATIVES_INDEX = os.path.join(DERIVATIVES_FOLDER, 'index.json')
+
+# Inputs watched by --watch (missing folders are picked up once they are created)
+WATCH_PATHS = [DATA_FILE, SLIDESHOW_FOLDER, 'Images', VIDEOS_FOLDER]
+
+
+def script_version():
+    # Hash of this script so any template/code change invalidates the cache
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# Build settings chosen on the command line, with their defaults. They change the page,
+# so they are part of the build key. Each one is the flag of the same name.
+BUILD_OPTION_DEFAULTS = {
+    'responsive_images': False,
+    'modern_formats': False,
+    'dist': False,
+    'external_css': False,
+    'prune_css': False,
+    'external_js': False,
+    'lazy_tabs': False,
+    'virtual_lists': False,
+    'data_store': False,
+    'precompress': False,
+    'live': False,
+    'timezone': None,  # IANA name, None for the machine's local time
+    'year_page': False,
+}
+BuildOptions = namedtuple('BuildOptions', BUILD_OPTION_DEFAULTS, defaults=BUILD_OPTION_DEFAULTS.values())
+
+
+def build_timezone(options):
+    # The zone the page's month and date are taken in (None: the machine's local time)
+    return ZoneInfo(options.timezone) if options.timezone else None
+
+
+def uses_image_pipeline(options):
+    return options.responsive_images or options.modern_formats
+
+
+def writes_generated_files(options):
+    # Stylesheet, script or tab files next to the page (see generated_asset_url)
+    return options.external_css or options.external_js or options.lazy_tabs or options.live
+
+
+def hash_folder_listing(h, folder):
+    if os.path.isdir(folder):
+        for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+            if entry.is_file():
+                stat = entry.stat()
+                h.update(f"{folder}/{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+
+
+def compute_build_key(current_date, options):
+    # Everything that can change the page: data file, slideshow listing, date, options and script
+    h = hashlib.sha256()
+    with open(DATA_FILE, 'rb') as f:
+        h.update(f.read())
+
+    folders = [SLIDESHOW_FOLDER]
+    # Changing the logo or deleting the generated image versions must trigger a rebuild too
+    if uses_image_pipeline(options):
+        folders += [DERIVATIVES_FOLDER, os.path.dirname(LOGO_FILE)]
+    # With --dist the logo and mission videos are published under hashed names, so a new
+    # version of one means new links in the page; same for the published copies themselves
+    if options.dist:
+        folders += [os.path.dirname(LOGO_FILE), VIDEOS_FOLDER, DIST_ASSETS_DIR]
+    for folder in dict.fromkeys(folders):
+        hash_folder_listing(h, folder)
+
+    if not options.dist and writes_generated_files(options):
+        h.update('\n'.join(sorted(generated_files('.'))).encode('utf-8'))
+
+    # The date badge shows the full date, so the key uses it (the month is part of it)
+    h.update(current_date.encode('utf-8'))
+    h.update(repr(tuple(options)).encode('utf-8'))
+    h.update(script_version().encode('utf-8'))
+    return h.hexdigest()
+
+
+def load_build_cache():
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_cache(key, output_file):
+    stat = os.stat(output_file)
+    cache = {'key': key, 'output_size': stat.st_size, 'output_mtime_ns': stat.st_mtime_ns}
+    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+
+def build_outputs(output_file, options):
+    # Files a build writes besides the page; if one is gone the build is not current
+    outputs = []
+    if options.dist:
+        outputs.append(os.path.join(os.path.dirname(output_file), 'manifest.json'))
+    if options.live:
+        outputs.append(os.path.join(os.path.dirname(output_file), LIVE_FILE))
+    return outputs
+
+
+def is_build_current(key, output_file, outputs=()):
+    cache = load_build_cache()
+    if cache.get('key') != key or not os.path.exists(output_file):
+        return False
+    if not all(os.path.exists(path) for path in outputs):
+        return False
+
+    # Someone edited or replaced index.html by hand, so rebuild it
+    stat = os.stat(output_file)
+    return cache.get('output_size') == stat.st_size and cache.get('output_mtime_ns') == stat.st_mtime_ns
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_stream_if_changed(path, chunks):
+    # Encodes and writes the chunks to a temp file next to `path`, then renames it
+    # over `path` in one step, so a browser never reads a half-written page.
+    # Memory stays at one chunk plus the write buffer however big the page is.
+    # If the bytes are identical to what is there, `path` is left alone (same mtime/ETag).
+    folder = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=folder)
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with open(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                encoded = chunk.encode('utf-8')
+                digest.update(encoded)
+                size += len(encoded)
+                f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.exists(path):
+            if os.path.getsize(path) == size and file_digest(path) == digest.hexdigest():
+                os.remove(tmp_path)
+                return False
+            mode = os.stat(path).st_mode & 0o777
+        else:
+            mode = 0o644
+        # mkstemp creates files only we can read, web servers need the normal permissions
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_if_changed(path, content):
+    return write_stream_if_changed(path, [content])
+
+
+class Profiler:
+    # Collects wall time and output size of each build phase, slideshow glob
+    # and page fragment. Pass one to generate_html(profiler=...) or use --profile.
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+        self.globs = []
+        self.sections = []
+
+    @contextmanager
+    def phase(self, name):
+        # Use as `with profiler.phase('json_load') as entry:` and set entry['bytes'] if it applies
+        entry = {'name': name}
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = time.perf_counter() - started
+            self.phases.append(entry)
+
+    def record_glob(self, pattern, seconds, matches):
+        self.globs.append({'pattern': pattern, 'seconds': seconds, 'matches': matches})
+
+    def record_section(self, name, seconds, html, cached):
+        self.sections.append({'name': name, 'seconds': seconds, 'bytes': len(html.encode('utf-8')), 'cached': cached})
+
+    def report(self):
+        return {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'total_seconds': time.perf_counter() - self.started,
+            'phases': self.phases,
+            'globs': self.globs,
+            'sections': self.sections,
+            'largest_sections': [entry['name'] for entry in sorted(self.sections, key=lambda e: -e['bytes'])],
+        }
+
+    def save(self, path=PROFILE_FILE):
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+    def print_summary(self):
+        for entry in self.phases:
+            size = f"  {entry['bytes'] / 1024:.1f} KB" if 'bytes' in entry else ''
+            print(f"  {entry['name']:<16} {entry['seconds'] * 1000:8.2f} ms{size}")
+        print("  Largest sections:")
+        for entry in sorted(self.sections, key=lambda e: -e['bytes'])[:5]:
+            print(f"    {entry['name']:<14} {entry['bytes'] / 1024:8.1f} KB  {entry['seconds'] * 1000:.2f} ms")
+
+
+# Helper function to split text into vertical letters
+def vertical_text(word):
+    return ''.join(f'<span>{letter}</span>' for letter in word.upper())
+
+
+def format_date_with_ordinal(date):
+    if isinstance(date, int):
+        if 11 <= date <= 13:
+            suffix = "th"
+        else:
+            suffix = {1: "st", 2: "nd", 3: "rd"}.get(date % 10, "th")
+        return f"{date}{suffix}"
+    return str(date)
+
+
+def get_slideshow_images(profiler=None):
+    image_folder = SLIDESHOW_FOLDER
+    if not os.path.exists(image_folder):
+        print(f"Warning: '{image_folder}' folder not found. Creating it.")
+        os.makedirs(image_folder)
+        return []
+
+    # Get the pictures
+    image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp']
+    image_files = []
+    for ext in image_extensions:
+        started = time.perf_counter()
+        matches = glob.glob(os.path.join(image_folder, ext))
+        if profiler:
+            profiler.record_glob(ext, time.perf_counter() - started, len(matches))
+        image_files.extend(matches)
+
+    # Convert paths to relative paths for the html
+    return [os.path.basename(img) for img in image_files]
+
+
+def load_data():
+    # Read event data
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ============================================
+# DATA STORE
+# ============================================
+# With --data-store events_data.json is compiled into a small SQLite file,
+# indexed by month: the sections keyed by month name (birthdays, sermons,
+# events...) get one row per month, everything else is one 'static' row.
+# A build then parses only the static part and the month it shows. The store
+# is rebuilt when the hash of events_data.json no longer matches.
+
+def store_source_hash():
+    try:
+        with sqlite3.connect(f'file:{DATA_STORE_FILE}?mode=ro', uri=True) as con:
+            row = con.execute("SELECT value FROM meta WHERE key = 'source_sha256'").fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def compile_data_store(force=False):
+    # Returns True if the store was (re)built
+    digest = file_digest(DATA_FILE)
+    if not force and store_source_hash() == digest:
+        return False
+
+    data = load_data()
+    static = dict(data, sidebar_tabs={})
+    monthly = []
+    for name, section in data['sidebar_tabs'].items():
+        if isinstance(section, dict) and any(month in section for month in MONTHS):
+            # Keys that are not months (e.g. events' 'permanant') stay in the static part
+            static['sidebar_tabs'][name] = {key: value for key, value in section.items() if key not in MONTHS}
+            monthly += [(name, month, json.dumps(section[month], ensure_ascii=False)) for month in MONTHS if month in section]
+        else:
+            static['sidebar_tabs'][name] = section
+
+    # Built next to the old one and swapped in, so a build never sees half a store
+    tmp_path = DATA_STORE_FILE + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    con = sqlite3.connect(tmp_path)
+    try:
+        con.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE monthly (section TEXT NOT NULL, month TEXT NOT NULL, value TEXT NOT NULL,
+                                  PRIMARY KEY (month, section));
+        """)
+        con.executemany('INSERT INTO meta VALUES (?, ?)', [
+            ('source_sha256', digest),
+            ('static', json.dumps(static, ensure_ascii=False)),
+        ])
+        con.executemany('INSERT INTO monthly VALUES (?, ?, ?)', monthly)
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp_path, DATA_STORE_FILE)
+    return True
+
+
+def load_month_data(month):
+    # Same shape as load_data(), but the month-keyed sections only hold this month
+    compile_data_store()
+    with sqlite3.connect(f'file:{DATA_STORE_FILE}?mode=ro', uri=True) as con:
+        data = json.loads(con.execute("SELECT value FROM meta WHERE key = 'static'").fetchone()[0])
+        for section, value in con.execute('SELECT section, value FROM monthly WHERE month = ?', (month,)):
+            data['sidebar_tabs'][section][month] = json.loads(value)
+    return data
+
+
+def generate_html(force=False, data=None, slideshow_images=None, profiler=None, options=BuildOptions()):
+    now = datetime.now(build_timezone(options))
+    current_month = now.strftime('%B')
+    # A year page picks its date in the browser, until then the badge shows the year
+    current_date = str(now.year) if options.year_page else now.strftime('%d %B, %Y')
+    output_file = os.path.join(DIST_DIR, OUTPUT_FILE) if options.dist else OUTPUT_FILE
+
+    # Phases are only timed when a profiler is passed in
+    profiler_phase = profiler.phase if profiler else lambda name: nullcontext({})
+
+    # Skip the whole build when none of the inputs changed
+    with profiler_phase('build_key'):
+        build_key = compute_build_key(current_date, options)
+        build_is_current = not force and is_build_current(build_key, output_file, build_outputs(output_file, options))
+    if build_is_current:
+        print(f"✓ {output_file} is up to date (no changes)")
+        # Cheap when nothing changed (mtimes only), but brings back deleted .gz/.br files
+        update_precompressed(build_artifacts(os.path.dirname(output_file) or '.', [output_file], options), options.precompress)
+        return output_file
+
+    # Watch mode passes in what it already has in memory
+    if data is None:
+        with profiler_phase('json_load') as entry:
+            data = load_month_data(current_month) if options.data_store else load_data()
+            entry['bytes'] = os.path.getsize(DATA_FILE)
+    if slideshow_images is None:
+        with profiler_phase('image_discovery'):
+            slideshow_images = get_slideshow_images(profiler)
+
+    image_variants = {}
+    if uses_image_pipeline(options):
+        with profiler_phase('image_derivatives'):
+            image_variants = build_image_variants(slideshow_images, options)
+
+    # In dist mode every asset the page mentions is published under a hashed name as it is rendered
+    manifest = {}
+    asset_url = fingerprinted_asset_url(DIST_DIR, manifest) if options.dist else default_asset_url
+
+    # Same for the stylesheet, script and tabs with --external-css/--external-js/--lazy-tabs
+    generated = manifest if options.dist else {}
+    out_dir = DIST_DIR if options.dist else '.'
+    css_url = generated_asset_url(out_dir, options.dist, generated, f'{GENERATED_STEM}.css') if options.external_css else None
+    js_url = generated_asset_url(out_dir, options.dist, generated, f'{GENERATED_STEM}.js') if options.external_js else None
+    tab_url = lazy_tab_url(out_dir, options.dist, generated) if options.lazy_tabs else None
+    live_sections = {}
+    live_url = live_section_url(out_dir, options.dist, generated, live_sections) if options.live else None
+
+    ctx = RenderContext(month=current_month, date=current_date, asset_url=asset_url, image_variants=image_variants,
+                        stylesheet_url=css_url, prune_css=prunes_css(options), script_url=js_url, tab_url=tab_url,
+                        virtual_lists=options.virtual_lists, live_url=live_url,
+                        months=MONTHS if options.year_page else None)
+    html_chunks = iter_html(data, slideshow_images, ctx, profiler)
+    if profiler:
+        # Rendering and writing are interleaved when streaming; split them up to time each one
+        with profiler_phase('render'):
+            html_chunks = list(html_chunks)
+
+    # Stream to file
+    with profiler_phase('write') as entry:
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        changed = write_stream_if_changed(output_file, html_chunks)
+        entry['bytes'] = os.path.getsize(output_file)
+    if options.live:
+        save_live_file(out_dir, live_sections)
+    else:
+        remove_live_file(out_dir)
+    if options.dist:
+        save_dist_manifest(manifest)
+    else:
+        # Also when this build writes none: files left by an earlier --lazy-tabs/--external-*/--live build go
+        remove_old_generated('.', generated)
+    if changed:
+        print(f"✓ {output_file} generated successfully!")
+    else:
+        print(f"✓ {output_file} unchanged, left as is")
+    with profiler_phase('precompress'):
+        update_precompressed(build_artifacts(out_dir, [output_file], options), options.precompress)
+    # The image and dist stages may have written new files, which are part of the key
+    save_build_cache(compute_build_key(current_date, options), output_file)
+    return output_file
+
+
+# ============================================
+# PAGE FRAGMENTS
+# ============================================
+# Every piece of the page is rendered by its own function from a small slice
+# of the data. In the modes that keep running (--watch, --serve, --schedule)
+# rendered fragments are cached by a hash of that slice, so when only one
+# announcement changes only the NEWS fragment is rendered again.
+
+Section = namedtuple('Section', 'name icon label reads render')
+
+# What a render depends on besides the data. Build it with keyword arguments.
+#   month           the month shown
+#   date            the date badge text
+#   asset_url       how asset paths (slideshow, logo, videos) are written into the page
+#   image_variants  resized/re-encoded versions of the images (see build_image_variants)
+#   stylesheet_url  None: styles inline, else a hook returning the stylesheet's URL (see generated_asset_url)
+#   prune_css       leave out the rules for classes the page does not use
+#   script_url      None: script inline, else a hook like stylesheet_url
+#   tab_url         None: tabs after HOME in the page, else a hook (see lazy_tab_url)
+#   virtual_lists   long birthday/anniversary lists are sent as row data (see render_virtual_list)
+#   live_url        None, or a hook giving the URL each tab can be fetched from again (see live_section_url)
+#   months          None, or for a page that picks its month in the browser the months to render
+#                   (see render_month_sections)
+RENDER_CONTEXT_DEFAULTS = {
+    'image_variants': None,
+    'stylesheet_url': None,
+    'prune_css': False,
+    'script_url': None,
+    'tab_url': None,
+    'virtual_lists': False,
+    'live_url': None,
+    'months': None,
+}
+RenderContext = namedtuple('RenderContext', ['month', 'date', 'asset_url', *RENDER_CONTEXT_DEFAULTS],
+                           defaults=RENDER_CONTEXT_DEFAULTS.values())
+
+_fragment_cache = {}
+# Only processes that render more than once keep fragments (see keep_fragments)
+_keep_fragments = False
+
+
+def default_asset_url(path):
+    return path
+
+
+def prefixed_asset_url(prefix):
+    # For pages written below the project folder (e.g. dist/months/March/index.html)
+    return lambda path: prefix + path
+
+
+def slice_hash(data_slice):
+    encoded = json.dumps(data_slice, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def keep_fragments(enabled=True):
+    # Called by --watch, --serve, --schedule and the --all-months workers, which render
+    # again and again. A one-shot build uses every fragment once; keeping them would
+    # only make its peak memory grow with the page instead of staying flat.
+    global _keep_fragments
+    _keep_fragments = enabled
+    if not enabled:
+        _fragment_cache.clear()
+
+
+def render_fragment(name, render, data_slice):
+    if not _keep_fragments:
+        return render(data_slice)
+    # Reuse the last rendering of this fragment if its input slice is the same
+    digest = slice_hash(data_slice)
+    cached = _fragment_cache.get(name)
+    if cached and cached[0] == digest:
+        return cached[1]
+
+    html = render(data_slice)
+    _fragment_cache[name] = (digest, html)
+    return html
+
+
+def render_head(s):
+    # With --external-css only the rules the first screen needs are inlined,
+    # the full stylesheet loads without blocking the first paint
+    if s['stylesheet']:
+        head_assets = f"""    <style>{critical_css(s['css'])}</style>
+    <link rel="preload" href="{s['stylesheet']}" as="style" onload="this.onload=null;this.rel='stylesheet'">
+    <noscript><link rel="stylesheet" href="{s['stylesheet']}"></noscript>"""
+    else:
+        head_assets = f"""    <style>
+{s['css']}
+    </style>"""
+    # The external script is deferred: it downloads alongside the page and runs once it is parsed
+    if s['script']:
+        head_assets += f"""
+    <script defer src="{s['script']}"></script>"""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{s['name']}</title>
+{head_assets}
+</head>
+"""
 
 
-def generate_html():
-    # Read event data
-    with open('events_data.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    church = data['church_info']
-    messages = data['rotating_messages']
-    tabs = data['sidebar_tabs']
+def render_tab_buttons(s):
+    html_parts = ["""        <!-- LEFT: Content with tabs on the edge -->
+        <div class="left-container">
+            <div class="tab-buttons">
+"""]
+    for i, (icon, label) in enumerate(s['tabs']):
+        active_class = " active" if i == 0 else ""
+        html_parts.append(f"""                <button class="tab-button{active_class}" data-tab="{i}">
+                    <div class="tab-icon">{icon}</div>
+                    <div class="tab-text">{vertical_text(label)}</div>
+                </button>
+""")
+    html_parts.append("""            </div>
+            
+            <!-- Content area -->
+            <div class="content-area">
+""")
+    return ''.join(html_parts)
 
-    current_month = datetime.now().strftime('%B')
-    current_date = datetime.now().strftime('%d %B, %Y')
 
-    
-    # Helper function to split text into vertical letters
-    def vertical_text(word):
-        return ''.join(f'<span>{letter}</span>' for letter in word.upper())
-    
-    def format_date_with_ordinal(date):
-        if isinstance(date, int):
-            if 11 <= date <= 13:
-                suffix = "th"
-            else:
-                suffix = {1: "st", 2: "nd", 3: "rd"}.get(date % 10, "th")
-            return f"{date}{suffix}"
-        return str(date)
-
-    def get_slideshow_images():
-        image_folder = 'slideshow_folder'
-        if not os.path.exists(image_folder):
-            print(f"Warning: '{image_folder}' folder not found. Creating it.")
-            os.makedirs(image_folder)
-            return []
-
-        # Get the pictures
-        image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp']
-        image_files = []
-        for ext in image_extensions:
-            image_files.extend(glob.glob(os.path.join(image_folder, ext)))
-
-        # Convert paths to relative paths for the html
-        return [os.path.basename(img) for img in image_files]
+# ========== HOME TAB ==========
+# How long a rotating message stays up: 5 seconds plus 38ms per character (about
+# 1 second per 50 chars), between 5 and 20 seconds. A message can set its own
+# "duration" (in seconds) in events_data.json.
+MESSAGE_BASE_MS = 5000
+MESSAGE_MS_PER_CHAR = 38
+MESSAGE_MIN_MS = 5000
+MESSAGE_MAX_MS = 20000
 
-    slideshow_images = get_slideshow_images()
 
-    current_birthdays = tabs.get('birthdays', {}).get(current_month, [])
-    current_anniversaries = tabs.get('anniversaries', {}).get(current_month, [])
+def message_duration(msg):
+    if msg.get('duration'):
+        return int(float(msg['duration']) * 1000)
+    # Counted like the page shows it, without any markup in the text
+    length = sum(len(re.sub(r'<[^>]+>', '', str(msg.get(key, '')))) for key in ('title', 'scripture', 'text'))
+    return min(MESSAGE_MAX_MS, max(MESSAGE_MIN_MS, MESSAGE_BASE_MS + length * MESSAGE_MS_PER_CHAR))
 
-    html_parts = []
 
-    # Create HTML
-    html_parts.append(f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{church['name']}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Georgia', serif;
-            height: 100vh;
-            overflow: hidden;
-        }}
-        
-        .container {{
-            display: flex;
-            height: 100vh;
-        }}
-        
-        /* ============================================
-           LEFT CONTAINER - Content + Tabs
-           ============================================ */
-        .left-container {{
-            width: 50%;
-            background: #ecf0f1;
-            display: flex;
-            overflow: hidden;
-        }}
-        
-        .tab-buttons {{
-            width: 80px;
-            background: linear-gradient(135deg, rgba(0, 229, 86), rgba(0, 120, 168));
-            display: flex;
-            flex-direction: column;
-            padding: 15px 0;
-            gap: 8px;
-            position: sticky;
-            top: 0;
-            height: 100vh;
-            overflow-y: auto;
-            scrollbar-width: none;
-            -ms-overflow-style: none;
-        }}
+def reads_home(data, ctx):
+    tabs = data['sidebar_tabs']
+    return {
+        'month': ctx.month,
+        'date': ctx.date,
+        'welcome_text': tabs['home']['welcome_text'],
+        'messages': data['rotating_messages'],
+        'wisdom': tabs.get('wisdom_tips', {}).get(ctx.month, {}),
+    }
+
+
+def render_home(s):
+    current_month = s['month']
+    html_parts = [f"""
+                    <div class="section-title">Welcome <span class="date-badge">📅 {s['date']}</span></div>
+                    <p class="welcome-text">{s['welcome_text']}</p>
+                    
+                    <div class="rotating-message">
+    """]
+    
+    # Add rotating messages
+    for i, msg in enumerate(s['messages']):
+        active_class = "active" if i == 0 else ""
+        scripture = f'<div class="message-scripture">{msg["scripture"]}</div>' if "scripture" in msg else ""
+        html_parts.append(f"""
+                        <div class="message {active_class}" data-duration="{message_duration(msg)}">
+                            <div class="message-title">{msg['title']}</div>
+                            {scripture}
+                            <div class="message-text">{msg['text']}</div>
+                        </div>
+        """)
+    
+    html_parts.append(f"""
+                    </div>  <!-- Close rotating-message -->
+                    
+                    <!-- WISDOM TIP - Monthly -->
+    """)
 
-        .tab-buttons::-webkit-scrollbar{{
-            display: none;
-        }}
-        
-        .tab-button {{
-            background: #2c3e50;
-            color: white;
-            border: none;
-            padding: 20px 10px;
-            margin: 0 10px;
-            cursor: pointer;
-            border-radius: 8px;
-            transition: all 0.3s;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-        }}
-        
-        .tab-button:hover {{
-            background: #1a252f;
-            transform: scale(1.05);
-        }}
-        
-        .tab-button.active {{
-            background: #3498db;
-        }}
-        
-        .tab-icon {{
-            font-size: 26px;
-            margin-bottom: 8px;
-        }}
-        
-        .tab-text {{
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            font-size: 14px;
-            font-weight: bold;
-            letter-spacing: 1px;
-            line-height: 1.4;
-        }}
-        
-        .tab-text span {{
-            display: block;
-        }}
-        
-        .content-area {{
-            flex: 1;
-            background: white;
-            padding: 40px;
-            overflow-y: auto;
-            height: 100vh;
-            scrollbar-width: none;
-            -ms-overflow-style: none;
-        }}
-        
-        .content-section {{
-            display: none;
-        }}
-        
-        .content-section.active {{
-            display: block;
-            animation: slideIn 0.3s ease;
-        }}
-        
-        @keyframes slideIn {{
-            from {{ opacity: 0; transform: translateX(-20px); }}
-            to {{ opacity: 1; transform: translateX(0); }}
-        }}
-        
-        .section-title {{
-            font-size: 36px;
-            color: #2c3e50;
-            border-bottom: 4px solid #3498db;
-            padding-bottom: 15px;
-            margin-bottom: 30px;
-            font-weight: bold;
-        }}
-        
-        /* Rotating message box */
-        .rotating-message {{
-            background: linear-gradient(135deg, rgba(0, 229, 86), rgba(0, 120, 168));
-            color: white;
-            padding: 40px;
-            border-radius: 15px;
-            text-align: center;
-            margin-bottom: 30px;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.15);
-            min-height: 200px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-        }}
-        
-        .message {{
-            display: none;
-        }}
-        
-        .message.active {{
-            display: block;
-            animation: fadeIn 1s ease-in-out;
-        }}
-        
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        .message-title {{
-            font-size: 32px;
-            margin-bottom: 10px;
-            font-weight: bold;
-        }}
+    # Get wisdom tip for current month
+    current_wisdom = s['wisdom']
+
+    # Check if we have a real tip (not empty dict and has a title)
+    if current_wisdom and isinstance(current_wisdom, dict) and current_wisdom.get('title'):
+        html_parts.append(f"""
+                    <div class="wisdom-card">
+                        <div class="wisdom-header">
+                            <span class="wisdom-month-badge">💡 {current_month} Wisdom Tip</span>
+                        </div>
+                        <h3 class="wisdom-title">{current_wisdom.get('title', '')}</h3>
+                        <div class="wisdom-tip-text">{current_wisdom.get('tip', '')}</div>
+        """)
         
-        .message-scripture {{
-            font-size: 18px;
-            font-style: italic;
-            opacity: 0.95;
-            margin-bottom: 20px;
-        }}
+        # Add steps if they exist
+        steps = current_wisdom.get('steps', [])
+        if steps:
+            html_parts.append(f"""
+                        <div class="wisdom-steps-title">📋 Quick Steps:</div>
+                        <ul class="wisdom-steps">
+            """)
+            for step in steps:
+                html_parts.append(f"""
+                            <li>{step}</li>
+            """)
+            html_parts.append("""
+                        </ul>
+        """)
         
-        .message-text {{
-            font-size: 20px;
-            line-height: 1.7;
-        }}
+        # Add verse if it exists
+        verse = current_wisdom.get('verse', '')
+        verse_text = current_wisdom.get('verse_text', '')
+        if verse and verse_text:
+            html_parts.append(f"""
+                        <div class="wisdom-verse-box">
+                            <div class="wisdom-verse-text">"{verse_text}"</div>
+                            <div class="wisdom-verse-ref">— {verse}</div>
+                        </div>
+        """)
         
-        .welcome-text {{
-            font-size: 18px;
-            line-height: 1.8;
-            color: #555;
-        }}
-
-        /* Date display in section title */
-        .section-title {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            font-size: 36px;
-            color: #2c3e50;
-            border-bottom: 4px solid #3498db;
-            padding-bottom: 15px;
-            margin-bottom: 30px;
-            font-weight: bold;
-        }}
-
-        .date-badge {{
-            font-size: 18px;
-            color: #3498db;
-            background: #e8f4fc;
-            padding: 5px 15px;
-            border-radius: 30px;
-            font-weight: normal;
-            display: inline-flex;
-            align-items: center;
-            gap: 5px;
-        }}
+        # Footer with theme and author
+        html_parts.append(f"""
+                        <div class="wisdom-footer">
+                            <span class="wisdom-theme">🏷️ {current_wisdom.get('theme', 'General')}</span>
+                            <span class="wisdom-author">{current_wisdom.get('author', 'GCBC')}</span>
+                        </div>
+                    </div>
+        """)
+    else:
+        # No tip for this month
+        html_parts.append(f"""
+                    <div class="no-wisdom">
+                        <span>💭</span>
+                        <p>Check back next month for a new wisdom tip!</p>
+                    </div>
+        """)
+    return ''.join(html_parts)
+
+
+# ========== BIRTHDAY TAB ==========
+# With --virtual-lists a list this long is sent as row data and the script only
+# creates the rows in view. Every row gets the same height so it can be placed
+# without measuring: the title plus one line per detail (see .event-item).
+VIRTUAL_LIST_MIN_ROWS = 100
+VIRTUAL_ROW_BASE_HEIGHT = 78
+VIRTUAL_ROW_DETAIL_HEIGHT = 29
+VIRTUAL_ROW_GAP = 20
+
+
+def render_virtual_list(rows, templates):
+    # rows: [title, detail value, ...]; templates: one per detail, '{}' is replaced by
+    # the value (a None value leaves that detail out)
+    row_height = VIRTUAL_ROW_BASE_HEIGHT + VIRTUAL_ROW_DETAIL_HEIGHT * len(templates)
+    slot = row_height + VIRTUAL_ROW_GAP
+    # '</' would end the <script> early
+    rows_json = json.dumps(rows, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    templates_json = json.dumps(templates, ensure_ascii=False).replace('&', '&amp;').replace('"', '&quot;')
+    return f"""
+                    <div class="virtual-list" style="height: {len(rows) * slot}px" data-row-height="{row_height}" data-slot="{slot}" data-templates="{templates_json}">
+                        <script type="application/json">{rows_json}</script>
+                    </div>
+    """
 
-    /* ============================================
-   MISSIONS TAB STYLES
-   ============================================ */
 
-        .missions-container {{
-            display: flex;
-            flex-direction: column;
-            gap: 30px;
-        }}
+def reads_birthdays(data, ctx):
+    return {
+        'month': ctx.month,
+        'birthdays': data['sidebar_tabs'].get('birthdays', {}).get(ctx.month, []),
+        'virtual': ctx.virtual_lists,
+    }
 
-        /* Video Section */
-        .video-section {{
-            background: #f8f9fa;
-            border-radius: 16px;
-            padding: 25px;
-            border-left: 6px solid #e74c3c;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.05);
-        }}
 
-        .video-header {{
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-bottom: 20px;
-        }}
-
-        .video-icon {{
-            font-size: 32px;
-        }}
-
-        .video-title {{
-            font-size: 20px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin: 0;
-        }}
-
-        .video-container {{
-            background: #2c3e50;
-            border-radius: 12px;
-            padding: 40px 20px;
-            text-align: center;
-            color: white;
-            margin-bottom: 15px;
-        }}
-
-        .video-placeholder {{
-            font-size: 48px;
-            margin-bottom: 15px;
-        }}
-
-        .video-link {{
-            display: inline-block;
-            background: #e74c3c;
-            color: white;
-            padding: 12px 25px;
-            border-radius: 50px;
-            text-decoration: none;
-            font-weight: bold;
-            transition: transform 0.2s, box-shadow 0.2s;
-            margin-top: 15px;
-        }}
-
-        .video-link:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 6px 15px rgba(231, 76, 60, 0.3);
-        }}
-
-        .video-meta {{
-            display: flex;
-            justify-content: space-between;
-            color: #7f8c8d;
-            font-size: 14px;
-            margin-top: 10px;
-        }}
-
-        /* Local Video Player */
-        .local-video-player {{
-            width: 100%;
-            border-radius: 12px;
-            background: #2c3e50;
-            margin-bottom: 15px;
-        }}
-
-        /* Featured Mission Card */
-        .mission-card {{
-            background: white;
-            border-radius: 16px;
-            padding: 25px;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.05);
-            border-top: 6px solid #3498db;
-        }}
-
-        .mission-header {{
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-bottom: 20px;
-        }}
-
-        .mission-icon {{
-            font-size: 32px;
-        }}
-
-        .mission-title {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin: 0;
-        }}
-
-        .mission-location {{
-            font-size: 16px;
-            color: #7f8c8d;
-            margin-left: auto;
-        }}
+def render_birthdays(s):
+    current_month = s['month']
+    current_birthdays = s['birthdays']
+    html_parts = [f"""
+                    <div class="section-title">🎂 Birthdays This Month ({current_month})</div>
+    """]
+    
+    # Birthday content
+    if s['virtual'] and len(current_birthdays) >= VIRTUAL_LIST_MIN_ROWS:
+        rows = [[birthday['name'], format_date_with_ordinal(birthday.get('date', ''))]
+                for birthday in current_birthdays if birthday.get('name')]
+        html_parts.append(render_virtual_list(rows, [f"🎂 Birthday: {current_month} {{}}"]))
+    elif current_birthdays and len(current_birthdays) > 0:
+        for birthday in current_birthdays:
+            name = birthday.get('name')
+            if not name:
+                continue
+            formatted_date = format_date_with_ordinal(birthday.get('date', ''))
+            html_parts.append(f"""    
+                    <div class="event-item">    
+                        <div class="event-title">{birthday['name']}</div>
+                        <div class="event-detail">🎂 Birthday: {current_month} {formatted_date}</div>        
+                    </div>
+            """)    
+    else:
+        html_parts.append("""
+                    <div class="event-item">
+                        <div class="event-title">No birthdays this month</div>
+                        <div class="event-description">Check back next month!</div>
+                    </div>
+        """)
+    return ''.join(html_parts)
 
-        .mission-message {{
-            font-size: 18px;
-            line-height: 1.7;
-            color: #444;
-            font-style: italic;
-            background: #f9f9f9;
-            padding: 20px;
-            border-radius: 12px;
-            margin-bottom: 20px;
-            border-left: 4px solid #3498db;
-        }}
 
-        .mission-author {{
-            font-size: 16px;
-            font-weight: bold;
-            color: #2c3e50;
-            text-align: right;
-            margin-bottom: 25px;
-        }}
+# ========== ANNIVERSARY TAB ==========
+def reads_anniversaries(data, ctx):
+    return {
+        'month': ctx.month,
+        'anniversaries': data['sidebar_tabs'].get('anniversaries', {}).get(ctx.month, []),
+        'virtual': ctx.virtual_lists,
+    }
 
-        /* Prayer Points */
-        .prayer-section {{
-            background: #e8f4fc;
-            border-radius: 12px;
-            padding: 20px;
-            margin-bottom: 25px;
-        }}
 
-        .prayer-header {{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            margin-bottom: 15px;
-            font-size: 18px;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
+def render_anniversaries(s):
+    current_month = s['month']
+    current_anniversaries = s['anniversaries']
+    html_parts = [f"""
+                    <div class="section-title">💍 Anniversaries This Month ({current_month})</div>
+    """]
+    
+    # Anniversary content
+    if s['virtual'] and len(current_anniversaries) >= VIRTUAL_LIST_MIN_ROWS:
+        rows = [[anniversary.get('names', anniversary.get('couple', '')), format_date_with_ordinal(anniversary.get('date', '')),
+                 anniversary.get('years')]
+                for anniversary in current_anniversaries if anniversary]
+        html_parts.append(render_virtual_list(rows, [f"💍 Anniversary: {current_month} {{}}", "🎉 {} years together"]))
+    elif current_anniversaries and len(current_anniversaries) > 0 and not (len(current_anniversaries) == 1 and current_anniversaries[0] == {}):
+        for anniversary in current_anniversaries:
+            if anniversary:
+                formatted_date = format_date_with_ordinal(anniversary.get('date', ''))
+                html_parts.append(f"""
+                    <div class="event-item">
+                        <div class="event-title">{anniversary.get('names', anniversary.get('couple', ''))}</div>
+                        <div class="event-detail">💍 Anniversary: {current_month} {formatted_date}</div>
+                """)
+                if 'years' in anniversary:
+                    html_parts.append(f'<div class="event-detail">🎉 {anniversary["years"]} years together</div>')
+                html_parts.append("""
+                    </div>
+                """)
+    else:
+        html_parts.append("""
+                    <div class="event-item">
+                        <div class="event-title">No anniversaries this month</div>
+                        <div class="event-description">Check back next month!</div>
+                    </div>
+        """)
+    return ''.join(html_parts)
 
-        .prayer-list {{
-            list-style: none;
-            padding: 0;
-            margin: 0;
-        }}
 
-        .prayer-list li {{
-            padding: 10px 0 10px 35px;
-            position: relative;
-            font-size: 16px;
-            color: #2c3e50;
-            border-bottom: 1px solid rgba(52, 152, 219, 0.2);
-        }}
+# ========== SERMONS TAB ==========
+def reads_sermons(data, ctx):
+    return {
+        'month': ctx.month,
+        'sermons': data['sidebar_tabs'].get('sermons', {}).get(ctx.month, []),
+    }
 
-        .prayer-list li:last-child {{
-            border-bottom: none;
-        }}
 
-        .prayer-list li:before {{
-            content: "🙏";
-            position: absolute;
-            left: 5px;
-            top: 8px;
-            font-size: 16px;
-        }}
+def render_sermons(s):
+    current_month = s['month']
+    html_parts = [f"""
+                    <div class="section-title">📖 Sermons This Month ({current_month})</div>
+                    <div class="sermons-container">
+    """]
 
-        /* Progress Bar */
-        .progress-section {{
-            background: #f9f9f9;
-            border-radius: 12px;
-            padding: 20px;
-            margin-bottom: 15px;
-        }}
+    # Get sermons for the month
+    current_sermons = s['sermons']
+    
+    # FILTER OUT EMPTY DICTIONARIES
+    valid_sermons = []
+    for sermon in current_sermons:
+        if sermon and isinstance(sermon, dict) and len(sermon) > 0 and sermon.get('title'):
+            valid_sermons.append(sermon)
 
-        .progress-label {{
-            display: flex;
-            justify-content: space-between;
-            font-size: 16px;
-            color: #2c3e50;
-            margin-bottom: 8px;
-            font-weight: bold;
-        }}
+    if valid_sermons:
+        # Sort sermon by date (ascending)
+        valid_sermons.sort(key=lambda x: x.get('date', 0))
+        
+        for i, sermon in enumerate(valid_sermons):
+            # Format date
+            formatted_date = format_date_with_ordinal(sermon.get('date', ''))
+            
+            # First sermon is open by default, others closed
+            is_first = (i == 0)
+            toggle_icon = "▼" if is_first else "▶"
+            content_class = "" if is_first else "collapsed"
+            header_active = "active" if is_first else ""
+            
+            # Make the sermon card
+            html_parts.append(f"""
+                        <div class="sermon-card">
+                            <div class="sermon-header {header_active}">
+                                <span class="toggle-icon">{toggle_icon}</span>
+                                <span class="sermon-date">📅 {current_month} {formatted_date}</span>
+                                <h3 class="sermon-title">{sermon.get('title', 'Sermon')}</h3>
+                            </div>
+                            <div class="sermon-content {content_class}">
+                                <div class="sermon-scripture">📖 {sermon.get('scripture', '')}</div>
+                                <div class="sermon-summary">{sermon.get('summary', '')}</div>
+            """)
+            
+            # Add key points
+            key_points = sermon.get('key_points', [])
+            if key_points:
+                html_parts.append(f"""
+                                <div class="key-points-title">💭 Key Points:</div>
+                                <ul class="key-points-list">
+                """)
+                for point in key_points:
+                    html_parts.append(f"""
+                                    <li>{point}</li>
+                    """)
+                html_parts.append("""
+                                </ul>
+                """)
+            
+            html_parts.append("""
+                            </div>
+                        </div>
+            """)
+    else:
+        # No valid sermons - Show message with normal styling
+        html_parts.append("""
+                        <div class="no-sermons">
+                            📖 No sermons yet this month.<br>
+                            Check back after Sunday service!
+                        </div>
+        """)
 
-        .progress-container {{
-            width: 100%;
-            height: 24px;
-            background: #e0e0e0;
-            border-radius: 12px;
-            overflow: hidden;
-            margin: 10px 0;
-        }}
+    html_parts.append("""
+                    </div>
+    """)
+    return ''.join(html_parts)
 
-        .progress-bar {{
-            height: 100%;
-            background: linear-gradient(90deg, #27ae60, #2ecc71);
-            border-radius: 12px;
-            transition: width 0.5s ease;
-            display: flex;
-            align-items: center;
-            justify-content: flex-end;
-            padding-right: 10px;
-            color: white;
-            font-size: 12px;
-            font-weight: bold;
-        }}
 
-        .progress-percent {{
-            font-size: 18px;
-            font-weight: bold;
-            color: #27ae60;
-            text-align: right;
-        }}
+# ========== INSPIRE TAB ==========
+def reads_inspire(data, ctx):
+    return {'inspire': data['sidebar_tabs'].get('inspire', {}).get(ctx.month, {})}
 
-        /* Support Section */
-        .support-section {{
-            background: linear-gradient(135deg, rgb(52, 152, 219), rgb(41, 128, 185));
-            color: white;
-            border-radius: 16px;
-            padding: 25px;
-            margin-top: 10px;
-        }}
 
-        .support-header {{
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-bottom: 20px;
-            font-size: 22px;
-            font-weight: bold;
-        }}
-
-        .support-list {{
-            list-style: none;
-            padding: 0;
-            margin: 0 0 20px 0;
-        }}
-
-        .support-list li {{
-            padding: 12px 0 12px 35px;
-            position: relative;
-            font-size: 16px;
-            border-bottom: 1px solid rgba(255,255,255,0.2);
-        }}
-
-        .support-list li:last-child {{
-            border-bottom: none;
-        }}
-
-        .support-list li:before {{
-            content: "•";
-            color: white;
-            font-weight: bold;
-            font-size: 20px;
-            position: absolute;
-            left: 8px;
-            top: 10px;
-        }}
-
-        .support-email {{
-            color: white;
-            text-decoration: underline;
-            font-weight: bold;
-        }}
-
-        /* No Mission Message */
-        .no-mission {{
-            background: #f9f9f9;
-            border: 2px dashed #3498db;
-            border-radius: 16px;
-            padding: 50px 30px;
-            text-align: center;
-            color: #7f8c8d;
-        }}
-
-        .no-mission span {{
-            font-size: 60px;
-            display: block;
-            margin-bottom: 20px;
-            opacity: 0.5;
-        }}
-
-        .no-mission h3 {{
-            font-size: 24px;
-            color: #2c3e50;
-            margin-bottom: 15px;
-        }}
-
-        .no-mission p {{
-            font-size: 16px;
-            line-height: 1.6;
-            max-width: 500px;
-            margin: 0 auto 20px;
-        }}
-
-        .no-mission .prayer-suggestions {{
-            background: #e8f4fc;
-            border-radius: 12px;
-            padding: 20px;
-            margin-top: 25px;
-            text-align: left;
-            display: inline-block;
-        }}
-
-        .no-mission .prayer-suggestions h4 {{
-            color: #2c3e50;
-            margin-bottom: 10px;
-        }}
-
-        .no-mission .prayer-suggestions ul {{
-            list-style: none;
-            padding: 0;
-        }}
-
-        .no-mission .prayer-suggestions li {{
-            padding: 5px 0 5px 25px;
-            position: relative;
-        }}
+def render_inspire(s):
+    html_parts = ["""
+                    <div class="section-title">✨ Inspire Corner</div>
+                    <div class="inspire-container">
+    """]
+    
+    current_inspire = s['inspire']
+    
+    # ========== VERSE OF THE MONTH (OPTIONAL) ==========
+    verse_data = current_inspire.get('verse_of_the_month', {})
+    
+    if verse_data and isinstance(verse_data, dict) and verse_data.get('verse') and verse_data.get('text'):
+        html_parts.append(f"""
+                        <div class="verse-card">
+                            <div class="verse-icon">📖</div>
+                            <div class="verse-text">"{verse_data.get('text', '')}"</div>
+                            <div class="verse-reference">— {verse_data.get('verse', '')}</div>
+                            <span class="verse-theme">🎯 {verse_data.get('theme', 'Weekly Verse')}</span>
+        """)
+        
+        # Optional pastor's comment
+        if verse_data.get('comment') and verse_data.get('comment_author'):
+            html_parts.append(f"""
+                            <div class="pastor-comment">
+                                <div class="pastor-comment-text">💬 {verse_data.get('comment', '')}</div>
+                                <div class="pastor-comment-author">{verse_data.get('comment_author', '')}</div>
+                            </div>
+        """)
+        
+        html_parts.append("""
+                        </div>
+        """)
+    else:
+        # No verse for this week/month
+        html_parts.append("""
+                        <div class="no-wisdom" style="border-color: rgb(217, 52, 54); color: #7f8c8d;">
+                            <span>📖</span>
+                            <p>No verse this month. Check back soon!</p>
+                        </div>
+        """)
+    
+    # ========== FEATURED TESTIMONY (OPTIONAL) ==========
+    testimony_data = current_inspire.get('featured_testimony', {})
+    
+    if testimony_data and isinstance(testimony_data, dict) and testimony_data.get('testimony') and testimony_data.get('name'):
+        html_parts.append(f"""
+                        <div class="testimony-section">
+                            <div class="testimony-header">
+                                <span class="testimony-icon">🌟</span>
+                                <h3 class="testimony-title">Featured Testimony</h3>
+                            </div>
+                            <div class="testimony-scrollbox">
+                                <div class="testimony-card">
+                                    <div class="testimony-quote">❝</div>
+                                    <div class="testimony-text">{testimony_data.get('testimony', '')}</div>
+                                    <div class="testimony-author">— {testimony_data.get('name', '')}</div>
+                                    <div class="testimony-date">{testimony_data.get('date', '')}</div>
+        """)
+        
+        # Optional verse with testimony
+        if testimony_data.get('verse'):
+            html_parts.append(f"""
+                                    <div class="testimony-verse">📖 {testimony_data.get('verse', '')}</div>
+        """)
+        
+        html_parts.append("""
+                                </div>
+                            </div>
+                        </div>
+        """)
+    else:
+        # No testimony this month
+        html_parts.append("""
+                        <div class="no-testimony">
+                            <span>🌟</span>
+                            <p>No testimony this month.</p>
+                            <p style="font-size: 14px; margin-top: 10px;">Check back next month or share your own!</p>
+                        </div>
+        """)
+    
+    # ========== SHARE YOUR STORY (ALWAYS VISIBLE) ==========
+    html_parts.append("""
+                        <div class="share-cta">
+                            <h3>💌 Share Your Story</h3>
+                            <p>Has God moved in your life? Your testimony could encourage someone else.</p>
+                            <a href="mailto:gcbctt@gmail.com?subject=My Testimony" class="share-email">📧 gcbctt@gmail.com</a>
+                        </div>
+                    </div>
+    """)
+    return ''.join(html_parts)
+
+
+# ========== MISSIONS TAB ==========
+def reads_missions(data, ctx):
+    missions = data['sidebar_tabs'].get('missions', {}).get(ctx.month, {})
+    video = missions.get('video', {}) if isinstance(missions, dict) else {}
+    video_src = ''
+    if isinstance(video, dict) and video.get('type') == 'local' and video.get('filename'):
+        video_src = ctx.asset_url(f"{VIDEOS_FOLDER}/{video['filename']}")
+    return {
+        'month': ctx.month,
+        'missions': missions,
+        'video_src': video_src,
+    }
+
+
+def render_missions(s):
+    current_month = s['month']
+    html_parts = [f"""
+                    <div class="section-title">🌍 Missions - {current_month}</div>
+                    <div class="missions-container">
+    """]
 
-        .no-mission .prayer-suggestions li:before {{
-            content: "🙏";
-            position: absolute;
-            left: 0;
-            top: 5px;
-        }}
+    # Get missions data for current month
+    current_missions = s['missions']
+    
+    if current_missions and len(current_missions) > 0 and current_missions.get('featured'):
         
-        /* Event items */
-        .event-item {{
-            background: #f8f9fa;
-            padding: 20px;
-            margin-bottom: 20px;
-            border-radius: 10px;
-            border-left: 5px solid #3498db;
-            transition: transform 0.2s;
-        }}
+        # ========== VIDEO SECTION (OPTIONAL) ==========
+        video_data = current_missions.get('video', {})
+        if video_data and isinstance(video_data, dict) and video_data.get('type'):
+            
+            if video_data.get('type') == 'youtube' and video_data.get('url'):
+                # YouTube link
+                html_parts.append(f"""
+                        <div class="video-section">
+                            <div class="video-header">
+                                <span class="video-icon">🎬</span>
+                                <h3 class="video-title">{video_data.get('title', 'Mission Video')}</h3>
+                            </div>
+                            <div class="video-container">
+                                <div class="video-placeholder">▶️</div>
+                                <p>{video_data.get('title', '')}</p>
+                                <p>Duration: {video_data.get('duration', '')}</p>
+                                <a href="{video_data.get('url', '#')}" target="_blank" class="video-link">Watch on YouTube ↗</a>
+                            </div>
+                            <div class="video-meta">
+                                <span>📅 {current_month} 2026</span>
+                                <span>🎥 Mission Update</span>
+                            </div>
+                        </div>
+                """)
+            
+            elif video_data.get('type') == 'local' and video_data.get('filename'):
+                # Local video file
+                video_src = s['video_src']
+                html_parts.append(f"""
+                        <div class="video-section">
+                            <div class="video-header">
+                                <span class="video-icon">🎬</span>
+                                <h3 class="video-title">{video_data.get('title', 'Mission Video')}</h3>
+                            </div>
+                            <video controls class="local-video-player" width="100%">
+                                <source src="{video_src}" type="video/mp4">
+                                Your browser does not support the video tag.
+                            </video>
+                            <div class="video-meta">
+                                <span>📅 {current_month} 2026</span>
+                                <span>🎥 {video_data.get('duration', '')}</span>
+                            </div>
+                        </div>
+                """)
         
-        .event-item:hover {{
-            transform: translateX(5px);
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-        }}
+        # ========== FEATURED MISSION ==========
+        html_parts.append(f"""
+                        <div class="mission-card">
+                            <div class="mission-header">
+                                <span class="mission-icon">🌍</span>
+                                <h3 class="mission-title">{current_missions.get('featured', 'Mission')}</h3>
+                                <span class="mission-location">{current_month} 2026</span>
+                            </div>
+        """)
         
-        .event-title {{
-            font-size: 22px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 12px;
-        }}
+        # Mission Update
+        update_data = current_missions.get('update', {})
+        if update_data:
+            html_parts.append(f"""
+                            <div class="mission-message">"{update_data.get('message', '')}"</div>
+                            <div class="mission-author">— {update_data.get('author', '')}</div>
+            """)
         
-        .event-detail {{
-            font-size: 16px;
-            margin: 6px 0;
-            color: #555;
-        }}
+        # ========== PRAYER POINTS ==========
+        prayer_points = current_missions.get('prayer_points', [])
+        if prayer_points and len(prayer_points) > 0:
+            html_parts.append(f"""
+                            <div class="prayer-section">
+                                <div class="prayer-header">
+                                    <span>🙏</span>
+                                    <span>Prayer Focus</span>
+                                </div>
+                                <ul class="prayer-list">
+            """)
+            for point in prayer_points:
+                html_parts.append(f"""
+                                    <li>{point}</li>
+                """)
+            html_parts.append(f"""
+                                </ul>
+                            </div>
+            """)
         
-        .event-description {{
-            margin-top: 10px;
-            font-style: italic;
-            color: #666;
-        }}
-
-        /* ============================================
-        INSPIRE TAB STYLES
-        ============================================ */
-
-        .inspire-container {{
-            display: flex;
-            flex-direction: column;
-            gap: 30px;
-        }}
-
-        /* Verse of the Week Card */
-        .verse-card {{
-            background: white;
-            padding: 30px;
-            border-radius: 16px;
-            box-shadow: 0 10px 25px rgba(0,0,0,0.15);
-            border-left: 8px solid rgba(0, 229, 86);
-            position: relative;
-            overflow: hidden;
-        }}
-
-        .verse-card::before {{
-            content: "“";
-            font-size: 120px;
-            position: absolute;
-            top: -20px;
-            left: 10px;
-            opacity: 0.1;
-            color: white;
-            font-family: Georgia, serif;
-        }}
+        # ========== PROGRESS BAR (OPTIONAL) ==========
+        progress_data = current_missions.get('progress', {})
+        if progress_data and progress_data.get('percentage') is not None:
+            percentage = progress_data.get('percentage', 0)
+            label = progress_data.get('label', 'Progress')
+            html_parts.append(f"""
+                            <div class="progress-section">
+                                <div class="progress-label">
+                                    <span>📊 {label}</span>
+                                    <span class="progress-percent">{percentage}%</span>
+                                </div>
+                                <div class="progress-container">
+                                    <div class="progress-bar" style="width: {percentage}%;"></div>
+                                </div>
+                            </div>
+            """)
+        
+        html_parts.append("""
+                        </div>
+        """)
+        
+        # ========== SUPPORT SECTION (OPTIONAL) ==========
+        support_data = current_missions.get('support', {})
+        
+        # Check if there's ANY actual content (non-empty values)
+        has_content = False
+        if support_data:
+            if support_data.get('give_link') and str(support_data.get('give_link')).strip():
+                has_content = True
+            elif support_data.get('drive') and str(support_data.get('drive')).strip():
+                has_content = True
+            elif support_data.get('email') and str(support_data.get('email')).strip():
+                has_content = True
+        
+        if has_content:
+            html_parts.append(f"""
+                        <div class="support-section">
+                            <div class="support-header">
+                                <span>💰</span>
+                                <span>How to Support</span>
+                            </div>
+                            <ul class="support-list">
+            """)
+            
+            if support_data.get('give_link') and str(support_data.get('give_link')).strip():
+                html_parts.append(f"""
+                                <li>💵 Give online: {support_data.get('give_link')}</li>
+            """)
+            if support_data.get('drive') and str(support_data.get('drive')).strip():
+                html_parts.append(f"""
+                                <li>📦 Supply drive: {support_data.get('drive')}</li>
+            """)
+            if support_data.get('email') and str(support_data.get('email')).strip():
+                html_parts.append(f"""
+                                <li>✉️ Write to missionaries: <a href="mailto:{support_data.get('email')}" class="support-email">{support_data.get('email')}</a></li>
+            """)
+            
+            html_parts.append("""
+                            </ul>
+                        </div>
+        """)
+        
+    else:
+        # No mission this month - Show empty state with prayer suggestions
+        html_parts.append("""
+                        <div class="no-mission">
+                            <span>🌍</span>
+                            <h3>No Missions Testimony This Month</h3>
+                            <p>Check back next month for updates from our missionaries around the world!</p>
+                            <div class="prayer-suggestions">
+                                <h4>🙏 In the meantime, please pray for:</h4>
+                                <ul>
+                                    <li>All missionaries serving globally</li>
+                                    <li>Upcoming mission teams</li>
+                                    <li>Open hearts in every nation</li>
+                                    <li>Safety and provision for our partners</li>
+                                </ul>
+                            </div>
+                        </div>
+        """)
 
-        .verse-icon {{
-            font-size: 32px;
-            margin-bottom: 15px;
-        }}
+    html_parts.append("""
+                    </div>
+    """)
+    return ''.join(html_parts)
 
-        .verse-text {{
-            font-size: 26px;
-            font-style: italic;
-            line-height: 1.5;
-            margin-bottom: 15px;
-            font-weight: 500;
-            position: relative;
-            z-index: 2;
-        }}
 
-        .verse-reference {{
-            font-size: 18px;
-            opacity: 0.9;
-            margin-bottom: 20px;
-            letter-spacing: 1px;
-        }}
+# ========== EVENTS TAB ==========
+def reads_events(data, ctx):
+    events = data['sidebar_tabs'].get('events', {})
+    return {
+        'permanant': events.get('permanant', []),
+        'monthly': events.get(ctx.month, []),
+    }
 
-        .verse-theme {{
-            display: inline-block;
-            background: rgba(52, 45, 45, 0.15);
-            padding: 6px 20px;
-            border-radius: 40px;
-            font-size: 14px;
-            font-weight: bold;
-            border: 1px solid rgba(255,255,255,0.3);
-            margin-bottom: 15px;
-        }}
 
-        /* Pastor's Comment (Optional) */
-        .pastor-comment {{
-            background: rgba(255,255,255,0.1);
-            padding: 18px 22px;
-            border-radius: 12px;
-            margin-top: 20px;
-            border-left: 4px solid #f1c40f;
-        }}
+def render_events(s):
+    html_parts = ["""
+                    <div class="section-title">📅 Events</div>
+    """]
 
-        .pastor-comment-text {{
-            font-size: 17px;
-            line-height: 1.6;
-            font-style: italic;
-            margin-bottom: 8px;
-        }}
+    #Get permanent event (Will always show)
+    permanant_events = s['permanant']
 
-        .pastor-comment-author {{
-            font-size: 15px;
-            font-weight: bold;
-            opacity: 0.9;
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }}
+    #Get monthly events
+    monthly_events = s['monthly']
 
-        .pastor-comment-author:before {{
-            content: "—";
-            margin-right: 4px;
-        }}
+    #Combine them (both permenant and monthly)
+    all_events = []
 
-        /* Testimony Section */
-        .testimony-section {{
-            background: white;
-            border-radius: 16px;
-            padding: 25px;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.06);
-            border-top: 6px solid rgba(0, 229, 86);
-        }}
+    #Add perm events
+    for event in permanant_events:
+        if event:
+            all_events.append(event)
 
-        .testimony-header {{
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-bottom: 20px;
-        }}
+    #Add monthly event
+    for event in monthly_events:
+        if event:
+            all_events.append(event)
 
-        .testimony-icon {{
-            font-size: 28px;
-        }}
+    # Add events
+    if all_events:
+        for event in all_events:
+            html_parts.append(f"""
+                        <div class="event-item">
+                            <div class="event-title">{event['title']}</div>
+                            <div class="event-detail">📅 {event['date']}</div>
+                            <div class="event-detail">🕐 {event['time']}</div>
+                            <div class="event-detail">📍 {event['location']}</div>
+                            <div class="event-description">{event['description']}</div>
+                        </div>
+            """) 
+    else:
+        html_parts.append(f"""
+            <div class="event-item">
+                <div class="event-title">No events this month</div>
+                <div class="event-description">Check back next month!</div>
+            </div>
+        """)
+    return ''.join(html_parts)
 
-        .testimony-title {{
-            font-size: 22px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin: 0;
-        }}
 
-        /* SCROLLBOX - Fixed height with custom scrollbar */
-        .testimony-scrollbox {{
-            max-height: 250px;
-            overflow-y: auto;
-            padding-right: 15px;
-            margin-bottom: 5px;
-        }}
+# ========== ANNOUNCEMENTS TAB ==========
+def reads_news(data, ctx):
+    return {'announcements': data['sidebar_tabs']['announcements']}
 
-        /* Custom scrollbar */
-        .testimony-scrollbox::-webkit-scrollbar {{
-            width: 6px;
-        }}
 
-        .testimony-scrollbox::-webkit-scrollbar-track {{
-            background: #f0f0f0;
-            border-radius: 10px;
-        }}
+def render_news(s):
+    html_parts = ["""
+                    <div class="section-title">📢 Announcements</div>
+    """]
+    
+    # Add announcements
+    for announcement in s['announcements']:
+        html_parts.append(f"""
+                    <div class="announcement-item">{announcement}</div>
+        """)
+    return ''.join(html_parts)
 
-        .testimony-scrollbox::-webkit-scrollbar-thumb {{
-            background: rgba(0, 229, 86);
-            border-radius: 10px;
-        }}
 
-        .testimony-scrollbox::-webkit-scrollbar-thumb:hover {{
-            background: #8e44ad;
-        }}
+# ========== CONTACT TAB ==========
+def reads_contact(data, ctx):
+    return {'contact': data['sidebar_tabs']['contact']}
 
-        /* Testimony Card */
-        .testimony-card {{
-            background: #f9f9f9;
-            border-radius: 12px;
-            padding: 20px;
-            border-left: 5px solid rgba(0, 229, 86);
-        }}
 
-        .testimony-quote {{
-            font-size: 20px;
-            color: rgba(0, 229, 86);
-            margin-bottom: 10px;
-            opacity: 0.7;
-        }}
+def render_contact(s):
+    # Add contact info
+    contact = s['contact']
+    return f"""
+                    <div class="section-title">📞 Contact Us</div>
+                    <div class="contact-grid">
+                        <div class="contact-item">
+                            <div class="contact-label">Phone</div>
+                            <div class="contact-value">{contact['phone']}</div>
+                        </div>
+                        <div class="contact-item">
+                            <div class="contact-label">Mail</div>
+                            <div class="contact-value">{contact['mail']}</div>
+                        </div>
+                        <div class="contact-item">
+                            <div class="contact-label">Email</div>
+                            <div class="contact-value">{contact['email']}</div>
+                        </div>
+                        <div class="contact-item">
+                            <div class="contact-label">Address</div>
+                            <a href="https://maps.app.goo.gl/Z1PNBhH6kBJWH3zk8"><div class="contact-value">{contact['address']}</div></a>
+                        </div>
+                    </div>
+    """
 
-        .testimony-text {{
-            font-size: 16px;
-            line-height: 1.7;
-            color: #444;
-            margin-bottom: 20px;
-            white-space: pre-line;
-        }}
 
-        .testimony-author {{
-            font-weight: bold;
-            color: #2c3e50;
-            font-size: 16px;
-            margin-bottom: 5px;
-        }}
+# ========== ABOUT TAB ==========
+def reads_about(data, ctx):
+    return {'about': data['sidebar_tabs']['about']}
 
-        .testimony-date {{
-            font-size: 13px;
-            color: #7f8c8d;
-            margin-bottom: 10px;
-        }}
 
-        .testimony-verse {{
-            font-size: 14px;
-            color: #9b59b6;
-            font-style: italic;
-            padding-top: 10px;
-            border-top: 1px solid #e0e0e0;
-        }}
+def render_about(s):
+    # Add about info
+    about = s['about']
+    return f"""
+                    <div class="section-title">ℹ️ About Us</div>
+                    <div class="about-section">
+                        <div class="about-heading">Our Mission Statement</div>
+                        <div class="about-text">{about['mission']}</div>
+                    </div>
+                    <div class="about-section">
+                        <div class="about-heading">Leadership</div>
+                        <div class="about-text">{about['leadership']}</div>
+                    </div>
+    """
+
+
+# Tab order here is the order of the buttons and of showTab(index)
+SECTIONS = [
+    Section('home', '🏠', 'HOME', reads_home, render_home),
+    Section('birthdays', '🎂', 'BIRTHDAY', reads_birthdays, render_birthdays),
+    Section('anniversaries', '💍', 'ANNIVERSARY', reads_anniversaries, render_anniversaries),
+    Section('sermons', '📖', 'SERMONS', reads_sermons, render_sermons),
+    Section('inspire', '✨', 'INSPIRE', reads_inspire, render_inspire),
+    Section('missions', '🌍', 'MISSIONS', reads_missions, render_missions),
+    Section('events', '📅', 'EVENTS', reads_events, render_events),
+    Section('news', '📢', 'NEWS', reads_news, render_news),
+    Section('contact', '📞', 'CONTACT', reads_contact, render_contact),
+    Section('about', 'ℹ️', 'ABOUT', reads_about, render_about),
+]
+
+
+# ========== RIGHT SIDE ==========
+def render_slideshow(s):
+    html_parts = ["""
+        <!-- RIGHT: Church Info with Slideshow Background -->
+        <div class="right-container">
+            <!-- Slideshow Background -->
+            <div class="slideshow-background">
+    """]
+    
+    # Add slideshow if it exists. Only the first slide loads with the page,
+    # the script loads and decodes each next slide before showing it.
+    if s['images']:
+        for i, slide in enumerate(s['images']):
+            if i == 0:
+                img_attrs = 'class="slideshow-image active" fetchpriority="high" alt="Slideshow Image 1"'
+            else:
+                img_attrs = f'class="slideshow-image " decoding="async" alt="Slideshow Image {i+1}"'
+            html_parts.append(f"""
+                {render_picture(slide, img_attrs, SLIDESHOW_SIZES, '                ', deferred=i > 0)}
+            """)
+    else:
+        html_parts.append("""
+                <div class="no-images-message">
+                    Add images to 'slideshow_folder'
+                </div>
+        """)
+    
+    html_parts.append("""
+            </div>
+    """)
+    return ''.join(html_parts)
 
-        /* No testimony message */
-        .no-testimony {{
-            background: #f9f9f9;
-            border: 2px dashed rgb(217, 52, 54);
-            border-radius: 12px;
-            padding: 40px;
-            text-align: center;
-            color: #7f8c8d;
-        }}
 
-        .no-testimony span {{
-            font-size: 40px;
-            display: block;
-            margin-bottom: 10px;
-        }}
+def render_church_header(s):
+    return f"""
+            <!-- Semi-transparent overlay -->
+            <div class="slideshow-overlay"></div>
+            
+            <!-- Church Info (on top of slideshow) -->
+            <div class="church-header">
+                <div class="church-logo">
+                    {render_picture(s['logo'], 'alt="Church Logo"', LOGO_SIZES, '                    ')}
+                </div>
+                <div class="church-name">{s['name']}</div>
+                <div class="church-tagline">{s['tagline']}</div>
+            </div>
+        </div>
+    </div>
+    """
 
-        .no-testimony p {{
-            font-size: 16px;
-        }}
 
-        /* Share Your Story CTA */
-        .share-cta {{
-            background: linear-gradient(135deg, rgb(52, 152, 219), rgb(41, 128, 185));
-            color: white;
-            padding: 25px;
-            border-radius: 16px;
-            text-align: center;
-            box-shadow: 0 8px 20px rgba(52, 152, 219, 0.2);
-        }}
+def render_script(s):
+    if s['external']:
+        return """
+</body>
+</html>
+"""
+    return f"""
+    <script>
+{SCRIPT}
+    </script>
+</body>
+</html>
+"""
 
-        .share-cta h3 {{
-            font-size: 22px;
-            font-weight: bold;
-            margin-bottom: 12px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 10px;
-        }}
 
-        .share-cta p {{
-            font-size: 16px;
-            line-height: 1.6;
-            margin-bottom: 20px;
-            opacity: 0.95;
-        }}
+def render_month_sections(month_variants, months):
+    # Every different tab HTML once, and for each tab that changes with the month
+    # [tab index, [variant of January, ..., variant of December]]
+    index = {}
+    table = [[tab, [index.setdefault(html, len(index)) for html in htmls]] for tab, htmls in month_variants]
+    # '</' would end the <script> early, and the tabs' HTML comments must not look like '<!--' to it either
+    month_json = json.dumps({'months': months, 'variants': list(index), 'sections': table},
+                            ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/').replace('<!--', '\\u003c!--')
+    return f"""
+        <script type="application/json" id="month-sections">{month_json}</script>
+"""
 
-        .share-email {{
-            display: inline-block;
-            background: white;
-            color: #2c3e50;
-            padding: 12px 25px;
-            border-radius: 50px;
-            font-weight: bold;
-            font-size: 16px;
-            text-decoration: none;
-            transition: transform 0.2s, box-shadow 0.2s;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-        }}
 
-        .share-email:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 6px 15px rgba(0,0,0,0.15);
-        }}
+def render_page(data, slideshow_images, ctx):
+    return ''.join(iter_html(data, slideshow_images, ctx))
 
 
-        /* Sermons section */
-        .sermons-container {{
-            display: flex;
-            flex-direction: column;
-            gap: 25px;
-            margin-top: 10px;
-        }}
+def render_page_parts(data, slideshow_images, ctx, profiler=None):
+    return list(iter_html(data, slideshow_images, ctx, profiler))
 
-        .sermon-card {{
-            background: #fff;
-            border-radius: 12px;
-            border-left: 6px solid rgba(37, 150, 190);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-            overflow: hidden;
-            transition: transform 0.2s, box-shadow 0.2s;
-            margin-bottom: 15px;
-        }}
 
-        .sermon-card:hover {{
-            transform: translateX(5px);
-            box-shadow: 0 8px 20px rgba(155, 89, 182, 0.15);
-        }}
+def iter_html(data, slideshow_images, ctx, profiler=None):
+    # Yields the page piece by piece so it can be streamed to disk without joining it first
+    church = data['church_info']
 
-        .sermon-header {{
-            background: linear-gradient(135deg, rgba(37, 150, 190), rgb(10, 203, 84));
+    def fragment(name, render, data_slice):
+        if not profiler:
+            return render_fragment(name, render, data_slice)
+        cached = _fragment_cache.get(name)
+        started = time.perf_counter()
+        html = render_fragment(name, render, data_slice)
+        profiler.record_section(name, time.perf_counter() - started, html,
+                                cached is not None and _fragment_cache.get(name) is cached)
+        return html
+
+    # With --prune-css the styles depend on the classes the body uses, so the body is
+    # rendered (and held) before the head; otherwise it is streamed right after it
+    elsewhere = []
+    body = iter_body(data, slideshow_images, ctx, fragment, elsewhere)
+    css = STYLESHEET
+    if ctx.prune_css:
+        body = list(body)
+        css = prune_css(STYLESHEET, used_classes(body + elsewhere))
+    yield fragment('head', render_head, {
+        'name': church['name'],
+        'css': css,
+        'stylesheet': ctx.stylesheet_url(css) if ctx.stylesheet_url else None,
+        'script': ctx.script_url(SCRIPT) if ctx.script_url else None,
+    })
+    yield from body
+
+
+def iter_body(data, slideshow_images, ctx, fragment, elsewhere):
+    # Tabs that are not part of the page as it is sent (lazy tabs, other months) are added to elsewhere
+    church = data['church_info']
+    live = f' data-live="{LIVE_FILE}" data-live-interval="{LIVE_POLL_MS}"' if ctx.live_url else ''
+    yield f"""<body{live}>
+    <div class="container">
+"""
+    yield fragment('tab_buttons', render_tab_buttons, {'tabs': [(sec.icon, sec.label) for sec in SECTIONS]})
+
+    month_variants = []
+    for i, section in enumerate(SECTIONS):
+        active_class = " active" if i == 0 else ""
+        if ctx.months:
+            # A year page: tabs that differ between months are left empty, the script fills them in
+            htmls = [fragment(f'{section.name}@{month}', section.render, section.reads(data, ctx._replace(month=month)))
+                     for month in ctx.months]
+            if len(set(htmls)) > 1:
+                month_variants.append((i, htmls))
+                elsewhere.extend(set(htmls))
+                yield f"""
+                <!-- {section.label} TAB (tab {i}) -->
+                <div class="content-section{active_class}"></div>
+"""
+                continue
+            html = htmls[0]
+        else:
+            html = fragment(section.name, section.render, section.reads(data, ctx))
+        # With --live the page knows which version of each tab it shows
+        live = f' data-live="{ctx.live_url(section.name, html)}"' if ctx.live_url else ''
+        # With --lazy-tabs only HOME is in the page, the script fetches the others when opened
+        if i > 0 and ctx.tab_url:
+            elsewhere.append(html)
+            yield f"""
+                <!-- {section.label} TAB (tab {i}) -->
+                <div class="content-section" data-src="{ctx.tab_url(section.name, html)}"{live}></div>
+"""
+            continue
+        yield f"""
+                <!-- {section.label} TAB (tab {i}) -->
+                <div class="content-section{active_class}"{live}>"""
+        yield html
+        yield """
+                </div>
+"""
+
+    yield """            </div>
+        </div>
+"""
+    if month_variants:
+        yield render_month_sections(month_variants, ctx.months)
+    slides = [image_slice(f"{SLIDESHOW_FOLDER}/{img}", ctx) for img in slideshow_images]
+    yield fragment('slideshow', render_slideshow, {'images': slides})
+    yield fragment('church_header', render_church_header, {
+        'name': church['name'],
+        'tagline': church['tagline'],
+        'logo': image_slice(LOGO_FILE, ctx),
+    })
+    yield fragment('script', render_script, {'external': bool(ctx.script_url)})
+
+
+# ============================================
+# STYLESHEET
+# ============================================
+# The page styles. Inlined into <head> by default; with --external-css they are
+# minified into brochure.<hash>.css (cacheable forever, a new name when they change)
+# and only the critical part, what the HOME tab and the church header need, is inlined.
+# With --prune-css the rules for classes the rendered page does not use are dropped first.
+
+# File name of the external stylesheet and script: brochure.<hash>.css/.js
+GENERATED_STEM = 'brochure'
+# With --live the open page polls this file to find out which tabs changed
+LIVE_FILE = f'{GENERATED_STEM}-live.json'
+LIVE_POLL_MS = 30000
+
+# Only names publish_generated makes, never other files that happen to start with 'brochure'
+GENERATED_NAME = re.compile(rf'{GENERATED_STEM}(-[\w-]+)?\.[0-9a-f]{{10}}\.(css|js|html)')
+
+# Classes the first screen uses (a trailing '-' matches every class starting with it),
+# plus the state classes the script switches on it
+CRITICAL_CLASSES = (
+    'active', 'exiting', 'container', 'left-container', 'tab-', 'content-area', 'content-section', 'section-title', 'date-badge',
+    'welcome-text', 'rotating-message', 'message', 'message-', 'wisdom-', 'no-wisdom',
+    'right-container', 'slideshow-', 'no-images-message', 'church-',
+)
+
+# Classes the script adds at runtime, including those of the rows it builds for
+# virtual lists, so they are never pruned
+SCRIPT_CLASSES = ('active', 'collapsed', 'exiting', 'event-item', 'event-title', 'event-detail')
+
+STYLESHEET = """        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        
+        body {
+            font-family: 'Georgia', serif;
+            height: 100vh;
+            overflow: hidden;
+        }
+        
+        .container {
+            display: flex;
+            height: 100vh;
+        }
+        
+        /* ============================================
+           LEFT CONTAINER - Content + Tabs
+           ============================================ */
+        .left-container {
+            width: 50%;
+            background: #ecf0f1;
+            display: flex;
+            overflow: hidden;
+        }
+        
+        .tab-buttons {
+            width: 80px;
+            background: linear-gradient(135deg, rgba(0, 229, 86), rgba(0, 120, 168));
+            display: flex;
+            flex-direction: column;
+            padding: 15px 0;
+            gap: 8px;
+            position: sticky;
+            top: 0;
+            height: 100vh;
+            overflow-y: auto;
+            scrollbar-width: none;
+            -ms-overflow-style: none;
+        }
+
+        .tab-buttons::-webkit-scrollbar{
+            display: none;
+        }
+        
+        .tab-button {
+            background: #2c3e50;
             color: white;
-            padding: 18px 25px;
+            border: none;
+            padding: 20px 10px;
+            margin: 0 10px;
+            cursor: pointer;
+            border-radius: 8px;
+            transition: all 0.3s;
             display: flex;
+            flex-direction: column;
             align-items: center;
-            gap: 15px;
-            cursor: pointer;
-            transition: background 0.2s;
-        }}
-
-        .sermon-header:hover {{
-            background: linear-gradient(135deg, #1e8a8c, #0e7c6f); /* Match your teal/green theme */
-        }}
-
-        .sermon-header .toggle-icon {{
-            font-size: 20px;
-            width: 24px;
-            text-align: center;
-            transition: transform 0.3s;
-        }}
-
-        .sermon-date {{
-            background: rgba(255,255,255,0.2);
-            padding: 8px 16px;
-            border-radius: 30px;
-            font-size: 16px;
-            font-weight: bold;
-            display: inline-flex;
+            justify-content: center;
+        }
+        
+        .tab-button:hover {
+            background: #1a252f;
+            transform: scale(1.05);
+        }
+        
+        .tab-button.active {
+            background: #3498db;
+        }
+        
+        .tab-icon {
+            font-size: 26px;
+            margin-bottom: 8px;
+        }
+        
+        .tab-text {
+            display: flex;
+            flex-direction: column;
             align-items: center;
-            gap: 5px;
-        }}
-
-        .sermon-title {{
-            font-size: 22px;
+            font-size: 14px;
             font-weight: bold;
-            margin: 0;
+            letter-spacing: 1px;
+            line-height: 1.4;
+        }
+        
+        .tab-text span {
+            display: block;
+        }
+        
+        .content-area {
             flex: 1;
-        }}
-
-        .sermon-content {{
-            padding: 25px;
-            border-top: 1px solid #eee;
             background: white;
-            transition: all 0.3s ease;
-        }}
-
-        .sermon-content.collapsed {{
+            padding: 40px;
+            overflow-y: auto;
+            height: 100vh;
+            scrollbar-width: none;
+            -ms-overflow-style: none;
+        }
+        
+        .content-section {
             display: none;
-        }}
-
-        .sermon-scripture {{
-            display: inline-block;
-            background: rgb(231, 245, 230);
-            color: rgba(37, 150, 190);
-            padding: 8px 18px;
-            border-radius: 25px;
-            font-size: 16px;
+        }
+        
+        .content-section.active {
+            display: block;
+            animation: slideIn 0.3s ease;
+        }
+        
+        @keyframes slideIn {
+            from { opacity: 0; transform: translateX(-20px); }
+            to { opacity: 1; transform: translateX(0); }
+        }
+        
+        .section-title {
+            font-size: 36px;
+            color: #2c3e50;
+            border-bottom: 4px solid #3498db;
+            padding-bottom: 15px;
+            margin-bottom: 30px;
+            font-weight: bold;
+        }
+        
+        /* Rotating message box */
+        .rotating-message {
+            background: linear-gradient(135deg, rgba(0, 229, 86), rgba(0, 120, 168));
+            color: white;
+            padding: 40px;
+            border-radius: 15px;
+            text-align: center;
+            margin-bottom: 30px;
+            box-shadow: 0 8px 20px rgba(0,0,0,0.15);
+            min-height: 200px;
+            display: flex;
+            flex-direction: column;
+            justify-content: center;
+        }
+        
+        .message {
+            display: none;
+        }
+        
+        .message.active {
+            display: block;
+            animation: fadeIn 1s ease-in-out;
+        }
+        
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(10px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
+        
+        .message-title {
+            font-size: 32px;
+            margin-bottom: 10px;
             font-weight: bold;
+        }
+        
+        .message-scripture {
+            font-size: 18px;
+            font-style: italic;
+            opacity: 0.95;
             margin-bottom: 20px;
-            border-left: 3px solid rgba(37, 150, 190);
-        }}
-
-        .sermon-summary {{
-            font-size: 16px;
+        }
+        
+        .message-text {
+            font-size: 20px;
             line-height: 1.7;
-            color: #444;
-            margin-bottom: 20px;
-            padding: 15px;
-            background: #f9f9f9;
-            border-radius: 8px;
-            border-left: 3px solid #ddd;
-        }}
-
-        .key-points-title {{
+        }
+        
+        .welcome-text {
             font-size: 18px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 12px;
+            line-height: 1.8;
+            color: #555;
+        }
+
+        /* Date display in section title */
+        .section-title {
             display: flex;
+            justify-content: space-between;
             align-items: center;
-            gap: 8px;
-        }}
+            font-size: 36px;
+            color: #2c3e50;
+            border-bottom: 4px solid #3498db;
+            padding-bottom: 15px;
+            margin-bottom: 30px;
+            font-weight: bold;
+        }
 
-        .key-points-list {{
-            list-style: none;
-            padding: 0;
-            margin: 0;
-        }}
+        .date-badge {
+            font-size: 18px;
+            color: #3498db;
+            background: #e8f4fc;
+            padding: 5px 15px;
+            border-radius: 30px;
+            font-weight: normal;
+            display: inline-flex;
+            align-items: center;
+            gap: 5px;
+        }
 
-        .key-points-list li {{
-            padding: 8px 0 8px 25px;
-            position: relative;
-            font-size: 15px;
-            color: #555;
-            border-bottom: 1px solid #eee;
-        }}
+    /* ============================================
+   MISSIONS TAB STYLES
+   ============================================ */
 
-        .key-points-list li:last-child {{
-            border-bottom: none;
-        }}
+        .missions-container {
+            display: flex;
+            flex-direction: column;
+            gap: 30px;
+        }
 
-        .key-points-list li:before {{
-            content: "•";
-            color: rgba(37, 150, 190);
-            font-weight: bold;
-            font-size: 20px;
-            position: absolute;
-            left: 5px;
-            top: 5px;
-        }}
+        /* Video Section */
+        .video-section {
+            background: #f8f9fa;
+            border-radius: 16px;
+            padding: 25px;
+            border-left: 6px solid #e74c3c;
+            box-shadow: 0 8px 20px rgba(0,0,0,0.05);
+        }
 
-        /* No sermons message */
-        .no-sermons {{
-            display: block !important;
-            background: #f5f0f7 !important;
-            padding: 40px !important;
-            text-align: center !important;
-            border-radius: 12px !important;
-            color: rgb(127, 140, 141) !important;
-            font-size: 18px !important;
-            border: 2px dashed rgb(217, 52, 54) !important;
-            margin: 20px 0 !important;
-            opcaity: 1 !important;
-            visibilty: visible !important;
-        }}
+        .video-header {
+            display: flex;
+            align-items: center;
+            gap: 12px;
+            margin-bottom: 20px;
+        }
 
-        .no-sermons br {{
-            margin-bottom: 10px;
-        }}
-        
-        /* Announcements */
-        .announcement-item {{
-            background: #fff3cd;
-            padding: 15px;
-            margin-bottom: 12px;
-            border-radius: 8px;
-            border-left: 5px solid #ffc107;
-            font-size: 16px;
-            color: #856404;
-        }}
-        
-        /* Contact section */
-        .contact-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-top: 20px;
-        }}
-        
-        .contact-item {{
-            background: #e8f4f8;
-            padding: 20px;
-            border-radius: 10px;
-        }}
-        
-        .contact-label {{
-            font-weight: bold;
-            color: #2c3e50;
-            font-size: 16px;
-            margin-bottom: 8px;
-        }}
-        
-        .contact-value {{
-            font-size: 16px;
-            color: #555;
-        }}
-        
-        /* About section */
-        .about-section {{
-            margin-bottom: 25px;
-        }}
-        
-        .about-heading {{
-            color: #3498db;
-            font-size: 20px;
-            margin-bottom: 10px;
-            font-weight: bold;
-        }}
-        
-        .about-text {{
-            font-size: 16px;
-            line-height: 1.6;
-            color: #555;
-        }}
+        .video-icon {
+            font-size: 32px;
+        }
 
-        .about-text .highlight{{
+        .video-title {
             font-size: 20px;
             font-weight: bold;
-            color: rgb(230, 7, 7);
-        }}
-        
-        /* ============================================
-           RIGHT CONTAINER - Church Info + Slideshow
-           ============================================ */
-        .right-container {{
-            width: 50%;
-            position: relative;
-            overflow: hidden;
+            color: #2c3e50;
+            margin: 0;
+        }
+
+        .video-container {
+            background: #2c3e50;
+            border-radius: 12px;
+            padding: 40px 20px;
+            text-align: center;
             color: white;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            padding: 40px;
-        }}
+            margin-bottom: 15px;
+        }
 
-        /* Slideshow Background */
-        .slideshow-background {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            z-index: 1;
-        }}
+        .video-placeholder {
+            font-size: 48px;
+            margin-bottom: 15px;
+        }
 
-        .slideshow-image {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-            opacity: 0;
-            transition: opacity 2s ease-in-out, transform 15s linear;
-            transform: scale(1.1); 
-        }}
+        .video-link {
+            display: inline-block;
+            background: #e74c3c;
+            color: white;
+            padding: 12px 25px;
+            border-radius: 50px;
+            text-decoration: none;
+            font-weight: bold;
+            transition: transform 0.2s, box-shadow 0.2s;
+            margin-top: 15px;
+        }
 
-        .slideshow-image.active {{
-            opacity: 0.6; 
-            transform: scale(1);
-        }}
+        .video-link:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 6px 15px rgba(231, 76, 60, 0.3);
+        }
 
-        .slideshow-image.exiting {{
-            opacity: 0;
-            transform: translateX(-100%) scale(1.05);
-        }}
+        .video-meta {
+            display: flex;
+            justify-content: space-between;
+            color: #7f8c8d;
+            font-size: 14px;
+            margin-top: 10px;
+        }
 
-        /* Semi-transparent overlay */
-        .slideshow-overlay {{
-            position: absolute;
-            top: 0;
-            left: 0;
+        /* Local Video Player */
+        .local-video-player {
             width: 100%;
-            height: 100%;
-            background: linear-gradient(135deg, 
-                rgba(0, 229, 86, 0.5), 
-                rgba(0, 120, 168, 0.7));
-            z-index: 2;
-        }}
+            border-radius: 12px;
+            background: #2c3e50;
+            margin-bottom: 15px;
+        }
 
-        /* Church info on top */
-        .church-header {{
-            text-align: center;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            width: 100%;
-            z-index: 3;
-            position: relative;
-            margin-bottom: 0;
-        }}
+        /* Featured Mission Card */
+        .mission-card {
+            background: white;
+            border-radius: 16px;
+            padding: 25px;
+            box-shadow: 0 8px 20px rgba(0,0,0,0.05);
+            border-top: 6px solid #3498db;
+        }
 
-        .church-logo {{
-            margin: 0 auto 25px;
-            text-align: center;
+        .mission-header {
             display: flex;
-            justify-content: center;
             align-items: center;
-            width: 100%;
-        }}
+            gap: 12px;
+            margin-bottom: 20px;
+        }
 
-        .church-logo img {{
-            max-width: 250px;
-            width: 60%;
-            height: auto;
-            display: block;
-            margin: 0 auto;
-            filter: drop-shadow(0 4px 6px rgba(0,0,0,0.3));
-        }}
+        .mission-icon {
+            font-size: 32px;
+        }
 
-        .church-name {{
-            font-size: 40px;
+        .mission-title {
+            font-size: 24px;
             font-weight: bold;
-            margin-bottom: 12px;
-            line-height: 1.3;
-            text-align: center;
-            width: 100%;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        }}
+            color: #2c3e50;
+            margin: 0;
+        }
 
-        .church-tagline {{
-            font-size: 20px;
-            opacity: 0.95;
-            text-align: center;
-            width: 100%;
-            text-shadow: 1px 1px 3px rgba(0,0,0,0.5);
-        }}
+        .mission-location {
+            font-size: 16px;
+            color: #7f8c8d;
+            margin-left: auto;
+        }
 
-        /* Message when no images */
-        .no-images-message {{
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            color: white;
+        .mission-message {
             font-size: 18px;
-            text-align: center;
+            line-height: 1.7;
+            color: #444;
+            font-style: italic;
+            background: #f9f9f9;
             padding: 20px;
-            background: rgba(0,0,0,0.5);
-            border-radius: 10px;
-            z-index: 3;
-        }}
+            border-radius: 12px;
+            margin-bottom: 20px;
+            border-left: 4px solid #3498db;
+        }
 
-        /* ============================================
-        WISDOM TIP CARD - HOME PAGE
-        ============================================ */
+        .mission-author {
+            font-size: 16px;
+            font-weight: bold;
+            color: #2c3e50;
+            text-align: right;
+            margin-bottom: 25px;
+        }
 
-        .wisdom-card {{
-            background: linear-gradient(135deg, rgba(0, 229, 86), rgba(0, 120, 168));
-            color: white;
-            padding: 30px;
-            border-radius: 16px;
-            margin-top: 30px;
-            margin-bottom: 20px;
-            box-shadow: 0 10px 25px rgba(243, 156, 18, 0.25);
-            border-left: 8px solid #fff;
-            position: relative;
-            overflow: hidden;
-        }}
-
-        .wisdom-card::before {{
-            content: "💡";
-            font-size: 80px;
-            position: absolute;
-            bottom: -10px;
-            right: 10px;
-            opacity: 0.1;
-            color: white;
-        }}
+        /* Prayer Points */
+        .prayer-section {
+            background: #e8f4fc;
+            border-radius: 12px;
+            padding: 20px;
+            margin-bottom: 25px;
+        }
 
-        .wisdom-header {{
+        .prayer-header {
             display: flex;
             align-items: center;
-            gap: 12px;
-            margin-bottom: 15px;
-        }}
-
-        .wisdom-month-badge {{
-            background: rgba(255,255,255,0.2);
-            padding: 6px 16px;
-            border-radius: 40px;
-            font-size: 13px;
-            font-weight: bold;
-            text-transform: uppercase;
-            letter-spacing: 1.5px;
-            border: 1px solid rgba(255,255,255,0.3);
-        }}
-
-        .wisdom-title {{
-            font-size: 26px;
-            font-weight: bold;
+            gap: 10px;
             margin-bottom: 15px;
-            line-height: 1.3;
-        }}
-
-        .wisdom-tip-text {{
-            font-size: 18px;
-            line-height: 1.6;
-            margin-bottom: 20px;
-            font-style: italic;
-            background: rgba(255,255,255,0.1);
-            padding: 18px;
-            border-radius: 12px;
-            border-left: 4px solid white;
-        }}
-
-        .wisdom-steps-title {{
             font-size: 18px;
             font-weight: bold;
-            margin-bottom: 12px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }}
+            color: #2c3e50;
+        }
 
-        .wisdom-steps {{
+        .prayer-list {
             list-style: none;
             padding: 0;
-            margin: 0 0 25px 0;
-            background: rgba(255,255,255,0.05);
-            border-radius: 12px;
-            padding: 15px 20px;
-        }}
+            margin: 0;
+        }
 
-        .wisdom-steps li {{
+        .prayer-list li {
             padding: 10px 0 10px 35px;
             position: relative;
             font-size: 16px;
-            border-bottom: 1px solid rgba(255,255,255,0.15);
-        }}
+            color: #2c3e50;
+            border-bottom: 1px solid rgba(52, 152, 219, 0.2);
+        }
 
-        .wisdom-steps li:last-child {{
+        .prayer-list li:last-child {
             border-bottom: none;
-        }}
+        }
 
-        .wisdom-steps li:before {{
-            content: "✓";
+        .prayer-list li:before {
+            content: "🙏";
             position: absolute;
-            left: 8px;
-            top: 10px;
-            color: white;
-            font-weight: bold;
+            left: 5px;
+            top: 8px;
             font-size: 16px;
-            background: rgba(255,255,255,0.2);
-            width: 20px;
-            height: 20px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }}
+        }
 
-        .wisdom-verse-box {{
-            background: rgba(255,255,255,0.15);
-            padding: 18px;
+        /* Progress Bar */
+        .progress-section {
+            background: #f9f9f9;
             border-radius: 12px;
-            margin-bottom: 20px;
-            border-left: 4px solid white;
-        }}
+            padding: 20px;
+            margin-bottom: 15px;
+        }
 
-        .wisdom-verse-text {{
-            font-size: 17px;
-            font-style: italic;
+        .progress-label {
+            display: flex;
+            justify-content: space-between;
+            font-size: 16px;
+            color: #2c3e50;
             margin-bottom: 8px;
-            line-height: 1.5;
-        }}
-
-        .wisdom-verse-ref {{
-            font-size: 15px;
             font-weight: bold;
-            opacity: 0.95;
-        }}
+        }
+
+        .progress-container {
+            width: 100%;
+            height: 24px;
+            background: #e0e0e0;
+            border-radius: 12px;
+            overflow: hidden;
+            margin: 10px 0;
+        }
 
-        .wisdom-footer {{
+        .progress-bar {
+            height: 100%;
+            background: linear-gradient(90deg, #27ae60, #2ecc71);
+            border-radius: 12px;
+            transition: width 0.5s ease;
             display: flex;
-            justify-content: space-between;
             align-items: center;
-            flex-wrap: wrap;
-            gap: 10px;
-        }}
+            justify-content: flex-end;
+            padding-right: 10px;
+            color: white;
+            font-size: 12px;
+            font-weight: bold;
+        }
 
-        .wisdom-theme {{
-            background: rgba(255,255,255,0.2);
-            padding: 6px 18px;
-            border-radius: 30px;
-            font-size: 14px;
+        .progress-percent {
+            font-size: 18px;
             font-weight: bold;
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-        }}
+            color: #27ae60;
+            text-align: right;
+        }
 
-        .wisdom-author {{
-            font-size: 14px;
-            opacity: 0.9;
+        /* Support Section */
+        .support-section {
+            background: linear-gradient(135deg, rgb(52, 152, 219), rgb(41, 128, 185));
+            color: white;
+            border-radius: 16px;
+            padding: 25px;
+            margin-top: 10px;
+        }
+
+        .support-header {
             display: flex;
             align-items: center;
-            gap: 6px;
-        }}
+            gap: 12px;
+            margin-bottom: 20px;
+            font-size: 22px;
+            font-weight: bold;
+        }
 
-        .wisdom-author:before {{
-            content: "—";
-            margin-right: 4px;
-        }}
+        .support-list {
+            list-style: none;
+            padding: 0;
+            margin: 0 0 20px 0;
+        }
 
-        /* Empty state - no tip for current month */
-        .no-wisdom {{
-            background: #f8f9fa;
-            border: 2px dashed rgb(217, 52, 54);
+        .support-list li {
+            padding: 12px 0 12px 35px;
+            position: relative;
+            font-size: 16px;
+            border-bottom: 1px solid rgba(255,255,255,0.2);
+        }
+
+        .support-list li:last-child {
+            border-bottom: none;
+        }
+
+        .support-list li:before {
+            content: "•";
+            color: white;
+            font-weight: bold;
+            font-size: 20px;
+            position: absolute;
+            left: 8px;
+            top: 10px;
+        }
+
+        .support-email {
+            color: white;
+            text-decoration: underline;
+            font-weight: bold;
+        }
+
+        /* No Mission Message */
+        .no-mission {
+            background: #f9f9f9;
+            border: 2px dashed #3498db;
             border-radius: 16px;
-            padding: 30px;
+            padding: 50px 30px;
             text-align: center;
-            margin-top: 30px;
             color: #7f8c8d;
-        }}
+        }
 
-        .no-wisdom span {{
-            font-size: 40px;
+        .no-mission span {
+            font-size: 60px;
             display: block;
-            margin-bottom: 10px;
-        }}
+            margin-bottom: 20px;
+            opacity: 0.5;
+        }
+
+        .no-mission h3 {
+            font-size: 24px;
+            color: #2c3e50;
+            margin-bottom: 15px;
+        }
 
-        .no-wisdom p {{
+        .no-mission p {
             font-size: 16px;
-        }}
+            line-height: 1.6;
+            max-width: 500px;
+            margin: 0 auto 20px;
+        }
+
+        .no-mission .prayer-suggestions {
+            background: #e8f4fc;
+            border-radius: 12px;
+            padding: 20px;
+            margin-top: 25px;
+            text-align: left;
+            display: inline-block;
+        }
+
+        .no-mission .prayer-suggestions h4 {
+            color: #2c3e50;
+            margin-bottom: 10px;
+        }
+
+        .no-mission .prayer-suggestions ul {
+            list-style: none;
+            padding: 0;
+        }
 
+        .no-mission .prayer-suggestions li {
+            padding: 5px 0 5px 25px;
+            position: relative;
+        }
 
+        .no-mission .prayer-suggestions li:before {
+            content: "🙏";
+            position: absolute;
+            left: 0;
+            top: 5px;
+        }
+        
+        /* Event items */
+        .event-item {
+            background: #f8f9fa;
+            padding: 20px;
+            margin-bottom: 20px;
+            border-radius: 10px;
+            border-left: 5px solid #3498db;
+            transition: transform 0.2s;
+        }
         
+        .event-item:hover {
+            transform: translateX(5px);
+            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
+        }
+        
+        .event-title {
+            font-size: 22px;
+            font-weight: bold;
+            color: #2c3e50;
+            margin-bottom: 12px;
+        }
+        
+        .event-detail {
+            font-size: 16px;
+            margin: 6px 0;
+            color: #555;
+        }
+        
+        .event-description {
+            margin-top: 10px;
+            font-style: italic;
+            color: #666;
+        }
+
         /* ============================================
-            RESPONSIVE DESIGN - MOBILE
+        INSPIRE TAB STYLES
         ============================================ */
-        @media (max-width: 768px) {{
-            .container {{
-                flex-direction: column;
-            }}
-            
-            /* Right container (Church Info) moves to TOP */
-            .right-container {{
-                width: 100%;
-                height: auto;  
-                min-height: 20vh;  
-                order: 1;  /* Makes it appear first */
-                padding: 15px;
-                justify-content: center;
-            }}
-            
-            /* Left container (Sidebar + Content) moves to BOTTOM */
-            .left-container {{
-                width: 100%;
-                height: 80vh;  
-                order: 2;  
-                flex-direction: column;  
-            }}
-            
-            /* Sidebar becomes horizontal at top of left container */
-            .tab-buttons {{
-                width: 100%;
-                height: auto;
-                min-height: 70px;
-                flex-direction: row;
-                justify-content: space-around;
-                padding: 8px 5px;
-                position: sticky;
-                top: 0;
-                overflow-x: auto;
-                overflow-y: hidden;
-                white-space: nowrap;
-                gap: 3px;
-                order: 1;
-            }}
-            
-            .tab-button {{
-                padding: 8px 6px;
-                margin: 0 1px;
-                min-width: 55px;
-            }}
-            
-            .tab-icon {{
-                font-size: 18px;
-                margin-bottom: 2px;
-            }}
-            
-            .tab-text {{
-                font-size: 9px;
-            }}
-            
-            .tab-text span {{
-                display: inline-block;  
-                margin: 0 1px;
-            }}
-            
-            /* Content area below horizontal sidebar */
-            .content-area {{
-                width: 100%;
-                height: calc(80vh - 70px);  
-                padding: 20px;
-                overflow-y: auto;
-                order: 2;
-            }}
-            
-            /* Church logo adjustments for mobile top */
-            .church-header {{
-                margin-bottom: 5px;
-            }}
-            
-            .church-logo {{
-                margin: 0 auto 10px;
-            }}
-            
-            .church-logo img {{
-                max-width: 120px;
-                width: 50%;
-            }}
-            
-            .church-name {{
-                font-size: 20px;
-                margin-bottom: 4px;
-            }}
-            
-            .church-tagline {{
-                font-size: 12px;
-            }}
-            
-            /* Slideshow adjustments for mobile */
-            .slideshow-image.active {{
-                opacity: 0.4;  
-            }}
-
 
-            .section-title {{
-                font-size: 24px;
-                flex-direction: column;
-                align-items: flex-start;
-                gap: 10px;
-            }}
-            
-            .date-badge {{
-                font-size: 14px;
-                padding: 4px 12px;
-            }}   
+        .inspire-container {
+            display: flex;
+            flex-direction: column;
+            gap: 30px;
+        }
 
-            /*Inspire Tab for mobile */
-            .verse-text {{
-                font-size: 22px;
-            }}
-            
-            .verse-card {{
-                padding: 25px;
-            }}
-            
-            .testimony-scrollbox {{
-                max-height: 200px;
-            }}
-            
-            .testimony-card {{
-                padding: 15px;
-            }}
-            
-            .share-cta {{
-                padding: 20px;
-            }}
-            
-            .share-cta h3 {{
-                font-size: 20px;
-            }}
-            
-            /* Sermon card adjustments */
-            .sermon-header {{
-                flex-direction: column;
-                align-items: flex-start;
-                gap: 8px;
-                padding: 15px;
-            }}
-            
-            .sermon-title {{
-                font-size: 18px;
-            }}
-            
-            .sermon-date {{
-                font-size: 14px;
-                padding: 5px 12px;
-            }}
-            
-            .sermon-content {{
-                padding: 15px;
-            }}
-            
-            .sermon-scripture {{
-                font-size: 14px;
-                padding: 6px 14px;
-            }}
-            
-            .sermon-summary {{
-                font-size: 14px;
-                padding: 12px;
-            }}
-            
-            .key-points-title {{
-                font-size: 16px;
-            }}
-            
-            .key-points-list li {{
-                font-size: 14px;
-                padding: 6px 0 6px 22px;
-            }}
+        /* Verse of the Week Card */
+        .verse-card {
+            background: white;
+            padding: 30px;
+            border-radius: 16px;
+            box-shadow: 0 10px 25px rgba(0,0,0,0.15);
+            border-left: 8px solid rgba(0, 229, 86);
+            position: relative;
+            overflow: hidden;
+        }
 
-             .mission-title {{
-                font-size: 20px;
-            }}
-            
-            .mission-message {{
-                font-size: 16px;
-                padding: 15px;
-            }}
-            
-            .video-container {{
-                padding: 25px 15px;
-            }}
-            
-            .no-mission {{
-                padding: 30px 20px;
-            }}
-            
-            .no-mission span {{
-                font-size: 40px;
-            }}
-            
-            /* Event items adjustments */
-            .event-item {{
-                padding: 15px;
-            }}
-            
-            .event-title {{
-                font-size: 18px;
-            }}
-            
-            .event-detail {{
-                font-size: 14px;
-            }}
-            
-            /* Contact grid adjustments */
-            .contact-grid {{
-                grid-template-columns: 1fr;
-                gap: 15px;
-            }}
-            
-            /* Section title adjustments */
-            .section-title {{
-                font-size: 24px;
-                padding-bottom: 10px;
-                margin-bottom: 20px;
-            }}
-            
-            /* Rotating message adjustments */
-            .rotating-message {{
-                padding: 25px;
-                min-height: 150px;
-            }}
-            
-            .message-title {{
-                font-size: 22px;
-            }}
-            
-            .message-text {{
-                font-size: 16px;
-            }}
+        .verse-card::before {
+            content: "“";
+            font-size: 120px;
+            position: absolute;
+            top: -20px;
+            left: 10px;
+            opacity: 0.1;
+            color: white;
+            font-family: Georgia, serif;
+        }
 
-            /* Infromation for mobile */
-            .wisdom-card {{
-                padding: 20px;
-            }}
-            
-            .wisdom-title {{
-                font-size: 22px;
-            }}
-            
-            .wisdom-tip-text {{
-                font-size: 16px;
-                padding: 15px;
-            }}
-            
-            .wisdom-steps li {{
-                font-size: 15px;
-                padding: 8px 0 8px 32px;
-            }}
-            
-            .wisdom-verse-text {{
-                font-size: 15px;
-            }}
-            
-            .wisdom-footer {{
-                flex-direction: column;
-                align-items: flex-start;
-            }}            
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <!-- LEFT: Content with tabs on the edge -->
-        <div class="left-container">
-            <div class="tab-buttons">
-                <button class="tab-button active" onclick="showTab(0)">
-                    <div class="tab-icon">🏠</div>
-                    <div class="tab-text">{vertical_text('HOME')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(1)">
-                    <div class="tab-icon">🎂</div>
-                    <div class="tab-text">{vertical_text('BIRTHDAY')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(2)">
-                    <div class="tab-icon">💍</div>
-                    <div class="tab-text">{vertical_text('ANNIVERSARY')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(3)">  
-                    <div class="tab-icon">📖</div>
-                    <div class="tab-text">{vertical_text('SERMONS')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(4)">
-                    <div class="tab-icon">✨</div>
-                    <div class="tab-text">{vertical_text('INSPIRE')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(5)">
-                    <div class="tab-icon">🌍</div>
-                    <div class="tab-text">{vertical_text('MISSIONS')}</div>
-                </button>                                 
-                <button class="tab-button" onclick="showTab(6)">
-                    <div class="tab-icon">📅</div>
-                    <div class="tab-text">{vertical_text('EVENTS')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(7)">
-                    <div class="tab-icon">📢</div>
-                    <div class="tab-text">{vertical_text('NEWS')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(8)">
-                    <div class="tab-icon">📞</div>
-                    <div class="tab-text">{vertical_text('CONTACT')}</div>
-                </button>
-                <button class="tab-button" onclick="showTab(9)">
-                    <div class="tab-icon">ℹ️</div>
-                    <div class="tab-text">{vertical_text('ABOUT')}</div>
-                </button>
-            </div>
-            
-            <!-- Content area -->
-            <div class="content-area">
-                <!-- HOME TAB (tab 0) -->
-                <div class="content-section active">
-                    <div class="section-title">Welcome <span class="date-badge">📅 {current_date}</span></div>
-                    <p class="welcome-text">{tabs['home']['welcome_text']}</p>
-                    
-                    <div class="rotating-message">
-    """)
-    
-    # Add rotating messages
-    for i, msg in enumerate(messages):
-        active_class = "active" if i == 0 else ""
-        scripture = f'<div class="message-scripture">{msg["scripture"]}</div>' if "scripture" in msg else ""
-        html_parts.append(f"""
-                        <div class="message {active_class}">
-                            <div class="message-title">{msg['title']}</div>
-                            {scripture}
-                            <div class="message-text">{msg['text']}</div>
-                        </div>
-        """)
-    
-    html_parts.append(f"""
-                    </div>  <!-- Close rotating-message -->
-                    
-                    <!-- WISDOM TIP - Monthly -->
-    """)
+        .verse-icon {
+            font-size: 32px;
+            margin-bottom: 15px;
+        }
 
-    # Get wisdom tip for current month
-    current_wisdom = tabs.get('wisdom_tips', {}).get(current_month, {})
+        .verse-text {
+            font-size: 26px;
+            font-style: italic;
+            line-height: 1.5;
+            margin-bottom: 15px;
+            font-weight: 500;
+            position: relative;
+            z-index: 2;
+        }
 
-    # Check if we have a real tip (not empty dict and has a title)
-    if current_wisdom and isinstance(current_wisdom, dict) and current_wisdom.get('title'):
-        html_parts.append(f"""
-                    <div class="wisdom-card">
-                        <div class="wisdom-header">
-                            <span class="wisdom-month-badge">💡 {current_month} Wisdom Tip</span>
-                        </div>
-                        <h3 class="wisdom-title">{current_wisdom.get('title', '')}</h3>
-                        <div class="wisdom-tip-text">{current_wisdom.get('tip', '')}</div>
-        """)
-        
-        # Add steps if they exist
-        steps = current_wisdom.get('steps', [])
-        if steps:
-            html_parts.append(f"""
-                        <div class="wisdom-steps-title">📋 Quick Steps:</div>
-                        <ul class="wisdom-steps">
-            """)
-            for step in steps:
-                html_parts.append(f"""
-                            <li>{step}</li>
-            """)
-            html_parts.append("""
-                        </ul>
-        """)
-        
-        # Add verse if it exists
-        verse = current_wisdom.get('verse', '')
-        verse_text = current_wisdom.get('verse_text', '')
-        if verse and verse_text:
-            html_parts.append(f"""
-                        <div class="wisdom-verse-box">
-                            <div class="wisdom-verse-text">"{verse_text}"</div>
-                            <div class="wisdom-verse-ref">— {verse}</div>
-                        </div>
-        """)
-        
-        # Footer with theme and author
-        html_parts.append(f"""
-                        <div class="wisdom-footer">
-                            <span class="wisdom-theme">🏷️ {current_wisdom.get('theme', 'General')}</span>
-                            <span class="wisdom-author">{current_wisdom.get('author', 'GCBC')}</span>
-                        </div>
-                    </div>
-        """)
-    else:
-        # No tip for this month
-        html_parts.append(f"""
-                    <div class="no-wisdom">
-                        <span>💭</span>
-                        <p>Check back next month for a new wisdom tip!</p>
-                    </div>
-        """)
+        .verse-reference {
+            font-size: 18px;
+            opacity: 0.9;
+            margin-bottom: 20px;
+            letter-spacing: 1px;
+        }
 
-    html_parts.append(f"""
-                </div>  <!-- CLOSE HOME TAB content-section -->
-                
-                <!-- ========== BIRTHDAY TAB (tab 1) ========== -->
-                <div class="content-section">
-                    <div class="section-title">🎂 Birthdays This Month ({current_month})</div>
-    """)
-    
-    # Birthday content
-    if current_birthdays and len(current_birthdays) > 0:
-        for birthday in current_birthdays:
-            name = birthday.get('name')
-            if not name:
-                continue
-            formatted_date = format_date_with_ordinal(birthday.get('date', ''))
-            html_parts.append(f"""    
-                    <div class="event-item">    
-                        <div class="event-title">{birthday['name']}</div>
-                        <div class="event-detail">🎂 Birthday: {current_month} {formatted_date}</div>        
-                    </div>
-            """)    
-    else:
-        html_parts.append("""
-                    <div class="event-item">
-                        <div class="event-title">No birthdays this month</div>
-                        <div class="event-description">Check back next month!</div>
-                    </div>
-        """)
-    
-    html_parts.append(f"""
-                </div>  <!-- CLOSE BIRTHDAY TAB -->
-                
-                <!-- ========== ANNIVERSARY TAB (tab 2) ========== -->
-                <div class="content-section">
-                    <div class="section-title">💍 Anniversaries This Month ({current_month})</div>
-    """)
-    
-    # Anniversary content
-    if current_anniversaries and len(current_anniversaries) > 0 and not (len(current_anniversaries) == 1 and current_anniversaries[0] == {}):
-        for anniversary in current_anniversaries:
-            if anniversary:
-                formatted_date = format_date_with_ordinal(anniversary.get('date', ''))
-                html_parts.append(f"""
-                    <div class="event-item">
-                        <div class="event-title">{anniversary.get('names', anniversary.get('couple', ''))}</div>
-                        <div class="event-detail">💍 Anniversary: {current_month} {formatted_date}</div>
-                """)
-                if 'years' in anniversary:
-                    html_parts.append(f'<div class="event-detail">🎉 {anniversary["years"]} years together</div>')
-                html_parts.append("""
-                    </div>
-                """)
-    else:
-        html_parts.append("""
-                    <div class="event-item">
-                        <div class="event-title">No anniversaries this month</div>
-                        <div class="event-description">Check back next month!</div>
-                    </div>
-        """)
-    
-    html_parts.append("""
-                </div>  
-""")
+        .verse-theme {
+            display: inline-block;
+            background: rgba(52, 45, 45, 0.15);
+            padding: 6px 20px;
+            border-radius: 40px;
+            font-size: 14px;
+            font-weight: bold;
+            border: 1px solid rgba(255,255,255,0.3);
+            margin-bottom: 15px;
+        }
 
-    html_parts.append(f"""
-                
-                <!-- SERMONS TAB (tab 3) -->
-                <div class="content-section">
-                    <div class="section-title">📖 Sermons This Month ({current_month})</div>
-                    <div class="sermons-container">
-    """)
+        /* Pastor's Comment (Optional) */
+        .pastor-comment {
+            background: rgba(255,255,255,0.1);
+            padding: 18px 22px;
+            border-radius: 12px;
+            margin-top: 20px;
+            border-left: 4px solid #f1c40f;
+        }
 
-    # Get sermons for the month
-    current_sermons = tabs.get('sermons', {}).get(current_month, [])
-    
-    # FILTER OUT EMPTY DICTIONARIES
-    valid_sermons = []
-    for sermon in current_sermons:
-        if sermon and isinstance(sermon, dict) and len(sermon) > 0 and sermon.get('title'):
-            valid_sermons.append(sermon)
+        .pastor-comment-text {
+            font-size: 17px;
+            line-height: 1.6;
+            font-style: italic;
+            margin-bottom: 8px;
+        }
 
-    if valid_sermons:
-        # Sort sermon by date (ascending)
-        valid_sermons.sort(key=lambda x: x.get('date', 0))
-        
-        for i, sermon in enumerate(valid_sermons):
-            # Format date
-            formatted_date = format_date_with_ordinal(sermon.get('date', ''))
-            
-            # First sermon is open by default, others closed
-            is_first = (i == 0)
-            toggle_icon = "▼" if is_first else "▶"
-            content_class = "" if is_first else "collapsed"
-            header_active = "active" if is_first else ""
-            
-            # Make the sermon card
-            html_parts.append(f"""
-                        <div class="sermon-card">
-                            <div class="sermon-header {header_active}" onclick="toggleSermon(this)">
-                                <span class="toggle-icon">{toggle_icon}</span>
-                                <span class="sermon-date">📅 {current_month} {formatted_date}</span>
-                                <h3 class="sermon-title">{sermon.get('title', 'Sermon')}</h3>
-                            </div>
-                            <div class="sermon-content {content_class}">
-                                <div class="sermon-scripture">📖 {sermon.get('scripture', '')}</div>
-                                <div class="sermon-summary">{sermon.get('summary', '')}</div>
-            """)
-            
-            # Add key points
-            key_points = sermon.get('key_points', [])
-            if key_points:
-                html_parts.append(f"""
-                                <div class="key-points-title">💭 Key Points:</div>
-                                <ul class="key-points-list">
-                """)
-                for point in key_points:
-                    html_parts.append(f"""
-                                    <li>{point}</li>
-                    """)
-                html_parts.append("""
-                                </ul>
-                """)
-            
-            html_parts.append("""
-                            </div>
-                        </div>
-            """)
-    else:
-        # No valid sermons - Show message with normal styling
-        html_parts.append("""
-                        <div class="no-sermons">
-                            📖 No sermons yet this month.<br>
-                            Check back after Sunday service!
-                        </div>
-        """)
+        .pastor-comment-author {
+            font-size: 15px;
+            font-weight: bold;
+            opacity: 0.9;
+            display: flex;
+            align-items: center;
+            gap: 6px;
+        }
 
-    html_parts.append("""
-                    </div>
-                </div>
-                
-                <!-- INSPIRE TAB (tab 4) -->
-                <div class="content-section">
-                    <div class="section-title">✨ Inspire Corner</div>
-                    <div class="inspire-container">
-    """)
-    
-    current_inspire = tabs.get('inspire', {}).get(current_month, {})
-    
-    # ========== VERSE OF THE MONTH (OPTIONAL) ==========
-    verse_data = current_inspire.get('verse_of_the_month', {})
-    
-    if verse_data and isinstance(verse_data, dict) and verse_data.get('verse') and verse_data.get('text'):
-        html_parts.append(f"""
-                        <div class="verse-card">
-                            <div class="verse-icon">📖</div>
-                            <div class="verse-text">"{verse_data.get('text', '')}"</div>
-                            <div class="verse-reference">— {verse_data.get('verse', '')}</div>
-                            <span class="verse-theme">🎯 {verse_data.get('theme', 'Weekly Verse')}</span>
-        """)
-        
-        # Optional pastor's comment
-        if verse_data.get('comment') and verse_data.get('comment_author'):
-            html_parts.append(f"""
-                            <div class="pastor-comment">
-                                <div class="pastor-comment-text">💬 {verse_data.get('comment', '')}</div>
-                                <div class="pastor-comment-author">{verse_data.get('comment_author', '')}</div>
-                            </div>
-        """)
-        
-        html_parts.append("""
-                        </div>
-        """)
-    else:
-        # No verse for this week/month
-        html_parts.append("""
-                        <div class="no-wisdom" style="border-color: rgb(217, 52, 54); color: #7f8c8d;">
-                            <span>📖</span>
-                            <p>No verse this month. Check back soon!</p>
-                        </div>
-        """)
-    
-    # ========== FEATURED TESTIMONY (OPTIONAL) ==========
-    testimony_data = current_inspire.get('featured_testimony', {})
-    
-    if testimony_data and isinstance(testimony_data, dict) and testimony_data.get('testimony') and testimony_data.get('name'):
-        html_parts.append(f"""
-                        <div class="testimony-section">
-                            <div class="testimony-header">
-                                <span class="testimony-icon">🌟</span>
-                                <h3 class="testimony-title">Featured Testimony</h3>
-                            </div>
-                            <div class="testimony-scrollbox">
-                                <div class="testimony-card">
-                                    <div class="testimony-quote">❝</div>
-                                    <div class="testimony-text">{testimony_data.get('testimony', '')}</div>
-                                    <div class="testimony-author">— {testimony_data.get('name', '')}</div>
-                                    <div class="testimony-date">{testimony_data.get('date', '')}</div>
-        """)
-        
-        # Optional verse with testimony
-        if testimony_data.get('verse'):
-            html_parts.append(f"""
-                                    <div class="testimony-verse">📖 {testimony_data.get('verse', '')}</div>
-        """)
-        
-        html_parts.append("""
-                                </div>
-                            </div>
-                        </div>
-        """)
-    else:
-        # No testimony this month
-        html_parts.append("""
-                        <div class="no-testimony">
-                            <span>🌟</span>
-                            <p>No testimony this month.</p>
-                            <p style="font-size: 14px; margin-top: 10px;">Check back next month or share your own!</p>
-                        </div>
-        """)
-    
-    # ========== SHARE YOUR STORY (ALWAYS VISIBLE) ==========
-    html_parts.append(f"""
-                        <div class="share-cta">
-                            <h3>💌 Share Your Story</h3>
-                            <p>Has God moved in your life? Your testimony could encourage someone else.</p>
-                            <a href="mailto:gcbctt@gmail.com?subject=My Testimony" class="share-email">📧 gcbctt@gmail.com</a>
-                        </div>
-                    </div>
-                </div>
-                      
-                                <!-- MISSIONS TAB (tab 5) -->
-                <div class="content-section">
-                    <div class="section-title">🌍 Missions - {current_month}</div>
-                    <div class="missions-container">
-    """)
+        .pastor-comment-author:before {
+            content: "—";
+            margin-right: 4px;
+        }
 
-    # Get missions data for current month
-    current_missions = tabs.get('missions', {}).get(current_month, {})
-    
-    if current_missions and len(current_missions) > 0 and current_missions.get('featured'):
-        
-        # ========== VIDEO SECTION (OPTIONAL) ==========
-        video_data = current_missions.get('video', {})
-        if video_data and isinstance(video_data, dict) and video_data.get('type'):
-            
-            if video_data.get('type') == 'youtube' and video_data.get('url'):
-                # YouTube link
-                html_parts.append(f"""
-                        <div class="video-section">
-                            <div class="video-header">
-                                <span class="video-icon">🎬</span>
-                                <h3 class="video-title">{video_data.get('title', 'Mission Video')}</h3>
-                            </div>
-                            <div class="video-container">
-                                <div class="video-placeholder">▶️</div>
-                                <p>{video_data.get('title', '')}</p>
-                                <p>Duration: {video_data.get('duration', '')}</p>
-                                <a href="{video_data.get('url', '#')}" target="_blank" class="video-link">Watch on YouTube ↗</a>
-                            </div>
-                            <div class="video-meta">
-                                <span>📅 {current_month} 2026</span>
-                                <span>🎥 Mission Update</span>
-                            </div>
-                        </div>
-                """)
-            
-            elif video_data.get('type') == 'local' and video_data.get('filename'):
-                # Local video file
-                video_file = video_data.get('filename', '')
-                html_parts.append(f"""
-                        <div class="video-section">
-                            <div class="video-header">
-                                <span class="video-icon">🎬</span>
-                                <h3 class="video-title">{video_data.get('title', 'Mission Video')}</h3>
-                            </div>
-                            <video controls class="local-video-player" width="100%">
-                                <source src="missions_videos/{video_file}" type="video/mp4">
-                                Your browser does not support the video tag.
-                            </video>
-                            <div class="video-meta">
-                                <span>📅 {current_month} 2026</span>
-                                <span>🎥 {video_data.get('duration', '')}</span>
-                            </div>
-                        </div>
-                """)
+        /* Testimony Section */
+        .testimony-section {
+            background: white;
+            border-radius: 16px;
+            padding: 25px;
+            box-shadow: 0 8px 20px rgba(0,0,0,0.06);
+            border-top: 6px solid rgba(0, 229, 86);
+        }
+
+        .testimony-header {
+            display: flex;
+            align-items: center;
+            gap: 12px;
+            margin-bottom: 20px;
+        }
+
+        .testimony-icon {
+            font-size: 28px;
+        }
+
+        .testimony-title {
+            font-size: 22px;
+            font-weight: bold;
+            color: #2c3e50;
+            margin: 0;
+        }
+
+        /* SCROLLBOX - Fixed height with custom scrollbar */
+        .testimony-scrollbox {
+            max-height: 250px;
+            overflow-y: auto;
+            padding-right: 15px;
+            margin-bottom: 5px;
+        }
+
+        /* Custom scrollbar */
+        .testimony-scrollbox::-webkit-scrollbar {
+            width: 6px;
+        }
+
+        .testimony-scrollbox::-webkit-scrollbar-track {
+            background: #f0f0f0;
+            border-radius: 10px;
+        }
+
+        .testimony-scrollbox::-webkit-scrollbar-thumb {
+            background: rgba(0, 229, 86);
+            border-radius: 10px;
+        }
+
+        .testimony-scrollbox::-webkit-scrollbar-thumb:hover {
+            background: #8e44ad;
+        }
+
+        /* Testimony Card */
+        .testimony-card {
+            background: #f9f9f9;
+            border-radius: 12px;
+            padding: 20px;
+            border-left: 5px solid rgba(0, 229, 86);
+        }
+
+        .testimony-quote {
+            font-size: 20px;
+            color: rgba(0, 229, 86);
+            margin-bottom: 10px;
+            opacity: 0.7;
+        }
+
+        .testimony-text {
+            font-size: 16px;
+            line-height: 1.7;
+            color: #444;
+            margin-bottom: 20px;
+            white-space: pre-line;
+        }
+
+        .testimony-author {
+            font-weight: bold;
+            color: #2c3e50;
+            font-size: 16px;
+            margin-bottom: 5px;
+        }
+
+        .testimony-date {
+            font-size: 13px;
+            color: #7f8c8d;
+            margin-bottom: 10px;
+        }
+
+        .testimony-verse {
+            font-size: 14px;
+            color: #9b59b6;
+            font-style: italic;
+            padding-top: 10px;
+            border-top: 1px solid #e0e0e0;
+        }
+
+        /* No testimony message */
+        .no-testimony {
+            background: #f9f9f9;
+            border: 2px dashed rgb(217, 52, 54);
+            border-radius: 12px;
+            padding: 40px;
+            text-align: center;
+            color: #7f8c8d;
+        }
+
+        .no-testimony span {
+            font-size: 40px;
+            display: block;
+            margin-bottom: 10px;
+        }
+
+        .no-testimony p {
+            font-size: 16px;
+        }
+
+        /* Share Your Story CTA */
+        .share-cta {
+            background: linear-gradient(135deg, rgb(52, 152, 219), rgb(41, 128, 185));
+            color: white;
+            padding: 25px;
+            border-radius: 16px;
+            text-align: center;
+            box-shadow: 0 8px 20px rgba(52, 152, 219, 0.2);
+        }
+
+        .share-cta h3 {
+            font-size: 22px;
+            font-weight: bold;
+            margin-bottom: 12px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            gap: 10px;
+        }
+
+        .share-cta p {
+            font-size: 16px;
+            line-height: 1.6;
+            margin-bottom: 20px;
+            opacity: 0.95;
+        }
+
+        .share-email {
+            display: inline-block;
+            background: white;
+            color: #2c3e50;
+            padding: 12px 25px;
+            border-radius: 50px;
+            font-weight: bold;
+            font-size: 16px;
+            text-decoration: none;
+            transition: transform 0.2s, box-shadow 0.2s;
+            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
+        }
+
+        .share-email:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 6px 15px rgba(0,0,0,0.15);
+        }
+
+
+        /* Sermons section */
+        .sermons-container {
+            display: flex;
+            flex-direction: column;
+            gap: 25px;
+            margin-top: 10px;
+        }
+
+        .sermon-card {
+            background: #fff;
+            border-radius: 12px;
+            border-left: 6px solid rgba(37, 150, 190);
+            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+            overflow: hidden;
+            transition: transform 0.2s, box-shadow 0.2s;
+            margin-bottom: 15px;
+        }
+
+        .sermon-card:hover {
+            transform: translateX(5px);
+            box-shadow: 0 8px 20px rgba(155, 89, 182, 0.15);
+        }
+
+        .sermon-header {
+            background: linear-gradient(135deg, rgba(37, 150, 190), rgb(10, 203, 84));
+            color: white;
+            padding: 18px 25px;
+            display: flex;
+            align-items: center;
+            gap: 15px;
+            cursor: pointer;
+            transition: background 0.2s;
+        }
+
+        .sermon-header:hover {
+            background: linear-gradient(135deg, #1e8a8c, #0e7c6f); /* Match your teal/green theme */
+        }
+
+        .sermon-header .toggle-icon {
+            font-size: 20px;
+            width: 24px;
+            text-align: center;
+            transition: transform 0.3s;
+        }
+
+        .sermon-date {
+            background: rgba(255,255,255,0.2);
+            padding: 8px 16px;
+            border-radius: 30px;
+            font-size: 16px;
+            font-weight: bold;
+            display: inline-flex;
+            align-items: center;
+            gap: 5px;
+        }
+
+        .sermon-title {
+            font-size: 22px;
+            font-weight: bold;
+            margin: 0;
+            flex: 1;
+        }
+
+        .sermon-content {
+            padding: 25px;
+            border-top: 1px solid #eee;
+            background: white;
+            transition: all 0.3s ease;
+        }
+
+        .sermon-content.collapsed {
+            display: none;
+        }
+
+        .sermon-scripture {
+            display: inline-block;
+            background: rgb(231, 245, 230);
+            color: rgba(37, 150, 190);
+            padding: 8px 18px;
+            border-radius: 25px;
+            font-size: 16px;
+            font-weight: bold;
+            margin-bottom: 20px;
+            border-left: 3px solid rgba(37, 150, 190);
+        }
+
+        .sermon-summary {
+            font-size: 16px;
+            line-height: 1.7;
+            color: #444;
+            margin-bottom: 20px;
+            padding: 15px;
+            background: #f9f9f9;
+            border-radius: 8px;
+            border-left: 3px solid #ddd;
+        }
+
+        .key-points-title {
+            font-size: 18px;
+            font-weight: bold;
+            color: #2c3e50;
+            margin-bottom: 12px;
+            display: flex;
+            align-items: center;
+            gap: 8px;
+        }
+
+        .key-points-list {
+            list-style: none;
+            padding: 0;
+            margin: 0;
+        }
+
+        .key-points-list li {
+            padding: 8px 0 8px 25px;
+            position: relative;
+            font-size: 15px;
+            color: #555;
+            border-bottom: 1px solid #eee;
+        }
+
+        .key-points-list li:last-child {
+            border-bottom: none;
+        }
+
+        .key-points-list li:before {
+            content: "•";
+            color: rgba(37, 150, 190);
+            font-weight: bold;
+            font-size: 20px;
+            position: absolute;
+            left: 5px;
+            top: 5px;
+        }
+
+        /* No sermons message */
+        .no-sermons {
+            display: block !important;
+            background: #f5f0f7 !important;
+            padding: 40px !important;
+            text-align: center !important;
+            border-radius: 12px !important;
+            color: rgb(127, 140, 141) !important;
+            font-size: 18px !important;
+            border: 2px dashed rgb(217, 52, 54) !important;
+            margin: 20px 0 !important;
+            opcaity: 1 !important;
+            visibilty: visible !important;
+        }
+
+        .no-sermons br {
+            margin-bottom: 10px;
+        }
         
-        # ========== FEATURED MISSION ==========
-        html_parts.append(f"""
-                        <div class="mission-card">
-                            <div class="mission-header">
-                                <span class="mission-icon">🌍</span>
-                                <h3 class="mission-title">{current_missions.get('featured', 'Mission')}</h3>
-                                <span class="mission-location">{current_month} 2026</span>
-                            </div>
-        """)
+        /* Announcements */
+        .announcement-item {
+            background: #fff3cd;
+            padding: 15px;
+            margin-bottom: 12px;
+            border-radius: 8px;
+            border-left: 5px solid #ffc107;
+            font-size: 16px;
+            color: #856404;
+        }
         
-        # Mission Update
-        update_data = current_missions.get('update', {})
-        if update_data:
-            html_parts.append(f"""
-                            <div class="mission-message">"{update_data.get('message', '')}"</div>
-                            <div class="mission-author">— {update_data.get('author', '')}</div>
-            """)
+        /* Contact section */
+        .contact-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-top: 20px;
+        }
         
-        # ========== PRAYER POINTS ==========
-        prayer_points = current_missions.get('prayer_points', [])
-        if prayer_points and len(prayer_points) > 0:
-            html_parts.append(f"""
-                            <div class="prayer-section">
-                                <div class="prayer-header">
-                                    <span>🙏</span>
-                                    <span>Prayer Focus</span>
-                                </div>
-                                <ul class="prayer-list">
-            """)
-            for point in prayer_points:
-                html_parts.append(f"""
-                                    <li>{point}</li>
-                """)
-            html_parts.append(f"""
-                                </ul>
-                            </div>
-            """)
+        .contact-item {
+            background: #e8f4f8;
+            padding: 20px;
+            border-radius: 10px;
+        }
         
-        # ========== PROGRESS BAR (OPTIONAL) ==========
-        progress_data = current_missions.get('progress', {})
-        if progress_data and progress_data.get('percentage') is not None:
-            percentage = progress_data.get('percentage', 0)
-            label = progress_data.get('label', 'Progress')
-            html_parts.append(f"""
-                            <div class="progress-section">
-                                <div class="progress-label">
-                                    <span>📊 {label}</span>
-                                    <span class="progress-percent">{percentage}%</span>
-                                </div>
-                                <div class="progress-container">
-                                    <div class="progress-bar" style="width: {percentage}%;"></div>
-                                </div>
-                            </div>
-            """)
+        .contact-label {
+            font-weight: bold;
+            color: #2c3e50;
+            font-size: 16px;
+            margin-bottom: 8px;
+        }
         
-        html_parts.append("""
-                        </div>
-        """)
+        .contact-value {
+            font-size: 16px;
+            color: #555;
+        }
         
-        # ========== SUPPORT SECTION (OPTIONAL) ==========
-        support_data = current_missions.get('support', {})
+        /* About section */
+        .about-section {
+            margin-bottom: 25px;
+        }
         
-        # Check if there's ANY actual content (non-empty values)
-        has_content = False
-        if support_data:
-            if support_data.get('give_link') and str(support_data.get('give_link')).strip():
-                has_content = True
-            elif support_data.get('drive') and str(support_data.get('drive')).strip():
-                has_content = True
-            elif support_data.get('email') and str(support_data.get('email')).strip():
-                has_content = True
+        .about-heading {
+            color: #3498db;
+            font-size: 20px;
+            margin-bottom: 10px;
+            font-weight: bold;
+        }
+        
+        .about-text {
+            font-size: 16px;
+            line-height: 1.6;
+            color: #555;
+        }
+
+        .about-text .highlight{
+            font-size: 20px;
+            font-weight: bold;
+            color: rgb(230, 7, 7);
+        }
+        
+        /* ============================================
+           RIGHT CONTAINER - Church Info + Slideshow
+           ============================================ */
+        .right-container {
+            width: 50%;
+            position: relative;
+            overflow: hidden;
+            color: white;
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            justify-content: center;
+            padding: 40px;
+        }
+
+        /* Slideshow Background */
+        .slideshow-background {
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            z-index: 1;
+        }
+
+        .slideshow-image {
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            object-fit: cover;
+            opacity: 0;
+            transition: opacity 2s ease-in-out, transform 15s linear;
+            transform: scale(1.1); 
+        }
+
+        .slideshow-image.active {
+            opacity: 0.6; 
+            transform: scale(1);
+        }
+
+        .slideshow-image.exiting {
+            opacity: 0;
+            transform: translateX(-100%) scale(1.05);
+        }
+
+        /* Semi-transparent overlay */
+        .slideshow-overlay {
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: linear-gradient(135deg, 
+                rgba(0, 229, 86, 0.5), 
+                rgba(0, 120, 168, 0.7));
+            z-index: 2;
+        }
+
+        /* Church info on top */
+        .church-header {
+            text-align: center;
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            justify-content: center;
+            width: 100%;
+            z-index: 3;
+            position: relative;
+            margin-bottom: 0;
+        }
+
+        .church-logo {
+            margin: 0 auto 25px;
+            text-align: center;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            width: 100%;
+        }
+
+        .church-logo img {
+            max-width: 250px;
+            width: 60%;
+            height: auto;
+            display: block;
+            margin: 0 auto;
+            filter: drop-shadow(0 4px 6px rgba(0,0,0,0.3));
+        }
+
+        .church-name {
+            font-size: 40px;
+            font-weight: bold;
+            margin-bottom: 12px;
+            line-height: 1.3;
+            text-align: center;
+            width: 100%;
+            text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+        }
+
+        .church-tagline {
+            font-size: 20px;
+            opacity: 0.95;
+            text-align: center;
+            width: 100%;
+            text-shadow: 1px 1px 3px rgba(0,0,0,0.5);
+        }
+
+        /* Message when no images */
+        .no-images-message {
+            position: absolute;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            color: white;
+            font-size: 18px;
+            text-align: center;
+            padding: 20px;
+            background: rgba(0,0,0,0.5);
+            border-radius: 10px;
+            z-index: 3;
+        }
+
+        /* ============================================
+        WISDOM TIP CARD - HOME PAGE
+        ============================================ */
+
+        .wisdom-card {
+            background: linear-gradient(135deg, rgba(0, 229, 86), rgba(0, 120, 168));
+            color: white;
+            padding: 30px;
+            border-radius: 16px;
+            margin-top: 30px;
+            margin-bottom: 20px;
+            box-shadow: 0 10px 25px rgba(243, 156, 18, 0.25);
+            border-left: 8px solid #fff;
+            position: relative;
+            overflow: hidden;
+        }
+
+        .wisdom-card::before {
+            content: "💡";
+            font-size: 80px;
+            position: absolute;
+            bottom: -10px;
+            right: 10px;
+            opacity: 0.1;
+            color: white;
+        }
+
+        .wisdom-header {
+            display: flex;
+            align-items: center;
+            gap: 12px;
+            margin-bottom: 15px;
+        }
+
+        .wisdom-month-badge {
+            background: rgba(255,255,255,0.2);
+            padding: 6px 16px;
+            border-radius: 40px;
+            font-size: 13px;
+            font-weight: bold;
+            text-transform: uppercase;
+            letter-spacing: 1.5px;
+            border: 1px solid rgba(255,255,255,0.3);
+        }
+
+        .wisdom-title {
+            font-size: 26px;
+            font-weight: bold;
+            margin-bottom: 15px;
+            line-height: 1.3;
+        }
+
+        .wisdom-tip-text {
+            font-size: 18px;
+            line-height: 1.6;
+            margin-bottom: 20px;
+            font-style: italic;
+            background: rgba(255,255,255,0.1);
+            padding: 18px;
+            border-radius: 12px;
+            border-left: 4px solid white;
+        }
+
+        .wisdom-steps-title {
+            font-size: 18px;
+            font-weight: bold;
+            margin-bottom: 12px;
+            display: flex;
+            align-items: center;
+            gap: 8px;
+        }
+
+        .wisdom-steps {
+            list-style: none;
+            padding: 0;
+            margin: 0 0 25px 0;
+            background: rgba(255,255,255,0.05);
+            border-radius: 12px;
+            padding: 15px 20px;
+        }
+
+        .wisdom-steps li {
+            padding: 10px 0 10px 35px;
+            position: relative;
+            font-size: 16px;
+            border-bottom: 1px solid rgba(255,255,255,0.15);
+        }
+
+        .wisdom-steps li:last-child {
+            border-bottom: none;
+        }
+
+        .wisdom-steps li:before {
+            content: "✓";
+            position: absolute;
+            left: 8px;
+            top: 10px;
+            color: white;
+            font-weight: bold;
+            font-size: 16px;
+            background: rgba(255,255,255,0.2);
+            width: 20px;
+            height: 20px;
+            border-radius: 50%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }
+
+        .wisdom-verse-box {
+            background: rgba(255,255,255,0.15);
+            padding: 18px;
+            border-radius: 12px;
+            margin-bottom: 20px;
+            border-left: 4px solid white;
+        }
+
+        .wisdom-verse-text {
+            font-size: 17px;
+            font-style: italic;
+            margin-bottom: 8px;
+            line-height: 1.5;
+        }
+
+        .wisdom-verse-ref {
+            font-size: 15px;
+            font-weight: bold;
+            opacity: 0.95;
+        }
+
+        .wisdom-footer {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            flex-wrap: wrap;
+            gap: 10px;
+        }
+
+        .wisdom-theme {
+            background: rgba(255,255,255,0.2);
+            padding: 6px 18px;
+            border-radius: 30px;
+            font-size: 14px;
+            font-weight: bold;
+            display: inline-flex;
+            align-items: center;
+            gap: 6px;
+        }
+
+        .wisdom-author {
+            font-size: 14px;
+            opacity: 0.9;
+            display: flex;
+            align-items: center;
+            gap: 6px;
+        }
+
+        .wisdom-author:before {
+            content: "—";
+            margin-right: 4px;
+        }
+
+        /* Empty state - no tip for current month */
+        .no-wisdom {
+            background: #f8f9fa;
+            border: 2px dashed rgb(217, 52, 54);
+            border-radius: 16px;
+            padding: 30px;
+            text-align: center;
+            margin-top: 30px;
+            color: #7f8c8d;
+        }
+
+        .no-wisdom span {
+            font-size: 40px;
+            display: block;
+            margin-bottom: 10px;
+        }
+
+        .no-wisdom p {
+            font-size: 16px;
+        }
+
+        /* ============================================
+           CONTAINMENT
+           Each tab lays out on its own, so switching tabs does not
+           lay out the rest of the page again. Items of the long lists
+           (birthdays, anniversaries, events, sermons, announcements)
+           are only laid out and painted when scrolled near the screen;
+           the intrinsic size keeps room for them so the scroll height
+           stays about right.
+           ============================================ */
+        .content-section {
+            contain: layout style;
+        }
+
+        .event-item,
+        .sermon-card {
+            content-visibility: auto;
+            contain-intrinsic-size: auto 120px;
+        }
+
+        .announcement-item {
+            content-visibility: auto;
+            contain-intrinsic-size: auto 50px;
+        }
+
+        /* Virtual lists (--virtual-lists): the script places the rows in view */
+        .virtual-list {
+            position: relative;
+        }
+
+        .virtual-list .event-item {
+            position: absolute;
+            left: 0;
+            right: 0;
+            margin: 0;
+            overflow: hidden;
+        }
+
+        .virtual-list .event-title {
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+
+
         
-        if has_content:
-            html_parts.append(f"""
-                        <div class="support-section">
-                            <div class="support-header">
-                                <span>💰</span>
-                                <span>How to Support</span>
-                            </div>
-                            <ul class="support-list">
-            """)
+        /* ============================================
+            RESPONSIVE DESIGN - MOBILE
+        ============================================ */
+        @media (max-width: 768px) {
+            .container {
+                flex-direction: column;
+            }
+            
+            /* Right container (Church Info) moves to TOP */
+            .right-container {
+                width: 100%;
+                height: auto;  
+                min-height: 20vh;  
+                order: 1;  /* Makes it appear first */
+                padding: 15px;
+                justify-content: center;
+            }
+            
+            /* Left container (Sidebar + Content) moves to BOTTOM */
+            .left-container {
+                width: 100%;
+                height: 80vh;  
+                order: 2;  
+                flex-direction: column;  
+            }
+            
+            /* Sidebar becomes horizontal at top of left container */
+            .tab-buttons {
+                width: 100%;
+                height: auto;
+                min-height: 70px;
+                flex-direction: row;
+                justify-content: space-around;
+                padding: 8px 5px;
+                position: sticky;
+                top: 0;
+                overflow-x: auto;
+                overflow-y: hidden;
+                white-space: nowrap;
+                gap: 3px;
+                order: 1;
+            }
+            
+            .tab-button {
+                padding: 8px 6px;
+                margin: 0 1px;
+                min-width: 55px;
+            }
+            
+            .tab-icon {
+                font-size: 18px;
+                margin-bottom: 2px;
+            }
+            
+            .tab-text {
+                font-size: 9px;
+            }
+            
+            .tab-text span {
+                display: inline-block;  
+                margin: 0 1px;
+            }
+            
+            /* Content area below horizontal sidebar */
+            .content-area {
+                width: 100%;
+                height: calc(80vh - 70px);  
+                padding: 20px;
+                overflow-y: auto;
+                order: 2;
+            }
+            
+            /* Church logo adjustments for mobile top */
+            .church-header {
+                margin-bottom: 5px;
+            }
+            
+            .church-logo {
+                margin: 0 auto 10px;
+            }
+            
+            .church-logo img {
+                max-width: 120px;
+                width: 50%;
+            }
+            
+            .church-name {
+                font-size: 20px;
+                margin-bottom: 4px;
+            }
+            
+            .church-tagline {
+                font-size: 12px;
+            }
+            
+            /* Slideshow adjustments for mobile */
+            .slideshow-image.active {
+                opacity: 0.4;  
+            }
+
+
+            .section-title {
+                font-size: 24px;
+                flex-direction: column;
+                align-items: flex-start;
+                gap: 10px;
+            }
+            
+            .date-badge {
+                font-size: 14px;
+                padding: 4px 12px;
+            }   
+
+            /*Inspire Tab for mobile */
+            .verse-text {
+                font-size: 22px;
+            }
+            
+            .verse-card {
+                padding: 25px;
+            }
+            
+            .testimony-scrollbox {
+                max-height: 200px;
+            }
+            
+            .testimony-card {
+                padding: 15px;
+            }
+            
+            .share-cta {
+                padding: 20px;
+            }
+            
+            .share-cta h3 {
+                font-size: 20px;
+            }
+            
+            /* Sermon card adjustments */
+            .sermon-header {
+                flex-direction: column;
+                align-items: flex-start;
+                gap: 8px;
+                padding: 15px;
+            }
+            
+            .sermon-title {
+                font-size: 18px;
+            }
+            
+            .sermon-date {
+                font-size: 14px;
+                padding: 5px 12px;
+            }
+            
+            .sermon-content {
+                padding: 15px;
+            }
+            
+            .sermon-scripture {
+                font-size: 14px;
+                padding: 6px 14px;
+            }
+            
+            .sermon-summary {
+                font-size: 14px;
+                padding: 12px;
+            }
+            
+            .key-points-title {
+                font-size: 16px;
+            }
+            
+            .key-points-list li {
+                font-size: 14px;
+                padding: 6px 0 6px 22px;
+            }
+
+             .mission-title {
+                font-size: 20px;
+            }
+            
+            .mission-message {
+                font-size: 16px;
+                padding: 15px;
+            }
+            
+            .video-container {
+                padding: 25px 15px;
+            }
+            
+            .no-mission {
+                padding: 30px 20px;
+            }
+            
+            .no-mission span {
+                font-size: 40px;
+            }
+            
+            /* Event items adjustments */
+            .event-item {
+                padding: 15px;
+            }
+            
+            .event-title {
+                font-size: 18px;
+            }
+            
+            .event-detail {
+                font-size: 14px;
+            }
+            
+            /* Contact grid adjustments */
+            .contact-grid {
+                grid-template-columns: 1fr;
+                gap: 15px;
+            }
             
-            if support_data.get('give_link') and str(support_data.get('give_link')).strip():
-                html_parts.append(f"""
-                                <li>💵 Give online: {support_data.get('give_link')}</li>
-            """)
-            if support_data.get('drive') and str(support_data.get('drive')).strip():
-                html_parts.append(f"""
-                                <li>📦 Supply drive: {support_data.get('drive')}</li>
-            """)
-            if support_data.get('email') and str(support_data.get('email')).strip():
-                html_parts.append(f"""
-                                <li>✉️ Write to missionaries: <a href="mailto:{support_data.get('email')}" class="support-email">{support_data.get('email')}</a></li>
-            """)
+            /* Section title adjustments */
+            .section-title {
+                font-size: 24px;
+                padding-bottom: 10px;
+                margin-bottom: 20px;
+            }
             
-            html_parts.append("""
-                            </ul>
-                        </div>
-        """)
-        
-    else:
-        # No mission this month - Show empty state with prayer suggestions
-        html_parts.append("""
-                        <div class="no-mission">
-                            <span>🌍</span>
-                            <h3>No Missions Testimony This Month</h3>
-                            <p>Check back next month for updates from our missionaries around the world!</p>
-                            <div class="prayer-suggestions">
-                                <h4>🙏 In the meantime, please pray for:</h4>
-                                <ul>
-                                    <li>All missionaries serving globally</li>
-                                    <li>Upcoming mission teams</li>
-                                    <li>Open hearts in every nation</li>
-                                    <li>Safety and provision for our partners</li>
-                                </ul>
-                            </div>
-                        </div>
-        """)
+            /* Rotating message adjustments */
+            .rotating-message {
+                padding: 25px;
+                min-height: 150px;
+            }
+            
+            .message-title {
+                font-size: 22px;
+            }
+            
+            .message-text {
+                font-size: 16px;
+            }
 
-    html_parts.append("""
-                    </div>
-                </div>
-                
-                <!-- EVENTS TAB (tab 6) -->
-                <div class="content-section">
-                    <div class="section-title">📅 Events</div>
-    """)
+            /* Infromation for mobile */
+            .wisdom-card {
+                padding: 20px;
+            }
+            
+            .wisdom-title {
+                font-size: 22px;
+            }
+            
+            .wisdom-tip-text {
+                font-size: 16px;
+                padding: 15px;
+            }
+            
+            .wisdom-steps li {
+                font-size: 15px;
+                padding: 8px 0 8px 32px;
+            }
+            
+            .wisdom-verse-text {
+                font-size: 15px;
+            }
+            
+            .wisdom-footer {
+                flex-direction: column;
+                align-items: flex-start;
+            }            
+        }"""
+
+
+def parse_css(css):
+    # Splits a stylesheet into top level blocks: (prelude, body). The body of an @media
+    # block is parsed into blocks again; any other body (rules, @keyframes) is kept as text.
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    blocks = []
+    pos = 0
+    while True:
+        start = css.find('{', pos)
+        if start == -1:
+            return blocks
+        depth, end = 1, start + 1
+        while depth:
+            if css[end] == '{':
+                depth += 1
+            elif css[end] == '}':
+                depth -= 1
+            end += 1
+        prelude = ' '.join(css[pos:start].split())
+        body = css[start + 1:end - 1]
+        blocks.append((prelude, parse_css(body) if prelude.startswith('@media') else body))
+        pos = end
+
+
+def minify_css_text(text):
+    text = ' '.join(text.split())
+    text = re.sub(r' ?([{};,>]) ?', r'\1', text)
+    text = re.sub(r': ', ':', text)
+    return text.replace(';}', '}').rstrip(';')
+
+
+def serialize_css(blocks):
+    return ''.join(
+        f"{minify_css_text(prelude)}{{{serialize_css(body) if isinstance(body, list) else minify_css_text(body)}}}"
+        for prelude, body in blocks
+    )
+
+
+def minify_css(css):
+    return serialize_css(parse_css(css))
+
+
+def is_critical_selector(selector):
+    # Selectors without classes (*, body, img...) are always needed
+    return all(
+        name in CRITICAL_CLASSES or any(prefix.endswith('-') and name.startswith(prefix) for prefix in CRITICAL_CLASSES)
+        for name in re.findall(r'\.([A-Za-z0-9_-]+)', selector)
+    )
+
+
+def filter_css(blocks, keep):
+    # Keeps the rules whose selector list has at least one selector keep() accepts
+    kept = []
+    for prelude, body in blocks:
+        if prelude.startswith('@media'):
+            inner = filter_css(body, keep)
+            if inner:
+                kept.append((prelude, inner))
+        elif not prelude.startswith('@') and any(keep(selector) for selector in prelude.split(',')):
+            kept.append((prelude, body))
+    return kept
+
+
+def keep_css(css, keep):
+    # The rules keep() accepts a selector of, plus the animations those rules use
+    blocks = parse_css(css)
+    kept = filter_css(blocks, keep)
+    text = serialize_css(kept)
+    kept += [(prelude, body) for prelude, body in blocks
+             if prelude.startswith('@keyframes') and re.search(rf'\b{prelude.split()[-1]}\b', text)]
+    return serialize_css(kept)
+
+
+def critical_css(css):
+    return keep_css(css, is_critical_selector)
+
+
+def used_classes(html_chunks):
+    return {name for chunk in html_chunks
+            for classes in re.findall(r'class="([^"]*)"', chunk)
+            for name in classes.split()}
+
+
+def prune_css(css, classes):
+    # Drops the rules that can never match: a selector needing a class the page does
+    # not use. Months without a video, a wisdom tip or sermons lose those rule groups.
+    classes = classes | set(SCRIPT_CLASSES)
+    return keep_css(css, lambda selector: set(re.findall(r'\.([A-Za-z0-9_-]+)', selector)) <= classes)
+
+
+def publish_generated(text, stem, ext, folder):
+    # Writes the minified stylesheet/script/tab to folder under a content-hashed name, returns the name
+    text = GENERATED_MINIFIERS[ext](text)
+    name = f"{stem}.{hashlib.sha256(text.encode('utf-8')).hexdigest()[:10]}{ext}"
+    os.makedirs(folder, exist_ok=True)
+    write_if_changed(os.path.join(folder, name), text)
+    return name
+
+
+def generated_asset_url(out_dir, dist, published, key, page_dir=None):
+    # The stylesheet/script hook of RenderContext, like fingerprinted_asset_url for assets:
+    # writes the file (to out_dir/assets with --dist) and returns its URL from page_dir.
+    # published[key] gets its path relative to out_dir; the file is named after the key
+    # and its extension picks the minifier.
+    folder = os.path.join(out_dir, 'assets') if dist else out_dir
+    page_dir = page_dir or out_dir
+    stem, ext = os.path.splitext(os.path.basename(key))
+
+    def url(text):
+        path = os.path.join(folder, publish_generated(text, stem, ext, folder))
+        published[key] = os.path.relpath(path, out_dir).replace(os.sep, '/')
+        return os.path.relpath(path, page_dir).replace(os.sep, '/')
+    return url
+
+
+def lazy_tab_url(out_dir, dist, published, page_dir=None, key_prefix=''):
+    # The tab hook of RenderContext: each tab becomes brochure-<section>.<hash>.html
+    def url(name, html):
+        return generated_asset_url(out_dir, dist, published, f'{key_prefix}{GENERATED_STEM}-{name}.html', page_dir)(html)
+    return url
 
-    #Get permanent event (Will always show)
-    permanant_events = tabs.get('events', {}).get('permanant', [])
 
-    #Get monthly events
-    monthly_events = tabs.get('events', {}).get(current_month, [])
+def live_section_url(out_dir, dist, published, sections, page_dir=None, key_prefix=''):
+    # The live hook of RenderContext: every tab, HOME included, is also written to the
+    # file --lazy-tabs uses and sections[name] gets its URL (see save_live_file)
+    tab_url = lazy_tab_url(out_dir, dist, published, page_dir, key_prefix)
 
-    #Combine them (both permenant and monthly)
-    all_events = []
+    def url(name, html):
+        sections[name] = tab_url(name, html)
+        return sections[name]
+    return url
 
-    #Add perm events
-    for event in permanant_events:
-        if event:
-            all_events.append(event)
 
-    #Add monthly event
-    for event in monthly_events:
-        if event:
-            all_events.append(event)
+def save_live_file(page_dir, sections):
+    # brochure-live.json next to the page: the tab URLs in tab order and a version that
+    # changes with any of them. Left untouched when nothing changed, so its ETag stays
+    # the same and the page's polls are answered with 304.
+    urls = list(sections.values())
+    version = hashlib.sha256('\n'.join(urls).encode('utf-8')).hexdigest()[:10]
+    write_if_changed(os.path.join(page_dir, LIVE_FILE), json.dumps({'version': version, 'sections': urls}))
 
-    # Add events
-    if all_events:
-        for event in all_events:
-            html_parts.append(f"""
-                        <div class="event-item">
-                            <div class="event-title">{event['title']}</div>
-                            <div class="event-detail">📅 {event['date']}</div>
-                            <div class="event-detail">🕐 {event['time']}</div>
-                            <div class="event-detail">📍 {event['location']}</div>
-                            <div class="event-description">{event['description']}</div>
-                        </div>
-            """) 
-    else:
-        html_parts.append(f"""
-            <div class="event-item">
-                <div class="event-title">No events this month</div>
-                <div class="event-description">Check back next month!</div>
-            </div>
-        """)   
-    
-    html_parts.append("""
-                </div>
-                
-                <!-- ANNOUNCEMENTS TAB (tab 7) -->
-                <div class="content-section">
-                    <div class="section-title">📢 Announcements</div>
-    """)
-    
-    # Add announcements
-    for announcement in tabs['announcements']:
-        html_parts.append(f"""
-                    <div class="announcement-item">{announcement}</div>
-        """)
-    
-    html_parts.append("""
-                </div>
-                
-                <!-- CONTACT TAB (tab 8) -->
-                <div class="content-section">
-                    <div class="section-title">📞 Contact Us</div>
-                    <div class="contact-grid">
-    """)
-    
-    # Add contact info
-    contact = tabs['contact']
-    html_parts.append(f"""
-                        <div class="contact-item">
-                            <div class="contact-label">Phone</div>
-                            <div class="contact-value">{contact['phone']}</div>
-                        </div>
-                        <div class="contact-item">
-                            <div class="contact-label">Mail</div>
-                            <div class="contact-value">{contact['mail']}</div>
-                        </div>
-                        <div class="contact-item">
-                            <div class="contact-label">Email</div>
-                            <div class="contact-value">{contact['email']}</div>
-                        </div>
-                        <div class="contact-item">
-                            <div class="contact-label">Address</div>
-                            <a href="https://maps.app.goo.gl/Z1PNBhH6kBJWH3zk8"><div class="contact-value">{contact['address']}</div></a>
-                        </div>
-    """)
-    
-    html_parts.append("""
-                    </div>
-                </div>
-                
-                <!-- ABOUT TAB (tab 9) -->
-                <div class="content-section">
-                    <div class="section-title">ℹ️ About Us</div>
-    """)
-    
-    # Add about info
-    about = tabs['about']
-    html_parts.append(f"""
-                    <div class="about-section">
-                        <div class="about-heading">Our Mission Statement</div>
-                        <div class="about-text">{about['mission']}</div>
-                    </div>
-                    <div class="about-section">
-                        <div class="about-heading">Leadership</div>
-                        <div class="about-text">{about['leadership']}</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- RIGHT: Church Info with Slideshow Background -->
-        <div class="right-container">
-            <!-- Slideshow Background -->
-            <div class="slideshow-background">
-    """)
-    
-    # Add slideshow if it exists
-    if slideshow_images:
-        for i, img in enumerate(slideshow_images):
-            active_class = "active" if i == 0 else ""
-            html_parts.append(f"""
-                <img src="slideshow_folder/{img}" class="slideshow-image {active_class}" alt="Slideshow Image {i+1}">
-            """)
-    else:
-        html_parts.append("""
-                <div class="no-images-message">
-                    Add images to 'slideshow_folder'
-                </div>
-        """)
-    
-    html_parts.append(f"""
-            </div>
-            
-            <!-- Semi-transparent overlay -->
-            <div class="slideshow-overlay"></div>
-            
-            <!-- Church Info (on top of slideshow) -->
-            <div class="church-header">
-                <div class="church-logo">
-                    <img src="Images/GCBC LOGO Transparent.png" alt="Church Logo"> 
-                </div>
-                <div class="church-name">{church['name']}</div>
-                <div class="church-tagline">{church['tagline']}</div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        // Tab switching
-        function showTab(tabIndex) {{
-            const buttons = document.querySelectorAll('.tab-button');
-            const sections = document.querySelectorAll('.content-section');
-            
-            buttons.forEach(btn => btn.classList.remove('active'));
-            sections.forEach(section => section.classList.remove('active'));
-            
-            buttons[tabIndex].classList.add('active');
-            sections[tabIndex].classList.add('active');
-        }}
-        
-        // ROTATE MESSAGES
-        let currentMessage = 0;
-        const messages = document.querySelectorAll('.message');
-        let messageInterval;
 
-        function calculateMessageDuration(messageElement) {{
-            //Get text content from title, scripture and text
-            const title = messageElement.querySelector('.message-title')?.textContent || '';
-            const scripture = messageElement.querySelector('.message-scripture')?.textContent || '';
-            const text = messageElement.querySelector('.message-text')?.textContent || '';
+def remove_live_file(page_dir):
+    # Left by an earlier --live build: open pages and --serve must not keep using a stale list
+    path = os.path.join(page_dir, LIVE_FILE)
+    for stale in [path] + [path + suffix for suffix in PRECOMPRESSED_SUFFIXES]:
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def prunes_css(options):
+    # Tabs swapped in by --live can use classes the page did not have, so they get the full stylesheet
+    return options.prune_css and not options.live
+
+
+def generated_files(folder):
+    return [os.path.join(folder, name) for name in os.listdir(folder) if GENERATED_NAME.fullmatch(name)] \
+        if os.path.isdir(folder) else []
 
-            //Gets total count
-            const totalLength = title.length + scripture.length + text.length;
 
-            console.log(`Message length: ${{totalLength}} characters`);
+def remove_old_generated(folder, published):
+    # Along with their .gz/.br siblings (see update_precompressed)
+    in_use = {os.path.basename(path) for path in published.values()}
+    if os.path.isdir(folder):
+        for name in os.listdir(folder):
+            original = uncompressed_name(name)
+            if GENERATED_NAME.fullmatch(original) and original not in in_use:
+                os.remove(os.path.join(folder, name))
 
-            //Calculate Duration: base 5 seconds + 1 seconds per 50 characters
-            let duration = 5000 + (totalLength * 38) //38ms per character = 1 second per 50 chars
 
-            //Set min and max
-            if (duration < 5000) duration = 5000;
-            if (duration > 20000) duration = 20000
+# ============================================
+# CLIENT SCRIPT
+# ============================================
+# Tabs, rotating messages, slideshow (both driven by one timer that stops while
+# the page is hidden) and the sermon accordion. Inlined at the end
+# of <body> by default; with --external-js it is minified into brochure.<hash>.js
+# and loaded with defer. Either way it runs once the page is parsed, so it looks
+# everything up once and handles all clicks with one listener.
+
+SCRIPT = """        // Everything the script works with is looked up once
+        const tabButtons = document.querySelectorAll('.tab-button');
+        const sections = document.querySelectorAll('.content-section');
+        const slides = document.querySelectorAll('.slideshow-image');
+        // The sermons tab may only arrive later (--lazy-tabs), so its list is looked up on first use
+        let sermons = null;
 
-            return duration;
-        }}
-        
-        function rotateMessages() {{
-            if (messages.length === 0) return;
+        // Tab switching
+        let activeTab = 0;
 
-            //Hide current message
-            messages[currentMessage].classList.remove('active');
+        function showTab(tabIndex) {
+            tabButtons[activeTab].classList.remove('active');
+            sections[activeTab].classList.remove('active');
 
-            //Move to next one
-            currentMessage = (currentMessage + 1) % messages.length;
+            tabButtons[tabIndex].classList.add('active');
+            sections[tabIndex].classList.add('active');
+            activeTab = tabIndex;
+            loadTab(sections[tabIndex]);
+            findVirtualLists();
+        }
+
+        // With --lazy-tabs a tab is an empty section with data-src until it is first opened.
+        // Its content is fetched once and stays in the page.
+        function loadTab(section) {
+            const src = section.dataset.src;
+            if (!src) return;
+            section.removeAttribute('data-src');
+            fetch(src)
+                .then(response => {
+                    if (!response.ok) throw new Error(response.status);
+                    return response.text();
+                })
+                .then(html => {
+                    section.innerHTML = html;
+                    sermons = null;
+                    findVirtualLists();
+                })
+                .catch(() => {
+                    // Try again the next time the tab is opened
+                    section.dataset.src = src;
+                    section.innerHTML = '<p class="welcome-text">This tab could not be loaded, please try again.</p>';
+                });
+        }
+
+        // ONE TIMER FOR EVERYTHING
+        // Messages, slides and the end of each slide fade are tasks with the time they are due.
+        // One timeout is set for the earliest task. While the page is hidden (display off,
+        // other tab) no timeout is set at all, and on return every task is pushed back by
+        // the time spent hidden, so rotation resumes where it was instead of catching up.
+        let tasks = [];
+        let timer = null;
+        let hiddenSince = null;
+
+        function schedule(run, delay) {
+            tasks.push({ run: run, due: performance.now() + delay });
+            armTimer();
+        }
+
+        function armTimer() {
+            clearTimeout(timer);
+            timer = null;
+            if (hiddenSince !== null || tasks.length === 0) return;
+            const nextDue = Math.min(...tasks.map(task => task.due));
+            timer = setTimeout(runDueTasks, Math.max(0, nextDue - performance.now()));
+        }
+
+        function runDueTasks() {
+            const now = performance.now();
+            const due = tasks.filter(task => task.due <= now);
+            tasks = tasks.filter(task => task.due > now);
+            // Tasks schedule their own next run
+            due.forEach(task => task.run());
+            armTimer();
+        }
+
+        document.addEventListener('visibilitychange', () => {
+            if (document.hidden) {
+                hiddenSince = performance.now();
+                armTimer();
+            } else if (hiddenSince !== null) {
+                const hiddenFor = performance.now() - hiddenSince;
+                tasks.forEach(task => task.due += hiddenFor);
+                hiddenSince = null;
+                armTimer();
+            }
+        });
+
+        // ROTATE MESSAGES
+        let messages = [];
+        let messageDurations = [];
+        let currentMessage = 0;
 
-            //Show next message
+        function rotateMessages() {
+            messages[currentMessage].classList.remove('active');
+            currentMessage = (currentMessage + 1) % messages.length;
             messages[currentMessage].classList.add('active');
+            schedule(rotateMessages, messageDurations[currentMessage]);
+        }
+
+        // Starts from the first message; again when --live swaps in a new HOME
+        function startMessages() {
+            messages = document.querySelectorAll('.message');
+            // How long each message stays up is worked out when the page is generated
+            messageDurations = Array.from(messages, message => Number(message.dataset.duration) || 5000);
+            currentMessage = 0;
+            tasks = tasks.filter(task => task.run !== rotateMessages);
+            if (messages.length > 1) {
+                schedule(rotateMessages, messageDurations[0]);
+            }
+        }
+
+        startMessages();
 
-            //Calcualte duration for new meesage
-            const nextDuration = calculateMessageDuration(messages[currentMessage]);
-            console.log(`Next message will display for ${{nextDuration/1000}} seconds`);
-
-            //Clear old interval and set the new one
-            clearInterval(messageInterval);
-            messageInterval = setInterval(rotateMessages, nextDuration);
-        }}
-        //Start the rotation with first message
-        if (messages.length > 0) {{
-            const initialDuration = calculateMessageDuration(messages[0]);
-            messageInterval = setInterval(rotateMessages, initialDuration);
-        }}
-        
         // Slideshow functionality
-        function initSlideshow() {{
-            const slides = document.querySelectorAll('.slideshow-image');
+        function initSlideshow() {
             const slideDuration = 5000;
             let currentSlide = 0;
-        
-            if (slides.length === 0) {{
-                console.log('No slideshow images found');
+
+            if (slides.length === 0) {
                 return;
-            }}
-            
+            }
+
             slides[currentSlide].classList.add('active');
-            
-            if (slides.length === 1) {{
+
+            if (slides.length === 1) {
                 return;
-            }}
-            
-            function rotateSlides() {{
-                slides[currentSlide].classList.add('exiting');
-                slides[currentSlide].classList.remove('active');
-                
-                currentSlide = (currentSlide + 1) % slides.length;
-                
-                slides[currentSlide].classList.add('active');
-                slides[currentSlide].classList.remove('exiting');
-                
-                setTimeout(() => {{
+            }
+
+            // Slides after the first keep their sources in data-* attributes.
+            // Move them in and wait for the decode so the swap never shows a half-drawn image.
+            function loadSlide(slide) {
+                if (slide.dataset.src) {
+                    const picture = slide.parentElement.tagName === 'PICTURE' ? slide.parentElement : null;
+                    if (picture) {
+                        picture.querySelectorAll('source[data-srcset]').forEach(source => {
+                            source.srcset = source.dataset.srcset;
+                            source.removeAttribute('data-srcset');
+                        });
+                    }
+                    if (slide.dataset.srcset) {
+                        slide.srcset = slide.dataset.srcset;
+                        slide.removeAttribute('data-srcset');
+                    }
+                    slide.src = slide.dataset.src;
+                    slide.removeAttribute('data-src');
+                }
+                // A broken image still rotates, it just shows nothing
+                return slide.decode ? slide.decode().catch(() => {}) : Promise.resolve();
+            }
+
+            let nextReady = loadSlide(slides[1]);
+
+            function rotateSlides() {
+                nextReady.then(() => {
+                    slides[currentSlide].classList.add('exiting');
+                    slides[currentSlide].classList.remove('active');
+
+                    currentSlide = (currentSlide + 1) % slides.length;
+
+                    slides[currentSlide].classList.add('active');
+                    slides[currentSlide].classList.remove('exiting');
+
                     const prevSlide = (currentSlide - 1 + slides.length) % slides.length;
-                    slides[prevSlide].classList.remove('exiting');
-                }}, 2000);
-            }}
-            
-            setInterval(rotateSlides, slideDuration);
-        }}
-        
-        document.addEventListener('DOMContentLoaded', initSlideshow);
-
-        // Sermons Accordion Functionality - Single Open Mode (Recommended)
-        function toggleSermon(header) {{
-            // Get all sermon headers and contents
-            const allHeaders = document.querySelectorAll('.sermon-header');
-            const allContents = document.querySelectorAll('.sermon-content');
-            const currentContent = header.nextElementSibling;
-            const currentIcon = header.querySelector('.toggle-icon');
-            
-            // Check if current sermon is already open
-            const isOpen = !currentContent.classList.contains('collapsed');
-            
-            // CLOSE ALL sermons first
-            allHeaders.forEach((h, index) => {{
-                h.classList.remove('active');
-                const icon = h.querySelector('.toggle-icon');
-                if (icon) icon.textContent = '▶';
-            }});
-            
-            allContents.forEach(content => {{
-                content.classList.add('collapsed');
-            }});
-            
-            // If it wasn't open, OPEN the clicked one
-            if (!isOpen) {{
-                currentContent.classList.remove('collapsed');
-                header.classList.add('active');
-                currentIcon.textContent = '▼';
-            }} 
-            else {{
-                currentContent.classList.add('collapsed');
-                header.classList.remove('active');
-                currentIcon.textContent = '▶';                
-            }}
-        }}
+                    schedule(() => slides[prevSlide].classList.remove('exiting'), 2000);
+
+                    // Start on the following slide now so it is ready in 5 seconds
+                    nextReady = loadSlide(slides[(currentSlide + 1) % slides.length]);
+                    schedule(rotateSlides, slideDuration);
+                });
+            }
+
+            schedule(rotateSlides, slideDuration);
+        }
+
+        initSlideshow();
+
+        // VIRTUAL LISTS (--virtual-lists)
+        // A long birthday/anniversary list is row data in a <script type="application/json">.
+        // Only the rows in view, plus a margin above and below, exist as elements; they are
+        // rebuilt at most once per frame while scrolling. All rows have the same height,
+        // so a row's position is just its index times the slot size.
+        const scroller = document.querySelector('.content-area');
+        const overscanRows = 10;
+        let visibleLists = [];
+        let renderQueued = false;
+
+        function findVirtualLists() {
+            visibleLists = Array.from(sections[activeTab].querySelectorAll('.virtual-list'), container => {
+                if (!container.virtualList) {
+                    const rowsHolder = document.createElement('div');
+                    container.appendChild(rowsHolder);
+                    container.virtualList = {
+                        container: container,
+                        rowsHolder: rowsHolder,
+                        rows: JSON.parse(container.querySelector('script').textContent),
+                        templates: JSON.parse(container.dataset.templates),
+                        rowHeight: Number(container.dataset.rowHeight),
+                        slot: Number(container.dataset.slot),
+                        first: -1,
+                        last: -1,
+                    };
+                }
+                return container.virtualList;
+            });
+            renderVirtualLists();
+        }
+
+        // Same markup as the server side renderers, and like them it trusts the data
+        function virtualRow(list, index) {
+            const row = list.rows[index];
+            const details = list.templates
+                .map((template, n) => row[n + 1] == null ? '' : `<div class="event-detail">${template.replace('{}', () => row[n + 1])}</div>`)
+                .join('');
+            return `<div class="event-item" style="top: ${index * list.slot}px; height: ${list.rowHeight}px">`
+                + `<div class="event-title">${row[0]}</div>${details}</div>`;
+        }
+
+        function renderVirtualLists() {
+            renderQueued = false;
+            const view = scroller.getBoundingClientRect();
+            visibleLists.forEach(list => {
+                const top = list.container.getBoundingClientRect().top;
+                const first = Math.max(0, Math.floor((view.top - top) / list.slot) - overscanRows);
+                const last = Math.min(list.rows.length - 1, Math.ceil((view.bottom - top) / list.slot) + overscanRows);
+                if (first === list.first && last === list.last) return;
+                list.first = first;
+                list.last = last;
+                let html = '';
+                for (let index = first; index <= last; index++) html += virtualRow(list, index);
+                list.rowsHolder.innerHTML = html;
+            });
+        }
+
+        scroller.addEventListener('scroll', () => {
+            if (visibleLists.length === 0 || renderQueued) return;
+            renderQueued = true;
+            requestAnimationFrame(renderVirtualLists);
+        }, { passive: true });
+        window.addEventListener('resize', renderVirtualLists);
+
+        // Sermons accordion: one sermon open at a time, clicking the open one closes it
+        function toggleSermon(header) {
+            sermons = sermons || Array.from(document.querySelectorAll('.sermon-header'), header => ({
+                header: header,
+                content: header.nextElementSibling,
+                icon: header.querySelector('.toggle-icon'),
+            }));
+            const clicked = sermons.find(sermon => sermon.header === header);
+            const isOpen = !clicked.content.classList.contains('collapsed');
+
+            sermons.forEach(sermon => {
+                const open = sermon === clicked && !isOpen;
+                sermon.header.classList.toggle('active', open);
+                sermon.content.classList.toggle('collapsed', !open);
+                if (sermon.icon) sermon.icon.textContent = open ? '▼' : '▶';
+            });
+        }
+
+        // LIVE UPDATES (--live)
+        // Every so often the page asks for brochure-live.json. It is a conditional request
+        // (the browser sends back the ETag), so until the brochure is rebuilt the answer is an
+        // empty 304. The file lists the URL of each tab, named after its content: only the tabs
+        // whose URL changed are fetched and swapped in, the slideshow keeps running.
+        const liveSrc = document.body.dataset.live;
+        const liveInterval = Number(document.body.dataset.liveInterval) || 30000;
+        let liveVersion = null;
+
+        function checkLive() {
+            fetch(liveSrc, { cache: 'no-cache' })
+                .then(response => {
+                    if (!response.ok) throw new Error(response.status);
+                    return response.json();
+                })
+                .then(live => {
+                    if (live.version === liveVersion) return;
+                    liveVersion = live.version;
+                    live.sections.forEach((src, index) => {
+                        const section = sections[index];
+                        if (section && section.dataset.live !== src) updateSection(section, src);
+                    });
+                })
+                // Offline or mid-deploy: keep what is shown and ask again next time
+                .catch(() => {})
+                .finally(() => schedule(checkLive, liveInterval));
+        }
+
+        function updateSection(section, src) {
+            // A lazy tab that was never opened just loads the new version when it is
+            if (section.dataset.src) {
+                section.dataset.src = src;
+                section.dataset.live = src;
+                return;
+            }
+            fetch(src)
+                .then(response => {
+                    if (!response.ok) throw new Error(response.status);
+                    return response.text();
+                })
+                .then(html => {
+                    section.innerHTML = html;
+                    section.dataset.live = src;
+                    sermons = null;
+                    if (section.querySelector('.message')) startMessages();
+                    if (section === sections[activeTab]) findVirtualLists();
+                })
+                .catch(() => {
+                    // Compare everything again on the next poll
+                    liveVersion = null;
+                });
+        }
+
+        if (liveSrc) {
+            schedule(checkLive, liveInterval);
+        }
+
+        // ONE PAGE FOR THE WHOLE YEAR (--year-page)
+        // Tabs that show a month's data come as HTML for every month in #month-sections
+        // (months with the same tab share one copy). The month and the date badge are
+        // taken from this device's clock on load and again just after each midnight.
+        const monthData = document.getElementById('month-sections');
+        let shownMonth = -1;
+
+        function showToday() {
+            const monthSections = JSON.parse(monthData.textContent);
+            const today = new Date();
+            const month = today.getMonth();
+            if (month !== shownMonth) {
+                shownMonth = month;
+                monthSections.sections.forEach(([index, variants]) => {
+                    sections[index].innerHTML = monthSections.variants[variants[month]];
+                });
+                sermons = null;
+                startMessages();
+                findVirtualLists();
+            }
+            const day = String(today.getDate()).padStart(2, '0');
+            document.querySelectorAll('.date-badge').forEach(badge => {
+                badge.textContent = `📅 ${day} ${monthSections.months[month]}, ${today.getFullYear()}`;
+            });
+            const nextDay = new Date(today.getFullYear(), month, today.getDate() + 1, 0, 0, 1);
+            setTimeout(showToday, nextDay - today);
+        }
+
+        if (monthData) {
+            showToday();
+        }
+
+        // One click listener for the whole page instead of one per button
+        document.addEventListener('click', event => {
+            const tabButton = event.target.closest('.tab-button');
+            if (tabButton) {
+                showTab(Number(tabButton.dataset.tab));
+                return;
+            }
+            const sermonHeader = event.target.closest('.sermon-header');
+            if (sermonHeader) {
+                toggleSermon(sermonHeader);
+            }
+        });"""
+
+
+def minify_js(script):
+    # Conservative: drops comment lines and indentation but keeps the line breaks,
+    # so automatic semicolon insertion works exactly as in the original
+    lines = (line.strip() for line in script.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+# Tabs are written as rendered: some texts are shown with white-space: pre-line
+GENERATED_MINIFIERS = {'.css': minify_css, '.js': minify_js, '.html': lambda html: html}
+
+
+# ============================================
+# IMAGE PIPELINE
+# ============================================
+# Phone photos are 3-5 MB each. With --responsive-images every slideshow photo
+# (and the logo) also gets smaller copies and the <img> gets a srcset, so the
+# browser downloads the size that fits. With --modern-formats the copies are
+# also encoded as AVIF/WebP and offered through <picture>, with the JPEG/PNG
+# as fallback. Everything lands in image_derivatives/, named after the hash of
+# the source and the encoder settings, so reruns only process new photos.
+
+DERIVATIVE_WIDTHS = [480, 960, 1600]
+LOGO_WIDTHS = [250]
+DERIVATIVE_QUALITY = 80
+# The slideshow fills the right half of the screen, or the whole width on phones
+SLIDESHOW_SIZES = '(max-width: 768px) 100vw, 50vw'
+LOGO_SIZES = '(max-width: 768px) 120px, 250px'
+
+# mime type, file extension, Pillow format, quality; best compression first
+MODERN_FORMATS = [
+    ('image/avif', 'avif', 'AVIF', 55),
+    ('image/webp', 'webp', 'WEBP', 75),
+]
+
+
+def available_modern_formats():
+    # Pillow can only write the formats its build (or plugins) support
+    if Image is None:
+        return []
+    Image.init()
+    return [fmt for fmt in MODERN_FORMATS if fmt[2] in Image.SAVE]
+
+
+def save_image(image, path, save_args):
+    if not os.path.exists(path):
+        tmp_path = path + '.tmp'
+        image.save(tmp_path, **save_args)
+        os.replace(tmp_path, path)
+
+
+def make_derivatives(source_path, digest, widths, quality, formats):
+    # Runs in a pool worker. Makes one copy per width smaller than the original in the
+    # source's own kind of format, and one per width plus the full size in each modern format.
+    with Image.open(source_path) as original:
+        # Phone cameras store rotation in EXIF, copies would otherwise lie on their side
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+        if has_alpha:
+            image, ext, save_args = image.convert('RGBA'), 'png', {'format': 'PNG', 'optimize': True}
+        else:
+            image, ext, save_args = image.convert('RGB'), 'jpg', {'format': 'JPEG', 'quality': quality,
+                                                                   'optimize': True, 'progressive': True}
+
+        smaller = [width for width in widths if width < image.width]
+        resized = {image.width: image}
+        for width in smaller:
+            height = max(1, round(image.height * width / image.width))
+            resized[width] = image.resize((width, height), Image.LANCZOS)
+
+        derivatives = []
+        for width in smaller:
+            path = f"{DERIVATIVES_FOLDER}/{digest[:16]}-{width}-q{quality}.{ext}"
+            save_image(resized[width], path, save_args)
+            derivatives.append([width, path])
+
+        modern = {}
+        for mime, fmt_ext, fmt_name, fmt_quality in formats:
+            modern[mime] = []
+            for width in smaller + [image.width]:
+                path = f"{DERIVATIVES_FOLDER}/{digest[:16]}-{width}-q{fmt_quality}.{fmt_ext}"
+                save_image(resized[width], path, {'format': fmt_name, 'quality': fmt_quality})
+                modern[mime].append([width, path])
+
+        return {'width': image.width, 'derivatives': derivatives, 'formats': modern}
+
+
+def load_derivative_index():
+    try:
+        with open(DERIVATIVES_INDEX, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}, 'sources': {}}
+
+
+def build_image_variants(slideshow_images, options, workers=None):
+    # Returns {path: {'width': ..., 'derivatives': [[width, path], ...], 'formats': {mime: [[width, path], ...]}}}
+    # for the slideshow images and the logo
+    if Image is None:
+        print("Warning: Pillow is not installed (pip install Pillow), using the original images")
+        return {}
+
+    formats = available_modern_formats() if options.modern_formats else []
+    if options.modern_formats and len(formats) < len(MODERN_FORMATS):
+        missing = [fmt[1] for fmt in MODERN_FORMATS if fmt not in formats]
+        print(f"Warning: this Pillow can't write {', '.join(missing)}, skipping it")
+
+    # Resizing a GIF would drop the animation
+    jobs = [(f"{SLIDESHOW_FOLDER}/{name}", DERIVATIVE_WIDTHS) for name in slideshow_images
+            if not name.lower().endswith('.gif')]
+    if os.path.exists(LOGO_FILE):
+        jobs.append((LOGO_FILE, LOGO_WIDTHS))
+
+    index = load_derivative_index()
+    files, sources, todo = {}, {}, {}
+
+    for path, widths in jobs:
+        if not options.responsive_images:
+            widths = []
+        settings = {'widths': widths, 'quality': DERIVATIVE_QUALITY, 'formats': [[fmt[0], fmt[3]] for fmt in formats]}
+
+        stat = os.stat(path)
+        known = index['files'].get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            digest = known['digest']
+        else:
+            digest = file_digest(path)
+        files[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+
+        source = index['sources'].get(digest)
+        outputs = [p for _, p in source['derivatives']] + [p for paths in source['formats'].values() for _, p in paths] if source else []
+        if source and source.get('settings') == settings and all(os.path.exists(p) for p in outputs):
+            sources[digest] = source
+        else:
+            todo[digest] = (path, widths, settings)
+
+    if todo:
+        os.makedirs(DERIVATIVES_FOLDER, exist_ok=True)
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {digest: pool.submit(make_derivatives, path, digest, widths, DERIVATIVE_QUALITY, formats)
+                       for digest, (path, widths, _) in todo.items()}
+            for digest, future in futures.items():
+                try:
+                    result = future.result()
+                except (OSError, ValueError) as e:
+                    print(f"Warning: could not convert '{todo[digest][0]}' ({e}), using the original")
+                    continue
+                result['settings'] = todo[digest][2]
+                sources[digest] = result
+        print(f"✓ Processed {len(todo)} image(s) in {time.perf_counter() - started:.1f}s")
+
+    # Remove copies of images that are no longer used
+    if os.path.isdir(DERIVATIVES_FOLDER):
+        in_use = {p for source in sources.values() for _, p in source['derivatives']}
+        in_use |= {p for source in sources.values() for paths in source['formats'].values() for _, p in paths}
+        for entry in os.scandir(DERIVATIVES_FOLDER):
+            path = f"{DERIVATIVES_FOLDER}/{entry.name}"
+            if entry.is_file() and path not in in_use and os.path.join(DERIVATIVES_FOLDER, entry.name) != DERIVATIVES_INDEX:
+                os.remove(entry.path)
+
+        write_if_changed(DERIVATIVES_INDEX, json.dumps({'files': files, 'sources': sources}, indent=1, sort_keys=True))
+
+    return {path: sources[info['digest']] for path, info in files.items() if info['digest'] in sources}
+
+
+def srcset_for(candidates, ctx):
+    # Photo names have spaces (WhatsApp Image ...), which would split a srcset entry
+    return ', '.join(f"{quote(ctx.asset_url(path))} {width}w" for width, path in candidates)
+
+
+def image_slice(path, ctx):
+    # src, srcset and <picture> sources for one image
+    src = ctx.asset_url(path)
+    variants = (ctx.image_variants or {}).get(path)
+    if not variants:
+        return {'src': src, 'srcset': '', 'sources': []}
+
+    srcset = ''
+    if variants['derivatives']:
+        srcset = srcset_for(variants['derivatives'] + [[variants['width'], path]], ctx)
+    sources = [{'type': mime, 'srcset': srcset_for(candidates, ctx)}
+               for mime, candidates in variants.get('formats', {}).items() if candidates]
+    return {'src': src, 'srcset': srcset, 'sources': sources}
+
+
+def render_picture(image, img_attrs, sizes, indent, deferred=False):
+    # A plain <img>, or a <picture> around it when there are modern format versions.
+    # Deferred images keep their sources in data-* attributes until the page script loads them.
+    prefix = 'data-' if deferred else ''
+    srcset = f' {prefix}srcset="{image["srcset"]}" sizes="{sizes}"' if image['srcset'] else ''
+    img = f'<img {prefix}src="{image["src"]}"{srcset} {img_attrs}>'
+    if not image['sources']:
+        return img
+    sources = ''.join(f'{indent}    <source type="{source["type"]}" {prefix}srcset="{source["srcset"]}" sizes="{sizes}">\n'
+                      for source in image['sources'])
+    return f"<picture>\n{sources}{indent}    {img}\n{indent}</picture>"
+
+
+# ============================================
+# DIST BUILD (FINGERPRINTED ASSETS)
+# ============================================
+# With --dist the page is written to dist/ and every image/video it uses is
+# copied to dist/assets/<name>.<hash><ext>. A changed file gets
+# a new name, so web servers can cache assets forever and only revalidate the
+# HTML. dist/manifest.json maps each original path to its published path.
+
+# path -> ((size, mtime), digest), so big photos are hashed once per process.
+# Only the current version of each file is kept.
+_asset_digests = {}
+
+
+def asset_digest(path):
+    stat = os.stat(path)
+    version = (stat.st_size, stat.st_mtime_ns)
+    cached = _asset_digests.get(path)
+    if not cached or cached[0] != version:
+        cached = _asset_digests[path] = (version, file_digest(path))
+    return cached[1]
+
+
+def publish_asset(path, out_dir=DIST_DIR):
+    # Returns the published path relative to out_dir, e.g. 'assets/PXL_2025.3f2a9c1b7e.jpg'
+    stem, ext = os.path.splitext(os.path.basename(path))
+    # Spaces and odd characters in photo names make for fragile URLs
+    stem = re.sub(r'[^A-Za-z0-9._-]+', '-', stem).strip('-') or 'asset'
+    name = f"{stem}.{asset_digest(path)[:10]}{ext.lower()}"
+
+    assets_dir = os.path.join(out_dir, 'assets')
+    target = os.path.join(assets_dir, name)
+    # A copy, not a hardlink: editing the original in place would change the file behind
+    # its hashed name, which browsers cache as immutable. Links left by older builds are
+    # replaced by a copy too.
+    if not os.path.exists(target) or os.stat(target).st_nlink > 1:
+        os.makedirs(assets_dir, exist_ok=True)
+        # Unique temp name, workers of --all-months may publish the same file at once
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=assets_dir)
+        os.close(fd)
+        try:
+            shutil.copy2(path, tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return f"assets/{name}"
+
+
+def fingerprinted_asset_url(out_dir, manifest, page_dir=None):
+    # asset_url for pages in page_dir (default out_dir); records what it publishes in manifest
+    page_dir = page_dir or out_dir
+    prefix = os.path.relpath(out_dir, page_dir).replace(os.sep, '/')
+    prefix = '' if prefix == '.' else prefix + '/'
+
+    def asset_url(path):
+        if path not in manifest:
+            if not os.path.exists(path):
+                # Referenced in the data but missing (e.g. a video not copied over yet); keep the link as is
+                return prefix + path
+            manifest[path] = publish_asset(path, out_dir)
+        return prefix + manifest[path]
+    return asset_url
+
+
+def save_dist_manifest(manifest, out_dir=DIST_DIR):
+    write_if_changed(os.path.join(out_dir, 'manifest.json'), json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False))
+
+    # Old versions of changed files are no longer referenced
+    assets_dir = os.path.join(out_dir, 'assets')
+    if os.path.isdir(assets_dir):
+        in_use = {os.path.basename(published) for published in manifest.values()}
+        for entry in os.scandir(assets_dir):
+            if entry.is_file() and uncompressed_name(entry.name) not in in_use:
+                os.remove(entry.path)
+
+
+# ============================================
+# PRECOMPRESSION
+# ============================================
+# With --precompress every text file of the build gets .gz and .br siblings
+# (index.html.gz...) at the highest compression level, so nginx (gzip_static,
+# brotli_static) sends them as they are instead of compressing on each request.
+
+PRECOMPRESS_TYPES = ('.html', '.css', '.js', '.json', '.svg')
+
+
+def gzip_bytes(body):
+    # mtime=0 so the same page always gives the same bytes
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(body):
+    return brotli.compress(body, quality=11)
+
+
+def available_compressors():
+    # Content-Encoding -> (file suffix, compress function)
+    compressors = {'gzip': ('.gz', gzip_bytes)}
+    if brotli:
+        compressors['br'] = ('.br', brotli_bytes)
+    return compressors
+
+
+PRECOMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def uncompressed_name(name):
+    # 'index.html.gz' -> 'index.html', other names are returned as they are
+    stem, ext = os.path.splitext(name)
+    return stem if ext in PRECOMPRESSED_SUFFIXES else name
+
+
+def build_artifacts(out_dir, pages, options):
+    # The pages plus the stylesheets, scripts, tabs and manifest written next to them
+    paths = list(pages)
+    if options.live:
+        paths += [os.path.join(os.path.dirname(page), LIVE_FILE) for page in pages]
+    if options.dist:
+        paths.append(os.path.join(out_dir, 'manifest.json'))
+        assets_dir = os.path.join(out_dir, 'assets')
+        if os.path.isdir(assets_dir):
+            paths += sorted(entry.path for entry in os.scandir(assets_dir) if entry.is_file()
+                            and os.path.splitext(entry.name)[1].lower() in PRECOMPRESS_TYPES)
+    elif writes_generated_files(options):
+        paths += generated_files(out_dir)
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def is_precompressed_current(path, sibling):
+    # Siblings get the mtime of what they were made from, and write_if_changed
+    # keeps the mtime of files whose bytes did not change
+    try:
+        return os.stat(sibling).st_mtime_ns >= os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def write_precompressed(path, suffix, compress):
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        body = compress(f.read())
+    sibling = path + suffix
+    tmp_path = sibling + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.chmod(tmp_path, stat.st_mode & 0o777)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_path, sibling)
+    return len(body)
+
+
+def update_precompressed(paths, enabled):
+    # Writes the missing and outdated siblings, several files at once (zlib and brotli
+    # let go of the GIL while compressing). Outdated siblings that are not written again
+    # (no --precompress, brotli uninstalled) are deleted, nginx would keep sending them.
+    compressors = dict(available_compressors().values()) if enabled else {}
+    jobs = []
+    for path in paths:
+        for suffix in PRECOMPRESSED_SUFFIXES:
+            sibling = path + suffix
+            if is_precompressed_current(path, sibling):
+                continue
+            if suffix in compressors:
+                jobs.append((path, suffix, compressors[suffix]))
+            elif os.path.exists(sibling):
+                os.remove(sibling)
+    if not jobs:
+        return
+
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(lambda job: write_precompressed(*job), jobs))
+    note = '' if brotli else ', gzip only (brotli is not installed)'
+    print(f"✓ {len(jobs)} precompressed files written{note}")
+
+
+# ============================================
+# ALL MONTHS BUILD
+# ============================================
+
+MONTHS = list(calendar.month_name)[1:]
+
+# Set in each pool worker so the data is sent to it once, not once per month
+_worker_data = None
+_worker_images = None
+_worker_image_variants = None
+
+
+def _init_month_worker(data, slideshow_images, image_variants):
+    global _worker_data, _worker_images, _worker_image_variants
+    _worker_data = data
+    _worker_images = slideshow_images
+    _worker_image_variants = image_variants
+    keep_fragments()
+
+
+def render_month(month, year, out_dir, options):
+    # The badge shows just the month since a month page is used all month long
+    month_index = MONTHS.index(month) + 1
+    month_date = datetime(year, month_index, 1).strftime('%B %Y')
+    page_dir = os.path.join(out_dir, month)
+
+    # With --dist the assets are published next to the month folders, otherwise the originals are used
+    manifest = {}
+    if options.dist:
+        asset_url = fingerprinted_asset_url(out_dir, manifest, page_dir)
+    else:
+        asset_url = prefixed_asset_url(os.path.relpath('.', page_dir).replace(os.sep, '/') + '/')
+    # Months with the same (pruned) styles or the same tab end up sharing one file, the script is the same for all
+    css_url = js_url = tab_url = live_url = None
+    live_sections = {}
+    if options.external_css:
+        css_url = generated_asset_url(out_dir, options.dist, manifest, f'{month}/{GENERATED_STEM}.css', page_dir)
+    if options.external_js:
+        js_url = generated_asset_url(out_dir, options.dist, manifest, f'{month}/{GENERATED_STEM}.js', page_dir)
+    if options.lazy_tabs:
+        tab_url = lazy_tab_url(out_dir, options.dist, manifest, page_dir, f'{month}/')
+    if options.live:
+        live_url = live_section_url(out_dir, options.dist, manifest, live_sections, page_dir, f'{month}/')
+    ctx = RenderContext(month=month, date=month_date, asset_url=asset_url, image_variants=_worker_image_variants,
+                        stylesheet_url=css_url, prune_css=prunes_css(options), script_url=js_url, tab_url=tab_url,
+                        virtual_lists=options.virtual_lists, live_url=live_url)
+    html = render_page(_worker_data, _worker_images, ctx)
+
+    os.makedirs(page_dir, exist_ok=True)
+    if options.live:
+        save_live_file(page_dir, live_sections)
+    else:
+        remove_live_file(page_dir)
+    path = os.path.join(page_dir, OUTPUT_FILE)
+    return path, write_if_changed(path, html), manifest
+
+
+def render_month_selector(church_name, year):
+    links = '\n'.join(
+        f'            <li><a href="{month}/{OUTPUT_FILE}">{month} {year}</a></li>' for month in MONTHS
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{church_name}</title>
+    <style>
+        body {{ font-family: 'Georgia', serif; background: #ecf0f1; color: #2c3e50; padding: 40px; }}
+        ul {{ list-style: none; padding: 0; }}
+        li {{ margin: 10px 0; font-size: 20px; }}
+        a {{ color: #0078a8; }}
+    </style>
+</head>
+<body>
+    <h1>{church_name}</h1>
+    <ul>
+{links}
+    </ul>
+    <script>
+        // Go straight to this month's page
+        const months = {json.dumps(MONTHS)};
+        location.replace(months[new Date().getMonth()] + '/{OUTPUT_FILE}');
     </script>
 </body>
 </html>
-""")
-    
-    html = ''.join(html_parts)
-    
-    # Write to file
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print("✓ index.html generated successfully!")
-    return 'index.html'
+"""
+
+
+def generate_all_months(out_dir=MONTHS_DIR, year=None, workers=None, options=BuildOptions()):
+    # Parse once in the parent; each worker renders whole months and
+    # reuses its cached static fragments (CSS/JS, contact, about...) between them
+    year = year or datetime.now(build_timezone(options)).year
+    data = load_data()
+    slideshow_images = get_slideshow_images()
+    image_variants = build_image_variants(slideshow_images, options, workers) if uses_image_pipeline(options) else {}
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_month_worker,
+                             initargs=(data, slideshow_images, image_variants)) as pool:
+        futures = [pool.submit(render_month, month, year, out_dir, options) for month in MONTHS]
+        results = [future.result() for future in futures]
+
+    selector = os.path.join(out_dir, OUTPUT_FILE)
+    write_if_changed(selector, render_month_selector(data['church_info']['name'], year))
+
+    manifest = {}
+    for _, _, month_manifest in results:
+        manifest.update(month_manifest)
+    if options.dist:
+        save_dist_manifest(manifest, out_dir)
+    else:
+        remove_old_generated(out_dir, manifest)
+
+    written = sum(1 for _, changed, _ in results if changed)
+    print(f"✓ {len(results)} month pages in {out_dir}/ ({written} updated) in {time.perf_counter() - started:.2f}s")
+    update_precompressed(build_artifacts(out_dir, [selector] + [path for path, _, _ in results], options), options.precompress)
+    return selector
+
+
+# ============================================
+# WATCH MODE
+# ============================================
+
+# inotify flags from <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_IGNORED = 0x8000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+
+class InotifyWatcher:
+    # Watches the base folder (editors often save by renaming over the file)
+    # plus each watched folder, and reports which WATCH_PATHS changed.
+
+    def __init__(self, paths):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError('libc not found')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError('inotify is not available')
+
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self.paths = paths
+        self.watches = {}
+        self._add_watch('.')
+        for path in paths:
+            if os.path.isdir(path):
+                self._add_watch(path)
+
+    def _add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = path
+
+    def _read_events(self):
+        changed = set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _cookie, length = struct.unpack_from('iIII', buffer, offset)
+            name = buffer[offset + 16:offset + 16 + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += 16 + length
+
+            folder = self.watches.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                # The folder was deleted or moved away; the base watch will see it come back
+                del self.watches[wd]
+                changed.add(folder)
+            elif folder == '.':
+                if name in self.paths:
+                    changed.add(name)
+                    if os.path.isdir(name) and name not in self.watches.values():
+                        self._add_watch(name)
+            else:
+                changed.add(folder)
+        return changed
+
+    def wait(self, timeout, debounce):
+        # Block until something changes, then keep collecting until it has been quiet for `debounce`.
+        # Events for files we don't care about (like our own index.html) are skipped.
+        deadline = time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                return set()
+            changed = self._read_events()
+
+        while select.select([self.fd], [], [], debounce)[0]:
+            changed |= self._read_events()
+        return changed
+
+
+class PollingWatcher:
+    # Fallback for systems without inotify: compare stat snapshots
+
+    def __init__(self, paths, interval=1.0):
+        self.paths = paths
+        self.interval = interval
+        self.snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for path in self.paths:
+            try:
+                if os.path.isdir(path):
+                    snapshot[path] = tuple(sorted(
+                        (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                        for entry in os.scandir(path)
+                    ))
+                else:
+                    stat = os.stat(path)
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                snapshot[path] = None
+        return snapshot
+
+    def _diff(self):
+        new_snapshot = self._take_snapshot()
+        changed = {path for path in self.paths if new_snapshot[path] != self.snapshot.get(path)}
+        self.snapshot = new_snapshot
+        return changed
+
+    def wait(self, timeout, debounce):
+        deadline = time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            if time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+            changed = self._diff()
+
+        # Wait for the burst to settle down
+        while True:
+            time.sleep(max(debounce, self.interval))
+            more = self._diff()
+            if not more:
+                return changed
+            changed |= more
+
+
+def make_watcher(paths, poll_interval=1.0):
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError) as e:
+        print(f"Warning: inotify unavailable ({e}), falling back to polling every {poll_interval}s")
+        return PollingWatcher(paths, poll_interval)
+
+
+def build_error(e):
+    # What went wrong with a rebuild, for the resident modes' warnings
+    if isinstance(e, json.JSONDecodeError):
+        return f"{DATA_FILE} is not valid JSON ({e})"
+    return f"the build failed ({type(e).__name__}: {e})"
+
+
+def first_build(options):
+    keep_fragments()
+    # Parsed data and the image list stay in memory between rebuilds. With --data-store
+    # each rebuild reads its month from the store instead: data loaded for one month
+    # would be wrong once the month changes.
+    data = None if options.data_store else load_data()
+    slideshow_images = get_slideshow_images()
+    output_file = generate_html(data=data, slideshow_images=slideshow_images, options=options)
+    return data, slideshow_images, output_file
+
+
+def watch(debounce=0.3, poll_interval=1.0, options=BuildOptions()):
+    # A broken start is an error; only once running are failed rebuilds survived
+    data, slideshow_images, _ = first_build(options)
+    watcher = make_watcher(WATCH_PATHS, poll_interval)
+    watch_changes(watcher, data, slideshow_images, debounce, options)
+
+
+def watch_changes(watcher, data, slideshow_images, debounce=0.3, options=BuildOptions(), on_build=None):
+    # The rebuild loop; on_build(output_file) is called after every rebuild (see serve)
+    tz = build_timezone(options)
+    print(f"Watching {', '.join(WATCH_PATHS)} for changes (Ctrl+C to stop)")
+
+    try:
+        while True:
+            # Wake up at midnight anyway so the page follows the date
+            changed = watcher.wait(timeout=seconds_until(next_day_start(tz)), debounce=debounce)
+
+            # A half-saved file or data the renderers cannot handle must not end the
+            # process: the page is replaced in one step, so the last good one stays up
+            try:
+                if DATA_FILE in changed:
+                    if options.data_store:
+                        compile_data_store()
+                    else:
+                        data = load_data()
+                if SLIDESHOW_FOLDER in changed:
+                    slideshow_images = get_slideshow_images()
+
+                if changed:
+                    print(f"Changed: {', '.join(sorted(changed))}")
+                started = time.perf_counter()
+                output_file = generate_html(data=data, slideshow_images=slideshow_images, options=options)
+                if on_build:
+                    on_build(output_file)
+                if changed:
+                    print(f"  rebuilt in {(time.perf_counter() - started) * 1000:.1f} ms")
+            except Exception as e:
+                print(f"Warning: {build_error(e)}, keeping the last good page until the next change")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+# ============================================
+# SCHEDULE MODE
+# ============================================
+# --schedule stays running instead of a cron job that reruns the script every
+# minute: it sleeps until the next midnight (in --timezone), rebuilds and goes
+# back to sleep. Only the day and month change at midnight, so the fragment
+# cache renders just the HOME badge and the tabs that show this month's
+# data again; everything else is reused. (--watch and --serve wake at midnight too.)
+
+# Sleeps are cut into pieces of at most this long and the clock is read again after
+# each, so a suspended machine or a clock change cannot make us oversleep the day
+SCHEDULE_MAX_SLEEP = 3600
+# A build that failed (e.g. the data file is half-saved) is retried this much later
+SCHEDULE_RETRY_SECONDS = 300
+
+
+def next_day_start(tz=None, now=None):
+    # The next midnight in tz. Built from the calendar date, not now + 24h,
+    # so days with a daylight saving change are 23 or 25 hours long as they should be.
+    now = now or datetime.now(tz)
+    tomorrow = now.date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=tz)
+
+
+def seconds_until(moment):
+    # Through timestamps: subtracting two datetimes of the same zone ignores a DST change between them
+    return min(max(0.0, moment.timestamp() - time.time()), SCHEDULE_MAX_SLEEP)
+
+
+def sleep_until(moment):
+    while (remaining := seconds_until(moment)) > 0:
+        time.sleep(remaining)
+
+
+def run_schedule(options=BuildOptions()):
+    keep_fragments()
+    tz = build_timezone(options)
+    zone_name = options.timezone or 'local time'
+    try:
+        while True:
+            try:
+                generate_html(options=options)
+            except Exception as e:
+                # Keep the last page and try again soon
+                print(f"Warning: {build_error(e)}, retrying in {SCHEDULE_RETRY_SECONDS // 60} minutes")
+                time.sleep(SCHEDULE_RETRY_SECONDS)
+                continue
+
+            wake = next_day_start(tz)
+            new_month = ' (new month)' if wake.day == 1 else ''
+            print(f"Next rebuild at {wake:%d %B %Y %H:%M} {zone_name}{new_month} (Ctrl+C to stop)")
+            sleep_until(wake)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+# ============================================
+# SERVE MODE
+# ============================================
+# --serve hosts the brochure itself. The page is kept in memory with its gzip
+# (and brotli, if installed) versions, compressed once per build; the watch loop
+# rebuilds it when the inputs change. Every response has a strong ETag, so a
+# kiosk refresh of an unchanged page is answered with a 304. Files named after
+# their content hash are cached by browsers for a year, everything else is
+# revalidated on each load.
+
+TEXT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'text/javascript; charset=utf-8',
+    '.json': 'application/json',
+    '.svg': 'image/svg+xml',
+}
+LONG_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Outside --dist only what the page links to is served, not the data or the scripts
+SERVED_FOLDERS = [SLIDESHOW_FOLDER, 'Images', VIDEOS_FOLDER, DERIVATIVES_FOLDER]
+
+# A text file held in memory: digest of body, compressed = {encoding: bytes}
+CachedResponse = namedtuple('CachedResponse', 'body digest content_type compressed')
+
+
+def compress_variants(body):
+    variants = {encoding: compress(body) for encoding, (_, compress) in available_compressors().items()}
+    # Tiny files can come out bigger
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(body)}
+
+
+def cached_response(body, content_type):
+    return CachedResponse(body, hashlib.sha256(body).hexdigest(), content_type, compress_variants(body))
+
+
+# Names make_derivatives gives its copies: <source digest>-<width>-q<quality>.<ext>
+# (not index.json, which changes with every new photo)
+DERIVATIVE_NAME = re.compile(r'[0-9a-f]{16}-\d+-q\d+\.[a-z]+')
+
+
+def is_fingerprinted(rel_path):
+    # Names that change with the content: published assets, generated files, image derivatives
+    top, name = rel_path.split('/', 1)[0], os.path.basename(rel_path)
+    return top == 'assets' or (top == DERIVATIVES_FOLDER and bool(DERIVATIVE_NAME.fullmatch(name))) \
+        or bool(GENERATED_NAME.fullmatch(name))
+
+
+class BrochureSite:
+    def __init__(self, options):
+        self.root = DIST_DIR if options.dist else '.'
+        self.dist = options.dist
+        self.page = None
+        self._text_files = {}  # path -> ((size, mtime), CachedResponse)
+        self._lock = threading.Lock()
+
+    def load(self, output_file):
+        # Called by the watch loop after each build; only an actual change is compressed again
+        with open(output_file, 'rb') as f:
+            body = f.read()
+        if not self.page or self.page.digest != hashlib.sha256(body).hexdigest():
+            self.page = cached_response(body, TEXT_TYPES['.html'])
+        # Each build gives the stylesheet, script and tabs new hashed names and deletes the old ones
+        with self._lock:
+            for path in [path for path in self._text_files if not os.path.isfile(path)]:
+                del self._text_files[path]
+
+    def resolve(self, url_path):
+        # Returns (file path, path relative to the root) or None when it must not be served
+        rel_path = url_path.lstrip('/')
+        parts = rel_path.split('/')
+        if not rel_path or any(part in ('', '.', '..') or part.startswith('.') for part in parts):
+            return None
+        if not self.dist and not (parts[0] in SERVED_FOLDERS or (len(parts) == 1 and
+                                                                 (GENERATED_NAME.fullmatch(rel_path) or rel_path == LIVE_FILE))):
+            return None
+        # The derivative index lists the source paths, the page never links to it
+        if parts[0] == DERIVATIVES_FOLDER and not DERIVATIVE_NAME.fullmatch(parts[-1]):
+            return None
+        path = os.path.join(self.root, *parts)
+        return (path, rel_path) if os.path.isfile(path) else None
+
+    def text_file(self, path, content_type):
+        stat = os.stat(path)
+        version = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._text_files.get(path)
+            if cached and cached[0] == version:
+                return cached[1]
+        with open(path, 'rb') as f:
+            response = cached_response(f.read(), content_type)
+        with self._lock:
+            self._text_files[path] = (version, response)
+        return response
+
+
+class BrochureRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'Brochure'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        site = self.server.site
+        url_path = unquote(urlsplit(self.path).path)
+        if url_path in ('/', '/' + OUTPUT_FILE):
+            self.send_cached(site.page, REVALIDATE, send_body)
+            return
+
+        resolved = site.resolve(url_path)
+        if not resolved:
+            self.send_error(404)
+            return
+        path, rel_path = resolved
+        cache_control = LONG_CACHE if is_fingerprinted(rel_path) else REVALIDATE
+        ext = os.path.splitext(path)[1].lower()
+        if ext in TEXT_TYPES:
+            self.send_cached(site.text_file(path, TEXT_TYPES[ext]), cache_control, send_body)
+        else:
+            self.send_file(path, cache_control, send_body)
+
+    def accepted_encoding(self, available):
+        # br over gzip, if the client accepts it (q=0 means it does not)
+        accepted = set()
+        for item in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = item.partition(';')
+            params = params.replace(' ', '')
+            try:
+                quality = float(params[2:]) if params.startswith('q=') else 1.0
+            except ValueError:
+                quality = 0.0
+            if quality > 0:
+                accepted.add(name.strip().lower())
+        for encoding in ('br', 'gzip'):
+            if encoding in available and (encoding in accepted or '*' in accepted):
+                return encoding
+        return None
+
+    def not_modified(self, etag):
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+
+    def send_common_headers(self, etag, cache_control):
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+
+    def send_cached(self, response, cache_control, send_body):
+        encoding = self.accepted_encoding(response.compressed)
+        body = response.compressed[encoding] if encoding else response.body
+        # Each encoding is a different body, so it needs its own strong ETag
+        etag = f'"{response.digest[:32]}{"-" + encoding if encoding else ""}"'
+        if self.not_modified(etag):
+            self.send_response(304)
+            self.send_common_headers(etag, cache_control)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', response.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_common_headers(etag, cache_control)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def requested_range(self, size, etag):
+        # (first, last) byte of a single Range request, None for the whole file, False if it
+        # lies past the end. Several ranges or a stale If-Range get the whole file, as HTTP allows.
+        match = re.fullmatch(r'bytes=(\d*)-(\d*)', self.headers.get('Range', '').strip())
+        if not match or not any(match.groups()):
+            return None
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range.strip() != etag:
+            return None
+        first, last = match.groups()
+        if first:
+            first = int(first)
+            last = min(int(last), size - 1) if last else size - 1
+            if last < first:
+                return None if first <= size - 1 else False
+        else:
+            # bytes=-500: the last 500 bytes
+            if int(last) == 0:
+                return False
+            first, last = max(0, size - int(last)), size - 1
+        return (first, last) if first < size else False
+
+    def send_file(self, path, cache_control, send_body):
+        # Photos and videos are streamed from disk; asset_digest hashes each version once.
+        # Byte ranges let video players seek (Safari/iOS will not play a video without them).
+        etag = f'"{asset_digest(path)[:32]}"'
+        if self.not_modified(etag):
+            self.send_response(304)
+            self.send_common_headers(etag, cache_control)
+            self.end_headers()
+            return
+
+        size = os.path.getsize(path)
+        byte_range = self.requested_range(size, etag)
+        if byte_range is False:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        first, last = byte_range or (0, size - 1)
+        self.send_response(206 if byte_range else 200)
+        self.send_header('Content-Type', mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        self.send_header('Content-Length', str(last - first + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        if byte_range:
+            self.send_header('Content-Range', f'bytes {first}-{last}/{size}')
+        self.send_common_headers(etag, cache_control)
+        self.end_headers()
+        if send_body:
+            with open(path, 'rb') as f:
+                f.seek(first)
+                remaining = last - first + 1
+                while remaining > 0:
+                    block = f.read(min(WRITE_BUFFER_SIZE, remaining))
+                    if not block:
+                        break
+                    self.wfile.write(block)
+                    remaining -= len(block)
+
+
+def serve(host='127.0.0.1', port=8000, poll_interval=1.0, options=BuildOptions()):
+    site = BrochureSite(options)
+    # The first build happens here so a broken start ends with an error instead of a server without a page
+    try:
+        data, slideshow_images, output_file = first_build(options)
+    except Exception as e:
+        raise SystemExit(f"Error: {build_error(e)}, not serving")
+    site.load(output_file)
+
+    server = ThreadingHTTPServer((host, port), BrochureRequestHandler)
+    server.site = site
+    print(f"Serving on http://{host}:{port}/ (Ctrl+C to stop)" + ("" if brotli else ", gzip only (brotli is not installed)"))
+
+    # Then the watch loop rebuilds the page on every change (or new day); it survives failed rebuilds
+    watcher = make_watcher(WATCH_PATHS, poll_interval)
+    threading.Thread(target=watch_changes, args=(watcher, data, slideshow_images),
+                     kwargs={'options': options, 'on_build': site.load}, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped serving.")
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the church brochure page (index.html)')
+    parser.add_argument('--force', action='store_true', help='rebuild even if nothing changed')
+    # What to do besides the default single build; only one at a time
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument('--profile', action='store_true', help=f'time each build phase and section, report in {PROFILE_FILE} next to the page (implies --force)')
+    modes.add_argument('--watch', action='store_true', help='stay running and rebuild when the inputs change')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='seconds between checks when inotify is unavailable')
+    modes.add_argument('--schedule', action='store_true', help='stay running and rebuild at every midnight, for the new date and month (instead of a cron job)')
+    parser.add_argument('--timezone', help='IANA time zone the date and month are taken in, e.g. America/Chicago (default: the machine\'s)')
+    modes.add_argument('--serve', action='store_true', help='host the page over HTTP, rebuilt when the inputs change')
+    parser.add_argument('--host', default='127.0.0.1', help='address for --serve (0.0.0.0 to reach it from other machines)')
+    parser.add_argument('--port', type=int, default=8000, help='port for --serve')
+    modes.add_argument('--all-months', action='store_true', help=f'render every month to {MONTHS_DIR}/<Month>/{OUTPUT_FILE}')
+    parser.add_argument('--year', type=int, help='year shown on the month pages (default: this year)')
+    parser.add_argument('--workers', type=int, help='processes used by --all-months and image resizing (default: one per CPU)')
+    parser.add_argument('--responsive-images', action='store_true', help=f'resize slideshow photos and logo into {DERIVATIVES_FOLDER}/ and use srcset (needs Pillow)')
+    parser.add_argument('--modern-formats', action='store_true', help='also encode images as AVIF/WebP and use <picture> (needs Pillow)')
+    parser.add_argument('--dist', action='store_true', help=f'write to {DIST_DIR}/ with content-hashed copies of every asset and a manifest')
+    parser.add_argument('--external-css', action='store_true', help=f'minify the styles into {GENERATED_STEM}.<hash>.css, inline only the critical part')
+    parser.add_argument('--prune-css', action='store_true', help='leave out the style rules for classes the page does not use')
+    parser.add_argument('--external-js', action='store_true', help=f'minify the script into {GENERATED_STEM}.<hash>.js, loaded with defer')
+    parser.add_argument('--lazy-tabs', action='store_true', help=f'only put HOME in the page, the other tabs are fetched from {GENERATED_STEM}-<tab>.<hash>.html when opened (needs a web server)')
+    parser.add_argument('--data-store', action='store_true', help=f'read only the shown month from {DATA_STORE_FILE}, compiled from {DATA_FILE} when it changes')
+    parser.add_argument('--live', action='store_true', help=f'write each tab to its own file listed in {LIVE_FILE}; the open page polls it and swaps in changed tabs without reloading (needs a web server)')
+    parser.add_argument('--year-page', action='store_true', help='one page for the whole year: every month\'s tabs are embedded and the viewer\'s clock picks the month and date')
+    parser.add_argument('--precompress', action='store_true', help='also write .gz and .br (if brotli is installed) copies of the page, stylesheet, script and tabs for nginx gzip_static')
+    parser.add_argument('--virtual-lists', action='store_true', help=f'send birthday/anniversary lists of {VIRTUAL_LIST_MIN_ROWS}+ people as row data, only the rows in view are drawn')
+    args = parser.parse_args()
+
+    options = BuildOptions(responsive_images=args.responsive_images, modern_formats=args.modern_formats, dist=args.dist,
+                           external_css=args.external_css, prune_css=args.prune_css, external_js=args.external_js,
+                           lazy_tabs=args.lazy_tabs, virtual_lists=args.virtual_lists, data_store=args.data_store,
+                           precompress=args.precompress, live=args.live, timezone=args.timezone,
+                           year_page=args.year_page)
+    if args.year_page and (args.all_months or args.lazy_tabs or args.live or args.data_store):
+        parser.error('--year-page cannot be combined with --all-months, --lazy-tabs, --live or --data-store')
+    if args.timezone:
+        try:
+            build_timezone(options)
+        except (ZoneInfoNotFoundError, ValueError):
+            parser.error(f"unknown time zone: {args.timezone}")
+
+    if args.all_months:
+        generate_all_months(year=args.year, workers=args.workers, options=options)
+    elif args.serve:
+        serve(host=args.host, port=args.port, poll_interval=args.poll_interval, options=options)
+    elif args.watch:
+        watch(poll_interval=args.poll_interval, options=options)
+    elif args.schedule:
+        run_schedule(options=options)
+    elif args.profile:
+        profiler = Profiler()
+        output_file = generate_html(force=True, profiler=profiler, options=options)
+        # Next to the page it describes (dist/ with --dist)
+        profile_file = os.path.join(os.path.dirname(output_file), PROFILE_FILE)
+        profiler.save(profile_file)
+        profiler.print_summary()
+        print(f"✓ Profile saved to {profile_file}")
+    else:
+        generate_html(force=args.force, options=options)
+
 
 if __name__ == "__main__":
-    generate_html()
\ No newline at end of file
+    main()